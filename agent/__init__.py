@@ -1,6 +1,17 @@
 # Agent module for AI-powered assistant with Cognitive Layers
-from .ai_agent import main, CognitiveAgent
-from .prompts import PERCEPTION_PROMPT, DECISION_PROMPT
+from .warmup import warm_imports
+warm_imports()
+
+from .ai_agent import main, main_stream, CognitiveAgent
+from .prompts import (
+    PERCEPTION_PROMPT_STATIC,
+    PERCEPTION_PROMPT_SUFFIX,
+    DECISION_PROMPT_STATIC,
+    DECISION_TOOLS_SECTION,
+    DECISION_PROMPT_SUFFIX,
+    PERCEPTION_PROMPT,  # Deprecated full template
+    DECISION_PROMPT,  # Deprecated full template
+)
 from . import models
 
 # Cognitive Layers
@@ -12,9 +23,15 @@ from .action import ActionLayer
 __all__ = [
     # Main entry point
     'main',
+    'main_stream',
     'CognitiveAgent',
     
     # Prompts
+    'PERCEPTION_PROMPT_STATIC',
+    'PERCEPTION_PROMPT_SUFFIX',
+    'DECISION_PROMPT_STATIC',
+    'DECISION_TOOLS_SECTION',
+    'DECISION_PROMPT_SUFFIX',
     'PERCEPTION_PROMPT',
     'DECISION_PROMPT',
     
@@ -4,14 +4,32 @@ Action Layer - Do the Thing™
 This module handles the action layer of the cognitive architecture.
 It executes decisions by calling tools or generating responses.
 """
+import inspect
 import logging
 import time
 from typing import Any, Dict, List, Optional
+import anyio
 from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
 from .models import ActionStep, ActionResult
 
 logger = logging.getLogger(__name__)
 
+# Raised by the stdio transport once the MCP server process is gone
+_TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+
+class MCPConnectionLost(Exception):
+    """A tool call failed because the connection to the MCP server is gone."""
+
+
+def _is_connection_lost(error: Exception) -> bool:
+    """Tell transport failures apart from errors reported by the tool itself."""
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, _TRANSPORT_ERRORS)
+
 
 class ActionLayer:
     """
@@ -35,9 +53,26 @@ class ActionLayer:
             tools: List of available MCP tools
         """
         self.session = session
+        self.set_tools(tools)
+        # Handler per action type; tool calls are coroutines, the rest return directly
+        self._action_handlers = {
+            "tool_call": self._execute_tool_call,
+            "response": self._generate_response,
+            "query_memory": self._query_memory,
+        }
+        logger.info("[ACTION] Action Layer initialized with %s tools", len(tools))
+    
+    def set_tools(self, tools: List[Any]):
+        """
+        Replace the available tools and drop schema info parsed for the old ones.
+        
+        Args:
+            tools: List of available MCP tools
+        """
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
-        logger.info(f"[ACTION] Action Layer initialized with {len(tools)} tools")
+        # Parsed schema info per tool name, filled on first request
+        self._tool_info: Dict[str, Dict[str, Any]] = {}
     
     async def execute(self, action_step: ActionStep) -> ActionResult:
         """
@@ -48,29 +83,35 @@ class ActionLayer:
             
         Returns:
             ActionResult: Result of the action execution
+            
+        Raises:
+            MCPConnectionLost: If the MCP server connection is gone
         """
-        logger.info(f"[ACTION] EXECUTING: Step {action_step.step_number} - {action_step.description}")
+        logger.info("[ACTION] EXECUTING: Step %s - %s", action_step.step_number, action_step.description)
         start_time = time.time()
         
         try:
-            if action_step.action_type == "tool_call":
-                result = await self._execute_tool_call(action_step)
-            elif action_step.action_type == "response":
-                result = self._generate_response(action_step)
-            elif action_step.action_type == "query_memory":
-                result = self._query_memory(action_step)
-            else:
+            handler = self._action_handlers.get(action_step.action_type)
+            if handler is None:
                 raise ValueError(f"Unknown action type: {action_step.action_type}")
+            result = handler(action_step)
+            if inspect.isawaitable(result):
+                result = await result
             
             execution_time = time.time() - start_time
             result.execution_time = execution_time
             
-            logger.info(f"[ACTION] Completed in {execution_time:.2f}s")
+            logger.info("[ACTION] Completed in %.2fs", execution_time)
             return result
             
         except Exception as e:
+            # Every later call on this session fails the same way - let the
+            # caller reconnect instead of recording an ordinary failed step
+            if _is_connection_lost(e):
+                raise MCPConnectionLost(f"MCP server connection lost ({type(e).__name__})") from e
+            
             execution_time = time.time() - start_time
-            logger.error(f"[ACTION] Failed: {e}")
+            logger.error("[ACTION] Failed: %s", e)
             
             return ActionResult(
                 success=False,
@@ -100,7 +141,12 @@ class ActionLayer:
             available = ', '.join(self.tool_map.keys())
             raise ValueError(f"Tool '{tool_name}' not found. Available: {available}")
         
-        logger.debug(f"Calling tool: {tool_name} with params: {parameters}")
+        # Catch incomplete calls here instead of spending a server round trip on them
+        missing = self._missing_parameters(tool_name, parameters)
+        if missing:
+            raise ValueError(f"Tool '{tool_name}' is missing required parameters: {', '.join(missing)}")
+        
+        logger.debug("Calling tool: %s with params: %s", tool_name, parameters)
         
         # Execute the tool via MCP
         result = await self.session.call_tool(tool_name, arguments=parameters)
@@ -123,6 +169,25 @@ class ActionLayer:
             facts_to_remember=facts_to_remember
         )
     
+    def _missing_parameters(self, tool_name: str, parameters: Dict[str, Any]) -> List[str]:
+        """
+        List required tool inputs absent from the call parameters.
+        
+        Args:
+            tool_name: Name of the tool being called
+            parameters: Call parameters, with tool inputs wrapped in "input"
+            
+        Returns:
+            Names of the missing required inputs (empty if the call is complete)
+        """
+        required = self.get_tool_info(tool_name)["required"]
+        if not required:
+            return []
+        tool_input = parameters.get("input")
+        if not isinstance(tool_input, dict):
+            return list(required)
+        return [name for name in required if name not in tool_input]
+    
     def _generate_response(self, action_step: ActionStep) -> ActionResult:
         """
         Generate a text response.
@@ -135,7 +200,7 @@ class ActionLayer:
         """
         message = action_step.parameters.get("message", action_step.description)
         
-        logger.debug(f"Generating response: {message}")
+        logger.debug("Generating response: %s", message)
         
         return ActionResult(
             success=True,
@@ -218,6 +283,10 @@ class ActionLayer:
         Returns:
             Dictionary with tool information, or None if not found
         """
+        info = self._tool_info.get(tool_name)
+        if info is not None:
+            return info
+        
         if tool_name not in self.tool_map:
             return None
         
@@ -226,6 +295,7 @@ class ActionLayer:
         
         # Extract actual parameters from nested schema
         parameters = {}
+        required = []
         
         # Check if there's an 'input' property with a $ref
         props = schema.get('properties', {})
@@ -239,12 +309,16 @@ class ActionLayer:
                     defs = schema.get('$defs', {})
                     if def_name in defs:
                         parameters = defs[def_name].get('properties', {})
+                        required = defs[def_name].get('required', [])
         
-        return {
+        info = {
             "name": tool.name,
             "description": getattr(tool, 'description', 'No description'),
-            "parameters": parameters
+            "parameters": parameters,
+            "required": required
         }
+        self._tool_info[tool_name] = info
+        return info
     
     def get_all_tools_info(self) -> List[Dict[str, Any]]:
         """
@@ -8,39 +8,49 @@ The agent no longer functions as a single "Augmented LLM" but as a
 structured, layered cognitive system with clear separation of concerns.
 """
 import os
+import sys
+import json
+import re
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import asyncio
+import collections
+import functools
+import contextvars
+import uuid
 import google.generativeai as genai
 import logging
-from datetime import datetime
-import traceback
-from typing import Optional, Dict, Any
+import logging.handlers
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import time
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, Union
 
 # Import cognitive layers
 from .perception import PerceptionLayer
 from .memory import MemoryLayer
 from .decision import DecisionLayer
-from .action import ActionLayer
+from .action import ActionLayer, MCPConnectionLost
+from .perception_fastpath import fast_perceive
+from .decision_planner import build_plan
+from .cache import PromptCache, DecisionCache, ResponseCache, preferences_namespace
 
 # Import models
 from .models import (
     AgentResponse,
     CognitiveState,
-    MemoryQuery
+    MemoryQuery,
+    PartialResponse
 )
 
 # Load environment variables first
 load_dotenv()
 
-# Configure logging
+# Logging settings
 log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, f"cognitive_agent_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-# Get log level from environment variable, default to INFO
-log_level_str = os.getenv("LOG_LEVEL", "INFO").upper()
 log_level_map = {
     "DEBUG": logging.DEBUG,
     "INFO": logging.INFO,
@@ -48,37 +58,173 @@ log_level_map = {
     "ERROR": logging.ERROR,
     "CRITICAL": logging.CRITICAL
 }
-log_level = log_level_map.get(log_level_str, logging.INFO)
-
-logging.basicConfig(
-    level=log_level,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 
-# Configure StreamHandler to use UTF-8 encoding
-for handler in logging.getLogger().handlers:
-    if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-        handler.setStream(open(handler.stream.fileno(), mode='w', encoding='utf-8', buffering=1, closefd=False))
 logger = logging.getLogger(__name__)
 
-# Log the configured log level
-logger.info(f"Logging configured with level: {logging.getLevelName(log_level)}")
+# Id of the query being processed, attached to every log record
+query_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("query_id", default="-")
+
+
+class QueryIdFilter(logging.Filter):
+    """Stamp log records with the id of the query being processed."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.query_id = query_id_var.get()
+        return True
+
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging():
+    """
+    Configure file and console logging for the agent (once per process).
+    
+    The log level comes from the LOG_LEVEL environment variable (default INFO).
+    Log calls only enqueue records; a background thread does the blocking
+    writes so disk and console I/O never stall the event loop.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"cognitive_agent_{time.strftime('%Y%m%d_%H%M%S')}.log")
+    
+    # Get log level from environment variable, default to INFO
+    log_level = log_level_map.get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    
+    log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(query_id)s] %(message)s')
+    
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(log_formatter)
+    
+    # Configure StreamHandler to use UTF-8 encoding
+    stream_handler = logging.StreamHandler()
+    stream_handler.setStream(open(stream_handler.stream.fileno(), mode='w', encoding='utf-8', buffering=1, closefd=False))
+    stream_handler.setFormatter(log_formatter)
+    
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    # The listener's handlers apply the real format; only merge args here
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    # Handler filters run in the logging caller's context, where the query id is set
+    queue_handler.addFilter(QueryIdFilter())
+    
+    logging.basicConfig(level=log_level, handlers=[queue_handler], force=True)
+    
+    # Log the configured log level
+    logger.info("Logging configured with level: %s", logging.getLevelName(log_level))
+
+
+@functools.lru_cache(maxsize=1)
+def get_model() -> genai.GenerativeModel:
+    """
+    Configure the Gemini API and return the shared model (created on first use).
+    
+    Returns:
+        Gemini model used by the perception and decision layers
+        
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        logger.error("GEMINI_API_KEY not found in .env file")
+        raise ValueError("GEMINI_API_KEY not found in .env file")
+    
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-2.5-flash')
+
+
+@functools.lru_cache(maxsize=1)
+def _blocking_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool for blocking file I/O (memory saves and compaction).
+    
+    asyncio.to_thread would use the running loop's default executor, which
+    asyncio.run() tears down with the loop. The Flask server keeps one
+    long-lived agent loop, but CLI runs and tests call asyncio.run() once per
+    query; a process-wide pool keeps the same worker threads for both.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv("AGENT_THREAD_POOL_SIZE", "4")),
+        thread_name_prefix="agent-io"
+    )
+    atexit.register(executor.shutdown, wait=False)
+    return executor
 
-# Configure Gemini API
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    logger.error("GEMINI_API_KEY not found in .env file")
-    raise ValueError("GEMINI_API_KEY not found in .env file")
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-2.5-flash')
+async def _run_blocking(func: Callable, *args) -> Any:
+    """Run a blocking call on the shared pool, keeping the caller's context (query id)."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_blocking_executor(), functools.partial(context.run, func, *args))
 
 # Constants
 MAX_ITERATIONS = 50  # Each LLM call or tool call counts as one iteration
+DIRECT_ANSWER_MIN_CONFIDENCE = 0.9  # Perception confidence needed to skip the decision layer
+MAX_CONCURRENT_TOOL_CALLS = 8  # Tool calls in flight at once against the MCP server
+MAX_CACHED_AGENTS = int(os.getenv("AGENT_MAX_CACHED_AGENTS", "8"))  # Preference sets kept alive at once
+
+# Patterns used to chain and parse tool results
+_RESULT_RE = re.compile(r'RESULT_FROM_STEP_(\d+)')
+_NUM_RE = re.compile(r'-?\d+\.?\d*')
+_DIGIT_RE = re.compile(r'\d')
+
+# Parameters that receive a formatted text body instead of a bare value
+_STRING_PARAM_NAMES = frozenset({'content', 'text', 'message', 'body', 'description'})
+
+# Words that mark a tool result as a status message rather than a computed value,
+# matched anywhere in the text in a single pass
+_STATUS_WORDS = ('sent', 'created', 'added', 'successfully')
+_STATUS_RE = re.compile('|'.join(_STATUS_WORDS), re.IGNORECASE)
+_NON_COMPUTATION_RE = re.compile('|'.join(_STATUS_WORDS + ('failed',)), re.IGNORECASE)
+
+# Sentinels for the per-query parsed-result cache
+_MISSING = object()
+_UNPARSEABLE = object()
+
+# Intents whose plans typically need a second cognitive loop
+_MULTI_LOOP_INTENTS = frozenset({'multi_step', 'conditional_action'})
+
+# Log banners
+_BANNER_EQ = "=" * 80
+_BANNER_DASH = "-" * 80
+_LOOP_BANNER = "\n" + _BANNER_EQ
+_ITER_BANNER = "\n" + _BANNER_DASH
+_END_BANNER = _BANNER_EQ + "\n"
+
+# Tools with external side effects; they always run alone and in plan order
+_NON_MATH_TOOLS = frozenset({
+    'send_gmail',
+    'open_powerpoint',
+    'close_powerpoint',
+    'show_powerpoint',
+    'draw_rectangle',
+    'add_text_in_powerpoint',
+})
+
+# Tools reading data that can change between queries (employee database)
+_DATA_TOOLS = frozenset({
+    't_calculate_salary_for_id',
+    't_calculate_salary_for_name',
+})
+
+
+def _error_response(query: str, error: Any) -> AgentResponse:
+    """Build the failed AgentResponse reported for a query."""
+    return AgentResponse(
+        result=f"Error: {error}",
+        success=False,
+        query=query,
+        answer=f"I encountered an error: {error}",
+        full_response=f"Query: {query}\nError: {error}"
+    )
 
 
 class CognitiveAgent:
@@ -92,7 +238,14 @@ class CognitiveAgent:
     4. Action: Executing the plan
     """
     
-    def __init__(self, session: ClientSession, tools: list, preferences: Optional[Dict[str, Any]] = None, memory_file: Optional[str] = None):
+    def __init__(
+        self,
+        session: ClientSession,
+        tools: list,
+        preferences: Optional[Dict[str, Any]] = None,
+        memory_file: Optional[str] = None,
+        model: Optional[genai.GenerativeModel] = None
+    ):
         """
         Initialize the Cognitive Agent.
         
@@ -101,6 +254,7 @@ class CognitiveAgent:
             tools: Available MCP tools
             preferences: User preferences (math ability, location, etc.)
             memory_file: Path to memory file (if None, creates a timestamped one)
+            model: Gemini model shared by the LLM layers (defaults to get_model())
         """
         self.session = session
         self.tools = tools
@@ -108,14 +262,52 @@ class CognitiveAgent:
         
         # Create timestamped memory file if not provided
         if memory_file is None:
-            memory_file = os.path.join(log_dir, f"agent_memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            os.makedirs(log_dir, exist_ok=True)
+            memory_file = os.path.join(log_dir, f"agent_memory_{time.strftime('%Y%m%d_%H%M%S')}.json")
         
         # Initialize cognitive layers
+        if model is None:
+            model = get_model()
         self.perception = PerceptionLayer(model, user_preferences=self.preferences)
         self.memory = MemoryLayer(memory_file=memory_file)
         self.decision = DecisionLayer(model, user_preferences=self.preferences)
         self.action = ActionLayer(session, tools)
         
+        # Tool schemas don't change during the agent's lifetime - parse them once
+        self._available_tools = self.action.get_all_tools_info()
+        
+        # Plans of earlier queries, reused for paraphrases of the same query
+        self.prompt_cache = PromptCache()
+        
+        # Plans of earlier queries, reused for the same question with other numbers
+        self.decision_cache = DecisionCache()
+        
+        # Final responses of earlier queries, kept apart per preference set. The
+        # file name depends only on the preferences so a restart finds it again
+        self._cache_namespace = preferences_namespace(self.preferences)
+        os.makedirs(log_dir, exist_ok=True)
+        self.response_cache = ResponseCache(
+            cache_file=os.path.join(log_dir, f"response_cache_{self._cache_namespace}.jsonl")
+        )
+        self._cached_decision = None
+        self._decision_snapshot = None
+        # Whether the current perception came from fast_perceive (numbers in operand order)
+        self._fast_perception = False
+        # Whether the current plan was made without the decision LLM
+        self._planned_without_llm = False
+        
+        # Bounds concurrent tool calls within a wave
+        self._tool_slots = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+        
+        # Tool results already parsed as JSON during the current query
+        self._parsed_results: Dict[str, Any] = {}
+        
+        # Called with a PartialResponse after every action step (see process_query_stream)
+        self.on_progress: Optional[Callable[[PartialResponse], None]] = None
+        
+        # Serializes queries - the per-query state above lives on the agent
+        self._query_lock = asyncio.Lock()
+        
         # Store user preferences in memory
         if self.preferences:
             self._store_preferences()
@@ -124,49 +316,90 @@ class CognitiveAgent:
         self.state = CognitiveState()
         
         logger.info("[AGENT] Cognitive Agent initialized with 4 layers")
-        logger.info(f"[AGENT] Memory file: {memory_file}")
+        logger.info("[AGENT] Memory file: %s", memory_file)
         if self.preferences:
-            logger.info(f"[AGENT] User preferences loaded: {self.preferences}")
+            logger.info("[AGENT] User preferences loaded: %s", self.preferences)
+    
+    def spawn_worker(self, worker_id: int) -> "CognitiveAgent":
+        """
+        Create an agent that can answer queries concurrently with this one.
+        
+        The worker shares the MCP session, model and plan/response caches, but
+        has its own cognitive state and memory file.
+        
+        Args:
+            worker_id: Number used to name the worker's memory file
+            
+        Returns:
+            CognitiveAgent sharing this agent's session and caches
+        """
+        base, ext = os.path.splitext(self.memory.memory_file)
+        worker = CognitiveAgent(
+            self.session,
+            self.tools,
+            preferences=self.preferences,
+            memory_file=f"{base}_worker{worker_id}{ext}",
+            model=self.perception.model
+        )
+        worker.prompt_cache = self.prompt_cache
+        worker.decision_cache = self.decision_cache
+        worker.response_cache = self.response_cache
+        return worker
+    
+    def invalidate_tools(self, tools: Optional[list] = None):
+        """
+        Rebuild the cached tool schemas after the MCP tool set changed.
+        
+        Args:
+            tools: New list of MCP tools (keeps the current list if None)
+        """
+        if tools is not None:
+            self.tools = tools
+            self.action.set_tools(tools)
+        self._available_tools = self.action.get_all_tools_info()
+        logger.info("[AGENT] Tool schemas refreshed (%s tools)", len(self._available_tools))
     
     def _store_preferences(self):
         """
         Store user preferences in the Memory Layer.
         """
-        # Store each preference as a fact
-        for key, value in self.preferences.items():
-            preference_text = f"User preference: {key} = {value}"
-            self.memory.store_fact(
-                content=preference_text,
-                source="user_preferences",
-                relevance_score=1.0
-            )
+        # Store all preferences as facts in one batch
+        facts = [f"User preference: {key} = {value}" for key, value in self.preferences.items()]
+        self.memory.store_facts(facts, source="user_preferences")
         
         # Store in user_preferences dict (always update to ensure proper capture)
-        for key, value in self.preferences.items():
-            self.memory.memory_state.user_preferences[key] = value
+        self.memory.update_preferences(self.preferences)
         
-        logger.info(f"[AGENT] Stored {len(self.preferences)} user preferences in memory")
+        logger.info("[AGENT] Stored %s user preferences in memory", len(self.preferences))
+    
+    def _load_result_json(self, result_str):
+        """Parse a tool result as JSON, once per distinct result within a query."""
+        parsed = self._parsed_results.get(result_str, _MISSING)
+        if parsed is _MISSING:
+            try:
+                parsed = json.loads(result_str)
+            except ValueError:
+                parsed = _UNPARSEABLE
+            self._parsed_results[result_str] = parsed
+        return parsed
     
     def _extract_value_from_result(self, result):
         """Extract numeric/boolean value from various result formats - generic approach."""
-        import json
-        import re
-        
         if isinstance(result, (int, float, bool)):
             return result
         
         if not isinstance(result, str):
             return None
         
-        try:
-            parsed = json.loads(result)
-            return self._extract_value_from_json(parsed)
-        except (json.JSONDecodeError, KeyError):
+        parsed = self._load_result_json(result)
+        if parsed is _UNPARSEABLE:
             # Fallback: try to extract any number from the string
-            num_match = re.search(r'-?\d+\.?\d*', result)
-            if num_match:
-                return float(num_match.group())
-        
+            num_match = _NUM_RE.search(result)
+            return float(num_match.group()) if num_match else None
+        if isinstance(parsed, dict):
+            return self._extract_value_from_json(parsed)
+        if isinstance(parsed, (int, float)) and not isinstance(parsed, bool):
+            return float(parsed)
         return None
     
     def _format_result_as_string(self, extracted_value):
@@ -197,29 +430,17 @@ class CognitiveAgent:
     
     def _build_email_result_string(self, extracted):
         """Build result string for email content from computation results."""
-        computation_results = []
-        for i, ar in enumerate(self.state.action_results):
-            if self._is_computation_result(i, ar):
-                self._parse_tool_result(str(ar.result), computation_results)
-        
-        # Format based on whether operations are chained
-        if len(computation_results) > 1 and self._has_chained_operations(computation_results):
-            return self._format_result_as_string(computation_results[-1])
-        elif len(computation_results) > 1:
-            return ", ".join(str(v) for v in computation_results)
-        elif computation_results:
-            return self._format_result_as_string(computation_results[0])
-        else:
-            return self._format_result_as_string(extracted)
+        computation_results = [value for kind, value in self.state.parsed_results if kind == "value"]
+        if computation_results:
+            return self._combine_results(computation_results, self._format_result_as_string)
+        return self._format_result_as_string(extracted)
     
     def _replace_placeholder(self, value, param_name, results_map):
         """Replace a single placeholder value."""
-        import re
-        
         if not isinstance(value, str):
             return value
         
-        match = re.search(r'RESULT_FROM_STEP_(\d+)', value)
+        match = _RESULT_RE.search(value)
         if not match:
             return value
         
@@ -233,7 +454,7 @@ class CognitiveAgent:
         if extracted is None:
             return result
         
-        needs_string = param_name and param_name.lower() in ['content', 'text', 'message', 'body', 'description']
+        needs_string = param_name and param_name.lower() in _STRING_PARAM_NAMES
         
         if needs_string:
             result_str = self._build_email_result_string(extracted)
@@ -243,8 +464,6 @@ class CognitiveAgent:
     
     def _replace_result_placeholders(self, params: dict, results_map: dict) -> dict:
         """Replace result placeholders like 'RESULT_FROM_STEP_1' with actual values."""
-        import copy
-        
         def replace_recursive(value, param_name=None):
             if isinstance(value, str):
                 return self._replace_placeholder(value, param_name, results_map)
@@ -254,70 +473,168 @@ class CognitiveAgent:
                 return [replace_recursive(item) for item in value]
             return value
         
-        return replace_recursive(copy.deepcopy(params))
+        # The dict/list branches build fresh containers and scalars are
+        # immutable, so the original params are never modified
+        return replace_recursive(params)
     
-    def _execute_perception_layer(self, query: str):
+    async def _execute_perception_layer(self, query: str):
         """Execute perception layer if not already done."""
         if self.state.perception is not None:
             return self.state.perception
         
-        self.state.iteration += 1
-        logger.info("\n" + "-" * 80)
-        logger.info(f"[AGENT] ITERATION {self.state.iteration}/{MAX_ITERATIONS}: Perception Layer (LLM Call)")
-        logger.info("-" * 80)
-        
-        perception = self.perception.perceive(query)
+        # Trivially structured queries are understood without an LLM call
+        perception = fast_perceive(query)
+        self._fast_perception = perception is not None
+        if perception is not None:
+            logger.info("[AGENT] Perception from rule-based fast path (no LLM call)")
+        else:
+            self.state.iteration += 1
+            logger.info(_ITER_BANNER)
+            logger.info("[AGENT] ITERATION %s/%s: Perception Layer (LLM Call)", self.state.iteration, MAX_ITERATIONS)
+            logger.info(_BANNER_DASH)
+            
+            perception = await self.perception.perceive(query)
         self.state.perception = perception
         
         if perception.extracted_facts:
             self.memory.store_facts(perception.extracted_facts, source="perception")
         
-        logger.info(f"[AGENT] ✓ Iteration {self.state.iteration} complete: Perception")
+        logger.info("[AGENT] ✓ Perception complete (%s iterations so far)", self.state.iteration)
         return perception
     
-    def _execute_decision_layer(self, perception, query):
-        """Execute decision layer."""
-        memory_query = MemoryQuery(query=query, max_results=5, min_relevance=0.3)
-        memory_retrieval = self.memory.retrieve_relevant_facts(memory_query)
+    async def _execute_decision_layer(self, perception, query, memory_retrieval=None):
+        """Execute decision layer (or reuse a cached plan)."""
+        if self._cached_decision is not None:
+            decision, self._cached_decision = self._cached_decision, None
+            self.state.decision = decision
+            self._planned_without_llm = True
+            logger.info("[AGENT] Reusing cached decision (%s actions planned, no LLM call)", len(decision.action_plan))
+            return decision
+        
+        # Only the first plan of a query is looked up; later loops build on its results
+        if not self.state.action_results:
+            decision = self.decision_cache.lookup(query, perception)
+            if decision is not None:
+                self.state.decision = decision
+                self._planned_without_llm = True
+                self._decision_snapshot = decision.model_copy(deep=True)
+                logger.info("[AGENT] Reusing cached plan template (%s actions planned, no LLM call)", len(decision.action_plan))
+                return decision
+            
+            # Single-operation calculations have only one sensible plan
+            decision = build_plan(perception, self.action.tool_exists, operands_ordered=self._fast_perception)
+            if decision is not None:
+                self.state.decision = decision
+                self._planned_without_llm = True
+                self._decision_snapshot = decision.model_copy(deep=True)
+                return decision
         
-        available_tools = self.action.get_all_tools_info()
+        if memory_retrieval is None:
+            memory_retrieval = self.memory.retrieve_relevant_facts(self._memory_query)
         
         self.state.iteration += 1
-        logger.info("\n" + "-" * 80)
-        logger.info(f"[AGENT] ITERATION {self.state.iteration}/{MAX_ITERATIONS}: Decision Layer (LLM Call)")
-        logger.info("-" * 80)
+        logger.info(_ITER_BANNER)
+        logger.info("[AGENT] ITERATION %s/%s: Decision Layer (LLM Call)", self.state.iteration, MAX_ITERATIONS)
+        logger.info(_BANNER_DASH)
         
-        decision = self.decision.decide(
+        self._planned_without_llm = False
+        decision = await self.decision.decide(
             perception=perception,
             memory=memory_retrieval,
-            available_tools=available_tools,
+            available_tools=self._available_tools,
             previous_actions=None
         )
         self.state.decision = decision
-        logger.info(f"[AGENT] ✓ Iteration {self.state.iteration} complete: Decision ({len(decision.action_plan)} actions planned)")
+        # Keep an untouched copy - placeholders are resolved in place during execution
+        self._decision_snapshot = decision.model_copy(deep=True)
+        logger.info("[AGENT] ✓ Iteration %s complete: Decision (%s actions planned)", self.state.iteration, len(decision.action_plan))
         return decision
     
-    async def _execute_action_step(self, action_step, action_results_map):
-        """Execute a single action step."""
+    def _step_dependencies(self, action_step):
+        """Return the step numbers referenced by RESULT_FROM_STEP_N placeholders."""
+        dependencies = set()
+        
+        def collect(value):
+            if isinstance(value, str):
+                dependencies.update(int(n) for n in _RESULT_RE.findall(value))
+            elif isinstance(value, dict):
+                for item in value.values():
+                    collect(item)
+            elif isinstance(value, list):
+                for item in value:
+                    collect(item)
+        
+        collect(action_step.parameters)
+        return dependencies
+    
+    def _plan_execution_waves(self, action_plan):
+        """
+        Group consecutive action steps into waves that can run concurrently.
+        
+        A step starts a new wave when it needs a result produced inside the
+        current wave. Tools with side effects (email, PowerPoint) always run
+        in a wave of their own so their relative order is preserved.
+        """
+        waves = []
+        current = []
+        current_steps = set()
+        
+        for action_step in action_plan:
+            if action_step.tool_name in _NON_MATH_TOOLS:
+                if current:
+                    waves.append(current)
+                waves.append([action_step])
+                current, current_steps = [], set()
+                continue
+            
+            if self._step_dependencies(action_step) & current_steps:
+                waves.append(current)
+                current, current_steps = [], set()
+            
+            current.append(action_step)
+            current_steps.add(action_step.step_number)
+        
+        if current:
+            waves.append(current)
+        return waves
+    
+    def _within_iteration_budget(self, wave):
+        """Return the leading steps of a wave that fit in the remaining iteration budget."""
+        budget = MAX_ITERATIONS - self.state.iteration
+        runnable = []
+        for action_step in wave:
+            if budget <= 0:
+                break
+            runnable.append(action_step)
+            if action_step.action_type == "tool_call":
+                budget -= 1
+        return runnable
+    
+    def _prepare_action_step(self, action_step, action_results_map):
+        """Count the iteration and resolve result placeholders for a step."""
         if action_step.action_type == "tool_call":
             self.state.iteration += 1
-            logger.info("\n" + "-" * 80)
-            logger.info(f"[AGENT] ITERATION {self.state.iteration}/{MAX_ITERATIONS}: Action Step {action_step.step_number} - {action_step.tool_name}")
-            logger.info("-" * 80)
+            logger.info(_ITER_BANNER)
+            logger.info("[AGENT] ITERATION %s/%s: Action Step %s - %s", self.state.iteration, MAX_ITERATIONS, action_step.step_number, action_step.tool_name)
+            logger.info(_BANNER_DASH)
         else:
-            logger.info(f"\n[AGENT] Executing action {action_step.step_number}: {action_step.description} (no iteration count)")
+            logger.info("\n[AGENT] Executing action %s: %s (no iteration count)", action_step.step_number, action_step.description)
         
         if action_step.parameters:
             action_step.parameters = self._replace_result_placeholders(
                 action_step.parameters, 
                 action_results_map
             )
-        
-        action_result = await self.action.execute(action_step)
+    
+    def _record_action_result(self, action_step, action_result, action_results_map):
+        """Store the outcome of an executed step in state and memory."""
         self.state.action_results.append(action_result)
+        parsed = self._parse_action_result(action_step, action_result)
+        if parsed is not None:
+            self.state.parsed_results.append(parsed)
         
         if action_step.action_type == "tool_call":
-            logger.info(f"[AGENT] ✓ Iteration {self.state.iteration} complete: {action_step.tool_name}")
+            logger.info("[AGENT] ✓ Step %s complete: %s", action_step.step_number, action_step.tool_name)
         
         if action_result.success and action_result.result is not None:
             action_results_map[action_step.step_number] = action_result.result
@@ -325,11 +642,40 @@ class CognitiveAgent:
         if action_result.success and action_result.facts_to_remember:
             self.memory.store_facts(action_result.facts_to_remember, source="action")
         
-        # Don't return response action results - they're just descriptions
-        # The actual results will be extracted in _finalize_result
-        return None
+        if self.on_progress is not None:
+            self.on_progress(PartialResponse(
+                query=self.memory.memory_state.context.get("initial_query", ""),
+                step_number=action_step.step_number,
+                tool_name=action_step.tool_name,
+                success=action_result.success,
+                result=action_result.result,
+                error=action_result.error
+            ))
     
-    def _is_computation_result(self, i, ar):
+    async def _execute_bounded(self, action_step):
+        """Execute one action step, waiting for a free tool-call slot."""
+        async with self._tool_slots:
+            return await self.action.execute(action_step)
+    
+    async def _execute_action_wave(self, wave, action_results_map):
+        """
+        Execute a wave of independent action steps concurrently.
+        
+        Results are recorded in plan order so that action_results stays
+        aligned with decision.action_plan.
+        """
+        for action_step in wave:
+            self._prepare_action_step(action_step, action_results_map)
+        
+        if len(wave) > 1:
+            logger.info("[AGENT] Running steps %s concurrently", [s.step_number for s in wave])
+        
+        action_results = await asyncio.gather(*(self._execute_bounded(s) for s in wave))
+        
+        for action_step, action_result in zip(wave, action_results):
+            self._record_action_result(action_step, action_result, action_results_map)
+    
+    def _is_computation_result(self, action_step, ar):
         """
         Check if action result contains a computational result (vs status message).
         Uses heuristics: looks for numeric results or structured data.
@@ -337,55 +683,56 @@ class CognitiveAgent:
         if not (ar.success and ar.result is not None):
             return False
         
-        if not (self.state.decision and self.state.decision.action_plan):
-            return False
-        
-        if i >= len(self.state.decision.action_plan):
-            return False
-        
-        action_step = self.state.decision.action_plan[i]
-        if action_step.action_type != "tool_call":
+        if action_step.action_type != "tool_call" or action_step.tool_name in _NON_MATH_TOOLS:
             return False
         
         # Heuristic: check if result looks like a status message
         result_str = str(ar.result).lower()
-        if any(word in result_str for word in ['sent', 'created', 'added', 'successfully', 'failed']):
+        if _NON_COMPUTATION_RE.search(result_str):
             return False
         
         # If it's a JSON with computational values (numbers, booleans, lists), treat as computation
-        import json
-        import re
-        try:
-            parsed = json.loads(str(ar.result))
-            return isinstance(parsed, dict) and any(isinstance(v, (int, float, bool, list)) for v in parsed.values())
-        except json.JSONDecodeError:
+        parsed = self._load_result_json(str(ar.result))
+        if parsed is _UNPARSEABLE:
             # Check if string contains numbers or boolean keywords
-            return bool(re.search(r'\d', result_str)) or result_str in ['true', 'false']
-        
-        return True
+            return bool(_DIGIT_RE.search(result_str)) or result_str in ('true', 'false')
+        return isinstance(parsed, dict) and any(isinstance(v, (int, float, bool, list)) for v in parsed.values())
     
-    def _process_action_result(self, i, ar, computation_results):
-        """Process a single action result and return status message if applicable."""
-        if not (ar.success and ar.result is not None and i < len(self.state.decision.action_plan)):
-            return None
-        
-        action_step = self.state.decision.action_plan[i]
+    def _parse_action_result(self, action_step, ar):
+        """
+        Classify an executed step's result once, when it is recorded.
         
-        if action_step.action_type != "tool_call":
+        Returns:
+            ("status", message) for status messages (email sent, file created, etc.),
+            ("value", extracted) for computation results, or None if neither
+        """
+        if not (ar.success and ar.result is not None) or action_step.action_type != "tool_call":
             return None
         
         result_str = str(ar.result)
+        if _STATUS_RE.search(result_str):
+            return "status", result_str
         
-        # Check for status messages (email sent, file created, etc.)
-        if any(word in result_str.lower() for word in ['sent', 'created', 'added', 'successfully']):
-            return result_str
-        
-        # Otherwise treat as computation result
-        if self._is_computation_result(i, ar):
-            self._parse_tool_result(result_str, computation_results)
+        if self._is_computation_result(action_step, ar):
+            extracted = self._extract_value_from_result(result_str)
+            if extracted is not None:
+                return "value", extracted
         
         return None
     
+    def _combine_results(self, computation_results, format_single=str):
+        """
+        Combine computation results into one display string.
+        
+        For chained operations (A -> B -> C), show only the final result.
+        For independent results (like two separate numbers), show all.
+        """
+        if len(computation_results) == 1:
+            return format_single(computation_results[0])
+        if self._has_chained_operations(computation_results):
+            return format_single(computation_results[-1])
+        return ", ".join(map(str, computation_results))
+    
     def _has_chained_operations(self, computation_results):
         """
         Check if computation results are from chained operations.
@@ -401,27 +748,16 @@ class CognitiveAgent:
         if not (self.state.decision and self.state.decision.action_plan):
             return None
         
-        computation_results = []
-        status_message = None
-        
-        for i, ar in enumerate(self.state.action_results):
-            status = self._process_action_result(i, ar, computation_results)
-            if status:
-                status_message = status
+        # Results were classified as each step completed (see _record_action_result)
+        computation_results = [value for kind, value in self.state.parsed_results if kind == "value"]
+        status_message = next(
+            (value for kind, value in reversed(self.state.parsed_results) if kind == "status"),
+            None
+        )
         
         # Return computed results for display (no status messages)
         if computation_results:
-            # For chained operations (A -> B -> C), show only the final result
-            # For independent results (like two separate numbers), show all
-            if len(computation_results) > 1 and self._has_chained_operations(computation_results):
-                # Chained operations: show only final result
-                return str(computation_results[-1])
-            elif len(computation_results) > 1:
-                # Independent results: show all (e.g., two consecutive numbers)
-                return ", ".join(str(v) for v in computation_results)
-            else:
-                # Single result
-                return str(computation_results[0])
+            return self._combine_results(computation_results)
         
         # If no computation result but there's a status message, return it
         if status_message:
@@ -477,27 +813,51 @@ class CognitiveAgent:
         
         return None
     
-    def _parse_tool_result(self, result_str, parsed_list):
-        """Parse a tool result and append to parsed_list."""
-        import json
-        import re
+    def _is_response_cacheable(self) -> bool:
+        """
+        Check whether the finished query's response can be replayed for repeats.
         
-        try:
-            if result_str.strip().startswith('{'):
-                parsed = json.loads(result_str)
-                extracted = self._extract_value_from_json(parsed)
-                if extracted is not None:
-                    parsed_list.append(extracted)
-            else:
-                num_match = re.search(r'-?\d+\.?\d*', result_str)
-                if num_match:
-                    parsed_list.append(float(num_match.group()))
-        except ValueError:
-            pass
+        Only fully successful runs qualify, and never ones that touched the
+        outside world (email, PowerPoint) - replaying those would skip the
+        effect - or read the database, whose answers can go stale.
+        """
+        decision = self.state.decision
+        if decision is None:
+            return False
+        if any(step.tool_name in _NON_MATH_TOOLS or step.tool_name in _DATA_TOOLS for step in decision.action_plan):
+            return False
+        return all(ar.success for ar in self.state.action_results)
+    
+    def _cognitive_loop_budget(self) -> int:
+        """
+        Predict how many cognitive loops the query can use from its perception.
+        
+        Most queries are settled by a single plan; multi-step and conditional
+        ones may need one follow-up. One extra loop is allowed as slack so a
+        decision asking to continue is not cut off too early.
+        """
+        perception = self.state.perception
+        expected_loops = 2 if perception is not None and perception.intent in _MULTI_LOOP_INTENTS else 1
+        return min(MAX_ITERATIONS, expected_loops + 1)
     
     async def _run_cognitive_loop(self, query: str):
         """Run a single cognitive loop and return final_result if found."""
-        perception = self._execute_perception_layer(query)
+        memory_retrieval = None
+        if self.state.perception is None:
+            # Retrieve memories while the perception LLM call is in flight - the
+            # retrieval only needs the query, and the facts perception extracts
+            # reach the decision layer through the perception summary anyway.
+            perception_task = asyncio.create_task(self._execute_perception_layer(query))
+            try:
+                await asyncio.sleep(0)  # Let the task issue its request first
+                if self._cached_decision is None:
+                    memory_retrieval = self.memory.retrieve_relevant_facts(self._memory_query)
+            except BaseException:
+                perception_task.cancel()
+                raise
+            perception = await perception_task
+        else:
+            perception = await self._execute_perception_layer(query)
         
         if self.state.iteration >= MAX_ITERATIONS:
             return None, True  # result, should_stop
@@ -513,72 +873,157 @@ class CognitiveAgent:
                 perception.fallback.suggested_clarification if perception.fallback 
                 else "I apologize, but this query is outside my mathematical capabilities. I can help with arithmetic, algebra, geometry, statistics, and logical reasoning."
             )
-            logger.info(f"[AGENT] Fallback message: {fallback_message}")
+            logger.info("[AGENT] Fallback message: %s", fallback_message)
             return fallback_message, True  # Return fallback message and stop
         
-        decision = self._execute_decision_layer(perception, query)
+        # Fast path: perception already answered a trivial query, no planning needed
+        if (
+            perception.intent == "direct_answer"
+            and perception.direct_answer is not None
+            and not perception.requires_tools
+            and perception.confidence > DIRECT_ANSWER_MIN_CONFIDENCE
+        ):
+            logger.info("[AGENT] Direct answer from perception - skipping decision layer")
+            answer = str(perception.direct_answer)
+            self.state.decision = self.decision.create_simple_response_decision(answer)
+            return answer, True
+        
+        decision = await self._execute_decision_layer(perception, query, memory_retrieval)
         
         if self.state.iteration >= MAX_ITERATIONS:
             return None, True
         
-        # Execute action plan
+        # Execute action plan; independent steps within a wave run concurrently.
+        # Response action results are just descriptions - the actual results
+        # are extracted in _finalize_result.
         action_results_map = {}
-        final_result = None
-        
-        for action_step in decision.action_plan:
-            if self.state.iteration >= MAX_ITERATIONS:
-                logger.warning(f"[AGENT] Reached MAX_ITERATIONS limit before action {action_step.step_number}")
-                return final_result, True
-            
-            step_result = await self._execute_action_step(action_step, action_results_map)
-            if step_result is not None:
-                final_result = step_result
-                logger.info(f"[AGENT] Final result obtained: {final_result}")
+        results_before = len(self.state.action_results)
+        
+        for wave in self._plan_execution_waves(decision.action_plan):
+            runnable = self._within_iteration_budget(wave)
+            if runnable:
+                await self._execute_action_wave(runnable, action_results_map)
+            if len(runnable) < len(wave):
+                logger.warning("[AGENT] Reached MAX_ITERATIONS limit before action %s", wave[len(runnable)].step_number)
+                return None, True
+        
+        # A plan made without the LLM ends the query even if its step failed -
+        # hand the query to the decision LLM instead (the next loop asks it)
+        if self._planned_without_llm and not all(ar.success for ar in self.state.action_results[results_before:]):
+            logger.info("[AGENT] Plan made without the LLM failed - asking the decision LLM")
+            return None, False
         
         # Check if should continue
-        should_stop = not decision.should_continue or final_result is not None
-        return final_result, should_stop
+        return None, not decision.should_continue
+    
+    async def process_query(
+        self,
+        query: str,
+        on_progress: Optional[Callable[[PartialResponse], None]] = None
+    ) -> AgentResponse:
+        """
+        Process a user query through the cognitive layers.
+        
+        The agent keeps per-query state (cognitive state, parsed results,
+        plan snapshots), so queries sharing one agent are handled one at a time.
+        
+        Args:
+            query: User query string
+            on_progress: Optional callback receiving a PartialResponse per action step
+            
+        Returns:
+            AgentResponse for the query
+        """
+        async with self._query_lock:
+            self.on_progress = on_progress
+            # Every log record emitted while handling this query carries its id
+            token = query_id_var.set(uuid.uuid4().hex[:8])
+            try:
+                return await self._process_query(query)
+            finally:
+                query_id_var.reset(token)
+                self.on_progress = None
     
-    async def process_query(self, query: str) -> AgentResponse:
-        """Process a user query through the cognitive layers."""
-        logger.info("=" * 80)
-        logger.info(f"[AGENT] Starting cognitive processing for: {query}")
-        logger.info(f"[AGENT] Max iterations allowed: {MAX_ITERATIONS} (each LLM call or tool call = 1 iteration)")
-        logger.info("=" * 80)
+    async def _process_query(self, query: str) -> AgentResponse:
+        """Run the cognitive loop for a query and build the response."""
+        logger.info(_BANNER_EQ)
+        logger.info("[AGENT] Starting cognitive processing for: %s", query)
+        logger.info("[AGENT] Max iterations allowed: %s (each LLM call or tool call = 1 iteration)", MAX_ITERATIONS)
+        logger.info(_BANNER_EQ)
+        
+        cached_response = self.response_cache.lookup(query, self._cache_namespace)
+        if cached_response is not None:
+            logger.info("[AGENT] Returning cached response (no LLM or tool calls)")
+            return cached_response
         
         try:
             self.state = CognitiveState()
             self.memory.update_context("initial_query", query)
             final_result = None
+            self._decision_snapshot = None
+            self._cached_decision = None
+            self._fast_perception = False
+            self._parsed_results.clear()
+            # Same retrieval parameters for every cognitive loop of this query
+            self._memory_query = MemoryQuery(query=query, max_results=5, min_relevance=0.3)
+            
+            cached = self.prompt_cache.lookup(query)
+            if cached is not None:
+                self.state.perception, self._cached_decision = cached
+                if self.state.perception.extracted_facts:
+                    self.memory.store_facts(self.state.perception.extracted_facts, source="perception")
             
             cognitive_loop_count = 0
             while self.state.iteration < MAX_ITERATIONS:
                 cognitive_loop_count += 1
-                logger.info("\n" + "=" * 80)
-                logger.info(f"[AGENT] COGNITIVE LOOP {cognitive_loop_count}")
-                logger.info("=" * 80)
+                logger.info(_LOOP_BANNER)
+                logger.info("[AGENT] COGNITIVE LOOP %s", cognitive_loop_count)
+                logger.info(_BANNER_EQ)
                 
                 final_result, should_stop = await self._run_cognitive_loop(query)
                 
+                loop_budget = self._cognitive_loop_budget()
+                if not should_stop and cognitive_loop_count >= loop_budget:
+                    logger.info("[AGENT] Loop budget of %s cognitive loops reached - finalizing", loop_budget)
+                    should_stop = True
+                
                 if should_stop:
                     self.state.complete = True
-                    logger.info("\n" + "=" * 80)
-                    logger.info(f"[AGENT] Cognitive processing complete after {self.state.iteration} iterations")
-                    logger.info("=" * 80)
+                    logger.info(_LOOP_BANNER)
+                    logger.info("[AGENT] Cognitive processing complete after %s iterations", self.state.iteration)
+                    logger.info(_BANNER_EQ)
                     break
                 
                 logger.info("[AGENT] Continuing to next cognitive loop...")
             
+            # Cache single-loop plans whose actions all succeeded
+            if (
+                cognitive_loop_count == 1
+                and self._decision_snapshot is not None
+                and self.state.action_results
+                and all(ar.success for ar in self.state.action_results)
+            ):
+                self.prompt_cache.store(query, self.state.perception, self._decision_snapshot)
+                self.decision_cache.store(query, self.state.perception, self._decision_snapshot)
+            
             # Finalize result
+            failed_step = None
             if final_result is None:
                 final_result = self._finalize_result()
+                failed_step = next((ar for ar in reversed(self.state.action_results) if not ar.success), None)
                 if final_result:
-                    logger.info(f"[AGENT] Using computed result: {final_result}")
+                    logger.info("[AGENT] Using computed result: %s", final_result)
+                elif failed_step is not None:
+                    logger.warning("[AGENT] No result - action failed: %s", failed_step.error)
                 else:
                     final_result = "Task completed"
             
-            # Save memory to disk
-            self.memory.save_memory()
+            # Save memory to disk (off the event loop - it fsyncs)
+            await _run_blocking(self.memory.save_memory)
+            
+            # Nothing was computed because a step failed - don't report that as done
+            if failed_step is not None and not final_result:
+                return _error_response(query, failed_step.error)
             
             # Create response
             response = AgentResponse(
@@ -589,96 +1034,440 @@ class CognitiveAgent:
                 full_response=f"Query: {query}\nResult: {final_result}"
             )
             
+            if self._is_response_cacheable():
+                self.response_cache.store(query, self._cache_namespace, response)
+            
             # Count breakdown
             llm_calls = self.state.iteration - len([ar for i, ar in enumerate(self.state.action_results) 
                                                     if i < len(self.state.decision.action_plan) and 
                                                     self.state.decision.action_plan[i].action_type == "tool_call"])
             tool_calls = self.state.iteration - llm_calls
             
-            logger.info("=" * 80)
+            logger.info(_BANNER_EQ)
             logger.info("[AGENT] Processing completed successfully")
-            logger.info(f"Total Iterations: {self.state.iteration}")
-            logger.info(f"  - LLM calls: {llm_calls}")
-            logger.info(f"  - Tool calls: {tool_calls}")
-            logger.info(f"Final Result: {final_result}")
-            logger.info("=" * 80 + "\n")
+            logger.info("Total Iterations: %s", self.state.iteration)
+            logger.info("  - LLM calls: %s", llm_calls)
+            logger.info("  - Tool calls: %s", tool_calls)
+            logger.info("Final Result: %s", final_result)
+            logger.info(_END_BANNER)
             
             return response
             
+        except MCPConnectionLost:
+            # Not this query's fault - the caller has to reconnect
+            raise
         except Exception as e:
-            logger.error(f"[AGENT] Error in cognitive processing: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("[AGENT] Error in cognitive processing: %s", e)
+            return _error_response(query, e)
+    
+    async def process_query_stream(self, query: str) -> AsyncIterator[Union[PartialResponse, AgentResponse]]:
+        """
+        Process a query, yielding progress as each action step completes.
+        
+        Args:
+            query: User query string
             
-            # Return error response
-            return AgentResponse(
-                result=f"Error: {str(e)}",
-                success=False,
-                query=query,
-                answer=f"I encountered an error: {str(e)}",
-                full_response=f"Query: {query}\nError: {str(e)}"
-            )
+        Yields:
+            PartialResponse per completed action step, then the final AgentResponse
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self.process_query(query, on_progress=updates.put_nowait))
+        task.add_done_callback(lambda _: updates.put_nowait(None))
+        
+        try:
+            while (update := await updates.get()) is not None:
+                yield update
+            yield await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+class _MCPRuntime:
+    """MCP server connection and agents shared by all queries on one event loop."""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.lock = asyncio.Lock()
+        self.session: Optional[ClientSession] = None
+        self.tools: list = []
+        # One agent per distinct preference set, keyed by preferences_namespace(),
+        # least recently used first
+        self.agents: "collections.OrderedDict[str, CognitiveAgent]" = collections.OrderedDict()
+        self.closed = False
+        self._stop = asyncio.Event()
+        self._session_task: Optional[asyncio.Task] = None
+    
+    async def connect(self):
+        """Start the MCP server process and initialize the session."""
+        logger.info("Establishing connection to MCP server...")
+        ready = self.loop.create_future()
+        self._session_task = asyncio.create_task(self._hold_session(ready))
+        try:
+            await ready
+        except BaseException:
+            self._session_task.cancel()
+            raise
+        logger.info("Successfully retrieved %s tools", len(self.tools))
+    
+    async def _hold_session(self, ready: asyncio.Future):
+        """
+        Open the MCP session and keep it open until close().
+        
+        The stdio client's task group must be exited by the task that entered
+        it, so this one task owns the session for its whole lifetime. If the
+        event loop ends first, cancelling the task still closes it cleanly.
+        """
+        server_params = StdioServerParameters(
+            command="python",
+            args=["server_mcp/mcp_server.py", "dev"]
+        )
+        
+        try:
+            async with stdio_client(server_params) as (read, write):
+                logger.info("Connection established, creating session...")
+                async with ClientSession(read, write) as session:
+                    logger.info("Session created, initializing...")
+                    await session.initialize()
+                    
+                    # Get available tools
+                    logger.info("Requesting tool list...")
+                    tools_result = await session.list_tools()
+                    
+                    self.session = session
+                    self.tools = tools_result.tools
+                    ready.set_result(None)
+                    await self._stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP session closed with an error: %s", e)
+        finally:
+            self.session = None
+    
+    async def close_memories(self):
+        """Compact and close the memory of every agent created on this runtime."""
+        for agent in self.agents.values():
+            await _run_blocking(agent.memory.close)
+        self.agents.clear()
+    
+    async def close(self):
+        """Close agent memories and the MCP session; must run on the runtime's loop."""
+        if self.closed:
+            return
+        self.closed = True
+        await self.close_memories()
+        if self._session_task is not None:
+            self._stop.set()
+            await self._session_task
+        logger.info("MCP session closed")
+
+
+_runtime: Optional[_MCPRuntime] = None
+# Entry point calls (main, main_batch, main_stream) currently running
+_active_calls = 0
+
+
+async def _retire_agent(agent: CognitiveAgent):
+    """Close an evicted agent's memory once any query it is answering has finished."""
+    async with agent._query_lock:
+        await _run_blocking(agent.memory.close)
 
 
-async def main(query: str, preferences: Optional[Dict[str, Any]] = None):
+async def get_or_create_agent(preferences: Optional[Dict[str, Any]] = None) -> CognitiveAgent:
+    """
+    Return the shared cognitive agent, connecting to the MCP server on first use.
+    
+    The server process, session and tool list are reused across queries on the
+    same event loop. Each distinct preference set gets its own agent; the
+    MAX_CACHED_AGENTS most recently used ones are kept, and an evicted agent's
+    memory is closed only after the query it may be answering finishes.
+    
+    Args:
+        preferences: Dictionary of user preferences
+        
+    Returns:
+        CognitiveAgent bound to the shared MCP session
+    """
+    global _runtime
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        # A session is bound to the event loop it was created on
+        if _runtime is not None and _runtime.loop is not loop:
+            logger.info("Event loop changed, reconnecting to MCP server...")
+            await shutdown()
+        if _runtime is None:
+            _runtime = _MCPRuntime(loop)
+        runtime = _runtime
+        
+        evicted = []
+        async with runtime.lock:
+            # Closed after a lost connection while this call was waiting - start over
+            if runtime.closed:
+                continue
+            if runtime.session is None:
+                await runtime.connect()
+            
+            namespace = preferences_namespace(preferences)
+            agent = runtime.agents.get(namespace)
+            if agent is None:
+                # The namespace keeps memory files apart even for agents created in the same second
+                os.makedirs(log_dir, exist_ok=True)
+                memory_file = os.path.join(log_dir, f"agent_memory_{time.strftime('%Y%m%d_%H%M%S')}_{namespace}.json")
+                agent = CognitiveAgent(runtime.session, runtime.tools, preferences=preferences,
+                                       memory_file=memory_file, model=get_model())
+                runtime.agents[namespace] = agent
+                while len(runtime.agents) > MAX_CACHED_AGENTS:
+                    evicted.append(runtime.agents.popitem(last=False)[1])
+            else:
+                runtime.agents.move_to_end(namespace)
+        break
+    
+    for old_agent in evicted:
+        await _retire_agent(old_agent)
+    return agent
+
+
+async def _drop_lost_session(session: ClientSession):
+    """Close the runtime whose MCP connection is gone, so the next query reconnects."""
+    global _runtime
+    runtime = _runtime
+    if runtime is None or runtime.session is not session:
+        return  # Already reset by another query that hit the same failure
+    
+    async with runtime.lock:
+        if _runtime is runtime:
+            _runtime = None
+        await runtime.close()
+
+
+async def _answer(agent: CognitiveAgent, query: str) -> AgentResponse:
+    """Answer a query, resetting the shared session if its MCP connection is gone."""
+    try:
+        return await agent.process_query(query)
+    except MCPConnectionLost as e:
+        logger.error("[AGENT] %s - reconnecting on the next query", e)
+        await _drop_lost_session(agent.session)
+        return _error_response(query, e)
+
+
+async def handle_query(query: str, preferences: Optional[Dict[str, Any]] = None) -> AgentResponse:
+    """
+    Answer one query on the shared MCP session and model.
+    
+    Args:
+        query: User query string
+        preferences: Dictionary of user preferences
+        
+    Returns:
+        AgentResponse for the query
+    """
+    agent = await get_or_create_agent(preferences)
+    return await _answer(agent, query)
+
+
+async def shutdown():
+    """Compact agent memory and close the shared MCP session."""
+    global _runtime
+    runtime, _runtime = _runtime, None
+    if runtime is None:
+        return
+    
+    if runtime.loop is asyncio.get_running_loop():
+        async with runtime.lock:
+            await runtime.close()
+    elif runtime.loop.is_running():
+        # The session has to be closed on the loop that opened it
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(runtime.close(), runtime.loop))
+    else:
+        # Its loop has ended, which already closed the session task
+        await runtime.close_memories()
+
+
+@asynccontextmanager
+async def _entry_point(keep_session: bool):
+    """Count a running entry point; the last one to finish closes the session unless it is kept."""
+    global _active_calls
+    _active_calls += 1
+    try:
+        yield
+    finally:
+        _active_calls -= 1
+        if not keep_session and _active_calls == 0:
+            await shutdown()
+
+
+def _close_at_exit():
+    """Persist agent memory if the process exits without calling shutdown()."""
+    if _runtime is not None:
+        for agent in _runtime.agents.values():
+            agent.memory.close()
+
+
+atexit.register(_close_at_exit)
+
+
+async def main(query: str, preferences: Optional[Dict[str, Any]] = None, keep_session: bool = False):
     """
     Main entry point for the cognitive agent.
     
     Args:
         query: User query string
         preferences: Dictionary of user preferences (e.g., math ability, location, etc.)
+        keep_session: Keep the MCP session open for later queries on this event
+            loop (for a long-lived loop such as the Flask server's). By default
+            it is closed before returning, so asyncio.run(main(...)) cleans up.
         
     Returns:
         JSON string with agent response
     """
-    logger.info(f"Starting cognitive agent with query: {query}")
+    configure_logging()
+    logger.info("Starting cognitive agent with query: %s", query)
     if preferences:
-        logger.info(f"User preferences: {preferences}")
+        logger.info("User preferences: %s", preferences)
     
-    try:
-        # Establish MCP connection
-        logger.info("Establishing connection to MCP server...")
-        server_params = StdioServerParameters(
-            command="python",
-            args=["server_mcp/mcp_server.py", "dev"]
-        )
+    async with _entry_point(keep_session):
+        try:
+            response = await handle_query(query, preferences)
+            
+            # Return compact JSON response
+            return response.model_dump_json()
+                    
+        except Exception as e:
+            logger.exception("Error in main execution: %s", e)
+            return None
 
-        async with stdio_client(server_params) as (read, write):
-            logger.info("Connection established, creating session...")
-            async with ClientSession(read, write) as session:
-                logger.info("Session created, initializing...")
-                await session.initialize()
-                
-                # Get available tools
-                logger.info("Requesting tool list...")
-                tools_result = await session.list_tools()
-                tools = tools_result.tools
-                logger.info(f"Successfully retrieved {len(tools)} tools")
-                
-                # Create cognitive agent
-                agent = CognitiveAgent(session, tools, preferences=preferences)
-                
-                # Process query
-                response = await agent.process_query(query)
-                
-                # Return JSON response
-                return response.model_dump_json(indent=2)
-                
+
+async def main_batch(
+    queries: List[str],
+    preferences: Optional[Dict[str, Any]] = None,
+    keep_session: bool = False
+) -> List[Optional[str]]:
+    """
+    Answer several independent queries concurrently on one MCP session.
+    
+    Up to AGENT_MAX_CONCURRENCY (default 4) agents share the session and
+    caches; each takes the next pending query as soon as it is free.
+    
+    Args:
+        queries: User query strings
+        preferences: Dictionary of user preferences applied to every query
+        keep_session: Keep the MCP session open afterwards (see main)
+        
+    Returns:
+        JSON string with the agent response per query, in input order
+        (None where the query could not be run)
+    """
+    configure_logging()
+    logger.info("Starting cognitive agent with a batch of %s queries", len(queries))
+    results: List[Optional[str]] = [None] * len(queries)
+    if not queries:
+        return results
+    
+    async with _entry_point(keep_session):
+        return await _run_batch(queries, preferences, results)
+
+
+async def _run_batch(
+    queries: List[str],
+    preferences: Optional[Dict[str, Any]],
+    results: List[Optional[str]]
+) -> List[Optional[str]]:
+    """Fill results with the answers to queries, running agents concurrently."""
+    try:
+        agent = await get_or_create_agent(preferences)
     except Exception as e:
-        logger.error(f"Error in main execution: {e}")
-        logger.error(traceback.format_exc())
-        return None
+        logger.exception("Error in main execution: %s", e)
+        return results
+    
+    concurrency = min(len(queries), max(1, int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))))
+    workers = [agent.spawn_worker(i) for i in range(1, concurrency)]
+    pending = collections.deque(enumerate(queries))
+    
+    async def drain(worker_agent: CognitiveAgent):
+        while pending:
+            index, query = pending.popleft()
+            response = await _answer(worker_agent, query)
+            results[index] = response.model_dump_json()
+    
+    try:
+        await asyncio.gather(*(drain(a) for a in [agent, *workers]))
+    finally:
+        for worker in workers:
+            await _run_blocking(worker.memory.close)
+    return results
+
+
+async def main_stream(
+    query: str,
+    preferences: Optional[Dict[str, Any]] = None,
+    keep_session: bool = False
+) -> AsyncIterator[str]:
+    """
+    Streaming entry point: yields JSON progress updates, then the final response.
+    
+    Args:
+        query: User query string
+        preferences: Dictionary of user preferences (e.g., math ability, location, etc.)
+        keep_session: Keep the MCP session open afterwards (see main)
+        
+    Yields:
+        JSON string per completed action step (PartialResponse), then the AgentResponse
+    """
+    configure_logging()
+    logger.info("Starting cognitive agent (streaming) with query: %s", query)
+    
+    async with _entry_point(keep_session):
+        try:
+            agent = await get_or_create_agent(preferences)
+        except Exception as e:
+            logger.exception("Error in main execution: %s", e)
+            return
+        
+        try:
+            async for update in agent.process_query_stream(query):
+                yield update.model_dump_json()
+        except MCPConnectionLost as e:
+            logger.error("[AGENT] %s - reconnecting on the next query", e)
+            await _drop_lost_session(agent.session)
+            yield _error_response(query, e).model_dump_json()
+
+
+async def _interactive():
+    """Answer queries from stdin until an empty line, reusing one MCP session."""
+    configure_logging()
+    try:
+        while True:
+            try:
+                query = input("Enter your query: ").strip()
+            except EOFError:
+                break
+            if not query:
+                break
+            
+            logger.info("User provided query: %s", query)
+            result = None
+            async for chunk in main_stream(query, keep_session=True):
+                if result is not None:
+                    print(f"[STEP] {result}")
+                result = chunk
+            if result:
+                # Pretty-print for people, keep it compact when piped
+                if sys.stdout.isatty():
+                    result = json.dumps(json.loads(result), indent=2, ensure_ascii=False)
+                print(_LOOP_BANNER)
+                print("RESULT:")
+                print(result)
+                print(_BANNER_EQ)
+    finally:
+        await shutdown()
 
 
 if __name__ == "__main__":
-    query = input("Enter your query: ").strip()
-    if not query:
-        logger.error("No query provided by user")
-        print("Error: Please provide a valid query")
-    else:
-        logger.info(f"User provided query: {query}")
-        result = asyncio.run(main(query))
-        if result:
-            print(f"\n{'='*80}")
-            print("RESULT:")
-            print(result)
-            print(f"{'='*80}")
+    asyncio.run(_interactive())
@@ -0,0 +1,463 @@
+"""
+Prompt Cache - Reusing Earlier Work
+
+This module memoizes the agent's work on earlier queries.
+The prompt cache keeps perception and decision outputs, so paraphrases of
+a query that was already planned skip both LLM calls and go straight to the
+action layer. The decision cache keeps plan templates keyed by what
+perception understood, so the same question with different numbers skips
+the decision LLM call. The response cache keeps whole responses, so a
+repeated query skips the cognitive loop entirely.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .models import PerceptionOutput, DecisionOutput, AgentResponse
+
+logger = logging.getLogger(__name__)
+
+# Cache settings
+DEFAULT_SIMILARITY_THRESHOLD = 0.87  # Minimum cosine similarity for a hit
+DEFAULT_MAX_SIZE = 256  # Entries kept before evicting the least recently used
+DEFAULT_RESPONSE_THRESHOLD = 0.9  # Response hits skip everything, so demand a closer match
+
+_TOKEN_RE = re.compile(r"[a-z]+|-?\d+(?:\.\d+)?|[-+*/^%=<>]")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+# Standalone numbers in plan text; skips digits inside names like RESULT_FROM_STEP_2
+_PLAN_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+
+# Filler words that may differ between paraphrases of the same query
+_STOPWORDS = frozenset({
+    "a", "an", "the", "of", "is", "are", "what", "whats", "s", "please",
+    "can", "could", "you", "me", "i", "to", "for", "find", "calculate",
+    "compute", "tell", "give", "get", "and", "with", "by", "it", "this",
+    "that", "value", "result", "answer", "number", "numbers", "how", "much",
+})
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse it to its word and number tokens."""
+    return " ".join(_TOKEN_RE.findall(query.lower()))
+
+
+def query_vector(query: str) -> Counter:
+    """Bag-of-words vector for a normalized query."""
+    return Counter(query.split())
+
+
+def content_tokens(vector: Counter) -> frozenset:
+    """Tokens of a query vector that carry meaning (everything but filler words)."""
+    return frozenset(token for token in vector if token not in _STOPWORDS)
+
+
+def cosine_similarity(a: Counter, b: Counter) -> float:
+    """Cosine similarity between two bag-of-words vectors."""
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[token] for token, count in a.items() if token in b)
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm
+
+
+def preferences_namespace(preferences: Optional[Dict[str, Any]]) -> str:
+    """Stable short hash of a preferences dict, used to keep cache entries apart."""
+    payload = json.dumps(preferences or {}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class _SimilarityCache:
+    """
+    LRU mapping from normalized queries to cached values, matched by similarity.
+    
+    Two queries only match when they contain exactly the same numbers in
+    the same order and the same content words, so "add 2 and 3" never
+    reuses the work for "add 2 and 4". The similarity threshold absorbs
+    differences in filler words and word order.
+    """
+    
+    def __init__(self, max_size: int, threshold: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self._entries: OrderedDict = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _find(self, key: str) -> Optional[str]:
+        """Return the key of the most similar cached query, if any."""
+        if key in self._entries:
+            return key
+        
+        numbers = _NUMBER_RE.findall(key)
+        vector = query_vector(key)
+        content = content_tokens(vector)
+        best_key, best_score = None, self.threshold
+        
+        for cached_key, (cached_vector, cached_numbers, _) in self._entries.items():
+            if cached_numbers != numbers or content_tokens(cached_vector) != content:
+                continue
+            score = cosine_similarity(vector, cached_vector)
+            if score >= best_score:
+                best_key, best_score = cached_key, score
+        
+        return best_key
+    
+    def _get(self, key: str) -> Optional[Any]:
+        """Return the value cached for the query most similar to key, if any."""
+        match = self._find(key)
+        if match is None:
+            return None
+        self._entries.move_to_end(match)
+        return self._entries[match][2]
+    
+    def _put(self, key: str, value: Any):
+        """Cache a value for a normalized query, evicting the least recently used."""
+        self._entries[key] = (query_vector(key), _NUMBER_RE.findall(key), value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached entries."""
+        self._entries.clear()
+
+
+class PromptCache(_SimilarityCache):
+    """
+    LRU cache of perception and decision outputs keyed by query similarity.
+    """
+    
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        """
+        Initialize the Prompt Cache.
+        
+        Args:
+            max_size: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        super().__init__(max_size, threshold)
+    
+    def lookup(self, query: str) -> Optional[Tuple[PerceptionOutput, DecisionOutput]]:
+        """
+        Look up cached perception and decision outputs for a query.
+        
+        Args:
+            query: Raw user query
+        
+        Returns:
+            Copies of the cached (perception, decision), or None on a miss
+        """
+        cached = self._get(normalize_query(query))
+        if cached is None:
+            return None
+        
+        perception, decision = cached
+        logger.info("[CACHE] Hit for query: %s", query)
+        
+        # Hand out copies - the agent rewrites action parameters in place
+        return perception.model_copy(deep=True), decision.model_copy(deep=True)
+    
+    def store(self, query: str, perception: PerceptionOutput, decision: DecisionOutput):
+        """
+        Cache perception and decision outputs for a query.
+        
+        Args:
+            query: Raw user query
+            perception: Perception output to reuse
+            decision: Decision output to reuse (before placeholder replacement)
+        """
+        self._put(normalize_query(query), (perception.model_copy(deep=True), decision.model_copy(deep=True)))
+        logger.debug("[CACHE] Stored plan for query: %s (%s entries)", query, len(self._entries))
+
+
+class _Slot:
+    """Numeric plan parameter filled from the n-th perceived number."""
+    
+    __slots__ = ("index", "as_int")
+    
+    def __init__(self, index: int, as_int: bool):
+        self.index = index
+        self.as_int = as_int
+
+
+class _Text:
+    """Plan string with perceived numbers cut out; parts are text or number indexes."""
+    
+    __slots__ = ("parts",)
+    
+    def __init__(self, parts: List[Any]):
+        self.parts = parts
+
+
+class _NotTemplatable(Exception):
+    """Raised when a plan cannot be safely reused with other numbers."""
+
+
+def _canonical_number(text: str) -> str:
+    """Canonical form of a number, so 5 and 5.0 are the same perceived value."""
+    return repr(float(text))
+
+
+class DecisionCache:
+    """
+    LRU cache of decision plans keyed by intent, entity shape and query words.
+    
+    Queries that differ only in their numbers ("add 2 and 3", "add 7 and 9")
+    share one plan. Stored plans are templates whose numeric parameters are
+    tied to positions in the perceived entities, and a hit fills them in with
+    the new query's numbers. A plan is only stored when every perceived
+    number flows into its parameters exactly once and no parameter text
+    carries other numbers, so nothing the LLM computed gets replayed.
+    """
+    
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the Decision Cache.
+        
+        Args:
+            max_size: Maximum number of cached plan templates
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _signature(query: str, perception: PerceptionOutput) -> Optional[Tuple[tuple, List[str]]]:
+        """
+        Build the cache key and the ordered perceived numbers for a query.
+        
+        Returns:
+            (key, numbers), or None if the numbers are ambiguous
+        """
+        entities_json = json.dumps(perception.entities, sort_keys=True, default=str)
+        numbers = _PLAN_NUMBER_RE.findall(entities_json)
+        canonical = [_canonical_number(n) for n in numbers]
+        normalized = normalize_query(query)
+        query_numbers = {_canonical_number(n) for n in _NUMBER_RE.findall(normalized)}
+        
+        # Every number in the query must be a distinct perceived entity
+        if len(set(canonical)) != len(canonical) or query_numbers != set(canonical):
+            return None
+        
+        words = tuple(sorted(
+            token for token in content_tokens(query_vector(normalized))
+            if not _NUMBER_RE.fullmatch(token)
+        ))
+        key = (perception.intent, _PLAN_NUMBER_RE.sub("#", entities_json), words)
+        return key, numbers
+    
+    def _template(self, value: Any, slots: Dict[str, int], in_params: bool, used: Counter) -> Any:
+        """Replace perceived numbers in a dumped plan with slots."""
+        if isinstance(value, dict):
+            return {
+                k: self._template(v, slots, in_params or k == "parameters", used)
+                for k, v in value.items()
+            }
+        if isinstance(value, list):
+            return [self._template(v, slots, in_params, used) for v in value]
+        if isinstance(value, str):
+            parts, last = [], 0
+            for match in _PLAN_NUMBER_RE.finditer(value):
+                slot = slots.get(_canonical_number(match.group()))
+                if slot is None:
+                    if in_params:
+                        raise _NotTemplatable(match.group())
+                    continue
+                parts.extend((value[last:match.start()], slot))
+                last = match.end()
+                if in_params:
+                    used[slot] += 1
+            if not parts:
+                return value
+            parts.append(value[last:])
+            return _Text(parts)
+        if in_params and isinstance(value, (int, float)) and not isinstance(value, bool):
+            slot = slots.get(_canonical_number(str(value)))
+            if slot is None:
+                return value
+            used[slot] += 1
+            return _Slot(slot, isinstance(value, int))
+        return value
+    
+    def _fill(self, value: Any, numbers: List[str]) -> Any:
+        """Fill a plan template with the perceived numbers of a new query."""
+        if isinstance(value, dict):
+            return {k: self._fill(v, numbers) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._fill(v, numbers) for v in value]
+        if isinstance(value, _Slot):
+            number = float(numbers[value.index])
+            return int(number) if value.as_int and number.is_integer() else number
+        if isinstance(value, _Text):
+            return "".join(part if isinstance(part, str) else numbers[part] for part in value.parts)
+        return value
+    
+    def lookup(self, query: str, perception: PerceptionOutput) -> Optional[DecisionOutput]:
+        """
+        Look up a cached plan for a perceived query.
+        
+        Args:
+            query: Raw user query
+            perception: Perception output for the query
+        
+        Returns:
+            The cached plan filled in with this query's numbers, or None on a miss
+        """
+        signature = self._signature(query, perception)
+        if signature is None:
+            return None
+        
+        key, numbers = signature
+        template = self._entries.get(key)
+        if template is None:
+            return None
+        
+        self._entries.move_to_end(key)
+        logger.info("[CACHE] Decision hit for intent: %s", perception.intent)
+        return DecisionOutput(**self._fill(template, numbers))
+    
+    def store(self, query: str, perception: PerceptionOutput, decision: DecisionOutput):
+        """
+        Cache a plan as a template, if its numbers can be traced to the perception.
+        
+        Args:
+            query: Raw user query
+            perception: Perception output for the query
+            decision: Decision output to reuse (before placeholder replacement)
+        """
+        signature = self._signature(query, perception)
+        if signature is None:
+            return
+        
+        key, numbers = signature
+        slots = {_canonical_number(n): i for i, n in enumerate(numbers)}
+        used = Counter()
+        try:
+            template = self._template(decision.model_dump(), slots, False, used)
+        except _NotTemplatable:
+            logger.debug("[CACHE] Plan for query not reusable: %s", query)
+            return
+        
+        # Each perceived number must feed the plan exactly once
+        if len(used) != len(numbers) or any(count != 1 for count in used.values()):
+            logger.debug("[CACHE] Plan for query not reusable: %s", query)
+            return
+        
+        self._entries[key] = template
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        logger.debug("[CACHE] Stored plan template for intent: %s (%s entries)", perception.intent, len(self._entries))
+
+
+class ResponseCache(_SimilarityCache):
+    """
+    LRU cache of final agent responses keyed by preferences and query similarity.
+    
+    Entries are appended to a JSON-lines file so they survive restarts; the
+    file is rewritten compactly on load once it holds too many stale lines.
+    """
+    
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        threshold: float = DEFAULT_RESPONSE_THRESHOLD
+    ):
+        """
+        Initialize the Response Cache.
+        
+        Args:
+            cache_file: Optional path of the JSON-lines file backing the cache
+            max_size: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        super().__init__(max_size, threshold)
+        self.cache_file = cache_file
+        if cache_file and os.path.exists(cache_file):
+            self._load()
+    
+    @staticmethod
+    def _key(namespace: str, query: str) -> str:
+        # The namespace token is a content word, so it has to match exactly
+        return f"{namespace} {normalize_query(query)}"
+    
+    def _load(self):
+        """Replay the cache file, compacting it if it has grown past the cache size."""
+        lines = 0
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        self._put(record["key"], record["response"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+            
+            if lines > 2 * self.max_size:
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    for key, (_, _, response) in self._entries.items():
+                        f.write(json.dumps({"key": key, "response": response}, default=str) + "\n")
+        except OSError as e:
+            logger.error("Failed to load response cache: %s", e)
+            return
+        
+        logger.info("[CACHE] Loaded %s cached responses from %s", len(self._entries), self.cache_file)
+    
+    def lookup(self, query: str, namespace: str) -> Optional[AgentResponse]:
+        """
+        Look up a cached response for a query.
+        
+        Args:
+            query: Raw user query
+            namespace: Preferences namespace (see preferences_namespace)
+        
+        Returns:
+            The cached response re-addressed to this query, or None on a miss
+        """
+        cached = self._get(self._key(namespace, query))
+        if cached is None:
+            return None
+        
+        logger.info("[CACHE] Response hit for query: %s", query)
+        return AgentResponse(**{
+            **cached,
+            "query": query,
+            "full_response": f"Query: {query}\nResult: {cached['result']}"
+        })
+    
+    def store(self, query: str, namespace: str, response: AgentResponse):
+        """
+        Cache a response for a query.
+        
+        Args:
+            query: Raw user query
+            namespace: Preferences namespace (see preferences_namespace)
+            response: Successful response to reuse
+        """
+        key = self._key(namespace, query)
+        payload = response.model_dump()
+        self._put(key, payload)
+        
+        if self.cache_file:
+            try:
+                with open(self.cache_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({"key": key, "response": payload}, default=str) + "\n")
+            except OSError as e:
+                logger.error("Failed to persist response cache entry: %s", e)
@@ -4,20 +4,38 @@ Decision-Making Layer - Planning Next Step
 This module handles the decision-making layer of the cognitive architecture.
 It decides what actions to take based on perception and memory.
 """
+import hashlib
 import logging
 import json
+import sys
 import google.generativeai as genai
 from typing import List, Dict
+from .llm_utils import generate_json_text, parse_llm_json
 from .models import (
     PerceptionOutput,
     MemoryRetrievalResult,
     DecisionOutput,
     ActionStep
 )
-from .prompts import DECISION_PROMPT
+from .prompts import (
+    DECISION_TOOLS_SECTION,
+    DECISION_PROMPT_SUFFIX,
+    OPTIONAL_TOOL_CATEGORIES,
+    build_decision_prompt
+)
 
 logger = logging.getLogger(__name__)
 
+# Tools from the optional categories (PowerPoint, email, database)
+_OPTIONAL_TOOLS = frozenset().union(*OPTIONAL_TOOL_CATEGORIES.values())
+
+# Most math tools listed in the prompt; enabled optional-category tools are always listed
+MAX_MATH_TOOLS = 50
+
+# Prompt size (in approximate tokens, ~4 characters each) above which the
+# least relevant memory facts are left out
+PROMPT_TOKEN_BUDGET = 100_000
+
 
 class DecisionLayer:
     """
@@ -39,9 +57,76 @@ class DecisionLayer:
         """
         self.model = model
         self.user_preferences = user_preferences or {}
+        
+        # Preferences are fixed for the layer's lifetime - format them once
+        if self.user_preferences:
+            self._prefs_text = "\n".join([f"- {k}: {v}" for k, v in self.user_preferences.items()])
+        else:
+            self._prefs_text = "No preferences set"
+        
+        # Optional tool categories offered to this user (all unless restricted)
+        enabled = self.user_preferences.get("enabled_categories")
+        if enabled is None:
+            self.enabled_categories = frozenset(OPTIONAL_TOOL_CATEGORIES)
+        else:
+            if isinstance(enabled, str):
+                enabled = enabled.split(",")
+            self.enabled_categories = frozenset(str(c).strip() for c in enabled) & frozenset(OPTIONAL_TOOL_CATEGORIES)
+        self._disabled_tools = frozenset().union(*(
+            tools for category, tools in OPTIONAL_TOOL_CATEGORIES.items()
+            if category not in self.enabled_categories
+        ))
+        
+        # Static prompt prefix for the last tool list, reused while the same list is passed in
+        self._tools_source = None
+        self._static_prompt = ""
+        self.tools_manifest_sha = ""  # Short hash of the tool manifest in the prefix
+        
         logger.info("[DECISION] Decision Layer initialized")
     
-    def decide(
+    def _static_prefix(self, available_tools: List[Dict]) -> str:
+        """
+        Build the static prompt prefix with the tool manifest, memoized on the tool list.
+        
+        Args:
+            available_tools: List of tool schemas (name, description, parameters)
+            
+        Returns:
+            Static decision prompt followed by one line per enabled tool
+        """
+        if available_tools is self._tools_source:
+            return self._static_prompt
+        
+        tools_text = []
+        enabled_tools = [tool for tool in available_tools if tool['name'] not in self._disabled_tools]
+        math_tools_listed = 0
+        for tool in enabled_tools:
+            # Limit the math catalogue to avoid token overflow, so new action tools
+            # never push math tools out of the prompt
+            if tool['name'] not in _OPTIONAL_TOOLS:
+                if math_tools_listed == MAX_MATH_TOOLS:
+                    continue
+                math_tools_listed += 1
+            params_dict = tool.get('parameters', {})
+            if params_dict:
+                # Format parameters with types
+                params_list = []
+                for param_name, param_info in params_dict.items():
+                    param_type = param_info.get('type', 'any')
+                    params_list.append(f"{param_name}: {param_type}")
+                params_str = ", ".join(params_list)
+            else:
+                params_str = ""
+            tools_text.append(f"- {tool['name']}({params_str}): {tool.get('description', '')}")
+        
+        manifest = "\n".join(tools_text) if tools_text else "No tools available"
+        self._tools_source = available_tools
+        self._static_prompt = build_decision_prompt(self.enabled_categories) + DECISION_TOOLS_SECTION.format(available_tools=manifest)
+        self.tools_manifest_sha = hashlib.sha256(manifest.encode("utf-8")).hexdigest()[:8]
+        logger.debug("[DECISION] Tool manifest %s (%s tools)", self.tools_manifest_sha, len(tools_text))
+        return self._static_prompt
+    
+    async def decide(
         self, 
         perception: PerceptionOutput,
         memory: MemoryRetrievalResult,
@@ -81,34 +166,21 @@ class DecisionLayer:
                 "summary": memory.summary
             }
             
-            # Format tool schemas for the prompt
-            tools_text = []
-            for tool in available_tools[:50]:  # Limit to first 50 tools to avoid token overflow
-                params_dict = tool.get('parameters', {})
-                if params_dict:
-                    # Format parameters with types
-                    params_list = []
-                    for param_name, param_info in params_dict.items():
-                        param_type = param_info.get('type', 'any')
-                        params_list.append(f"{param_name}: {param_type}")
-                    params_str = ", ".join(params_list)
-                else:
-                    params_str = ""
-                tools_text.append(f"- {tool['name']}({params_str}): {tool.get('description', '')}")
-            tools_list = "\n".join(tools_text) if tools_text else "No tools available"
-            
-            # Format user preferences for prompt
-            if self.user_preferences:
-                prefs_text = "\n".join([f"- {k}: {v}" for k, v in self.user_preferences.items()])
-            else:
-                prefs_text = "No preferences set"
-            
-            prompt = DECISION_PROMPT.format(
-                user_preferences=prefs_text,
-                perception=json.dumps(perception_summary, indent=2),
-                memory=json.dumps(memory_summary, indent=2),
-                available_tools=tools_list
-            )
+            # Sorted keys keep the text stable whatever order the LLM produced;
+            # no indent, so the C encoder is used and the prompt stays short
+            static_prefix = self._static_prefix(available_tools)
+            perception_text = json.dumps(perception_summary, sort_keys=True, default=str)
+            while True:
+                prompt = static_prefix + DECISION_PROMPT_SUFFIX.format(
+                    user_preferences=self._prefs_text,
+                    perception=perception_text,
+                    memory=json.dumps(memory_summary, sort_keys=True, default=str)
+                )
+                if len(prompt) // 4 <= PROMPT_TOKEN_BUDGET or not memory_summary["relevant_facts"]:
+                    break
+                # Facts are ordered by relevance - drop the least relevant one
+                memory_summary["relevant_facts"].pop()
+                logger.info("[DECISION] Prompt over budget (~%s tokens) - dropped a memory fact", len(prompt) // 4)
             
             # Add previous actions context if available
             if previous_actions:
@@ -120,39 +192,40 @@ class DecisionLayer:
                 prompt += "\n\nContinue from where you left off."
             
             # DEBUG: Print the final prompt being sent to LLM
-            logger.debug("=" * 80)
-            logger.debug("DECISION_PROMPT (Final prompt being sent to LLM):")
-            logger.debug("=" * 80)
-            logger.debug(prompt)
-            logger.debug("=" * 80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("=" * 80)
+                logger.debug("Decision prompt (static prefix + tools + suffix) being sent to LLM:")
+                logger.debug("=" * 80)
+                logger.debug(prompt)
+                logger.debug("=" * 80)
             
             # Call LLM to create action plan
             logger.debug("Calling LLM for decision-making...")
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
+            response_text = await generate_json_text(self.model, prompt)
             
-            logger.debug(f"Decision LLM response: {response_text}")
+            logger.debug("Decision LLM response: %s", response_text)
             
-            # Parse JSON response
-            # Handle markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split('\n')
-                json_lines = [line for line in lines if line.strip() and not line.strip().startswith('```')]
-                response_text = '\n'.join(json_lines)
+            # Parse JSON response (markdown code fences are tolerated)
+            decision_data = parse_llm_json(response_text)
             
-            decision_data = json.loads(response_text)
+            # Plans reuse a small vocabulary of action types and tool names;
+            # interning makes the routing comparisons downstream identity checks
+            for step in decision_data.get("action_plan") or ():
+                for key in ("action_type", "tool_name"):
+                    if isinstance(step.get(key), str):
+                        step[key] = sys.intern(step[key])
             
             # Validate and create Pydantic model
             decision = DecisionOutput(**decision_data)
             
-            logger.info(f"[DECISION] Complete - {len(decision.action_plan)} steps planned")
-            logger.debug(f"Reasoning: {decision.reasoning}")
+            logger.info("[DECISION] Complete - %s steps planned", len(decision.action_plan))
+            logger.debug("Reasoning: %s", decision.reasoning)
             
             return decision
             
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse decision JSON: {e}")
-            logger.error(f"Raw response: {response_text}")
+            logger.error("Failed to parse decision JSON: %s", e)
+            logger.error("Raw response: %s", response_text)
             
             # Fallback: create a simple response action
             logger.warning("Using fallback decision - direct response")
@@ -174,7 +247,7 @@ class DecisionLayer:
             )
             
         except Exception as e:
-            logger.error(f"Error in decision layer: {e}")
+            logger.error("Error in decision layer: %s", e)
             raise ValueError(f"Decision-making failed: {str(e)}")
     
     def should_continue_iteration(self, decision: DecisionOutput) -> bool:
@@ -0,0 +1,124 @@
+"""
+Decision Planner - Planning Without the LLM
+
+This module builds action plans for calculations whose plan is fully
+determined by the perceived operation and numbers, e.g. an addition of two
+numbers always becomes a single t_add call. Plans are looked up in a
+dispatch table keyed by operation; anything not in the table is left to the
+decision LLM.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .models import PerceptionOutput, DecisionOutput, ActionStep
+
+logger = logging.getLogger(__name__)
+
+# Builds (tool name, tool input) from the perceived numbers, or None if they don't fit
+PlanBuilder = Callable[[List[float]], Optional[Tuple[str, Dict[str, Any]]]]
+
+
+def _two_numbers(tool_name: str) -> PlanBuilder:
+    """Builder for tools taking exactly two numbers as a and b."""
+    def build(numbers):
+        if len(numbers) != 2:
+            return None
+        return tool_name, {"a": numbers[0], "b": numbers[1]}
+    return build
+
+
+def _number_list(tool_name: str) -> PlanBuilder:
+    """Builder for tools taking a non-empty list of numbers."""
+    def build(numbers):
+        if not numbers:
+            return None
+        return tool_name, {"numbers": list(numbers)}
+    return build
+
+
+def _division(numbers):
+    """Division plan; dividing by zero is left to the LLM to explain."""
+    if len(numbers) != 2 or numbers[1] == 0:
+        return None
+    return "t_calculate_division", {"a": numbers[0], "b": numbers[1]}
+
+
+# Perceived operation -> plan builder
+OPERATION_TO_PLAN_BUILDER: Dict[str, PlanBuilder] = {
+    "addition": _two_numbers("t_add"),
+    "subtraction": _two_numbers("t_calculate_difference"),
+    "multiplication": _number_list("t_number_list_to_product"),
+    "division": _division,
+    "sum": _number_list("t_number_list_to_sum"),
+    "mean": _number_list("t_mean"),
+    "median": _number_list("t_median"),
+}
+
+# Intents whose plan can depend only on the operation and numbers
+_PLANNABLE_INTENTS = frozenset({"calculation"})
+_STATISTICAL_TOOLS = frozenset({"t_mean", "t_median"})
+
+# Tools whose answer depends on operand order. LLM perceptions list numbers in
+# text order ("subtract 5 from 20" -> [5, 20]), so these are only planned when
+# the order is known to be operand order
+_ORDER_SENSITIVE_TOOLS = frozenset({"t_calculate_difference", "t_calculate_division"})
+
+
+def build_plan(
+    perception: PerceptionOutput,
+    tool_exists: Callable[[str], bool],
+    operands_ordered: bool = False
+) -> Optional[DecisionOutput]:
+    """
+    Build the action plan for a perceived single-operation calculation.
+    
+    Args:
+        perception: Output from the perception layer
+        tool_exists: Predicate telling whether the MCP server offers a tool
+        operands_ordered: Whether the perceived numbers are in operand order,
+            as for perceptions from perception_fastpath.fast_perceive
+    
+    Returns:
+        DecisionOutput with one tool call, or None if the LLM should plan
+    """
+    entities = perception.entities
+    if perception.intent not in _PLANNABLE_INTENTS or set(entities) != {"operation", "numbers"}:
+        return None
+    
+    builder = OPERATION_TO_PLAN_BUILDER.get(str(entities["operation"]).lower())
+    numbers = entities["numbers"]
+    if builder is None or not isinstance(numbers, list):
+        return None
+    if not all(isinstance(n, (int, float)) and not isinstance(n, bool) for n in numbers):
+        return None
+    
+    planned = builder(numbers)
+    if planned is None:
+        return None
+    tool_name, tool_input = planned
+    if tool_name in _ORDER_SENSITIVE_TOOLS and not operands_ordered:
+        return None
+    if not tool_exists(tool_name):
+        return None
+    
+    operation = entities["operation"]
+    operands = ", ".join(map(str, numbers))
+    reasoning_type = "statistical" if tool_name in _STATISTICAL_TOOLS else "arithmetic"
+    logger.info("[DECISION] Planned %s with %s (no LLM call)", operation, tool_name)
+    return DecisionOutput(
+        action_plan=[
+            ActionStep(
+                step_number=1,
+                action_type="tool_call",
+                description=f"Compute the {operation} of {operands}",
+                tool_name=tool_name,
+                parameters={"input": tool_input},
+                reasoning=f"{tool_name} computes the {operation} directly",
+                reasoning_type=reasoning_type
+            )
+        ],
+        reasoning=f"Single {operation} of the given numbers",
+        reasoning_type=reasoning_type,
+        expected_outcome=f"The {operation} of {operands}",
+        confidence=1.0,
+        should_continue=False
+    )
@@ -0,0 +1,171 @@
+"""
+LLM Utilities - Reading Model Output
+
+This module holds helpers shared by the LLM-backed layers for turning raw
+model responses into Python data.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Exact-prompt response cache, opt-in with AGENT_CACHE_LLM=1 (LLM output is nondeterministic)
+LLM_CACHE_SIZE = 256
+_response_cache: OrderedDict = OrderedDict()
+
+# Deadline per attempt in seconds; a timed-out call is retried with a longer one
+LLM_ATTEMPT_TIMEOUTS = (10, 20, 30)
+
+
+def parse_llm_json(response_text: str) -> Any:
+    """
+    Parse a JSON response, tolerating a surrounding markdown code fence.
+    
+    Args:
+        response_text: Stripped text of the LLM response
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    if response_text.startswith("```"):
+        # Drop the opening ``` / ```json line and the closing fence
+        start = response_text.find("\n") + 1
+        end = response_text.rfind("```")
+        response_text = response_text[start:end] if end >= start else response_text[start:]
+    return json.loads(response_text)
+
+
+class _JsonObjectScanner:
+    """
+    Incremental brace matcher that finds where the first top-level JSON object ends.
+    
+    Braces inside string literals (including escaped quotes) are ignored.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> Optional[int]:
+        """
+        Scan the next piece of the response.
+        
+        Args:
+            text: Next chunk of response text
+            
+        Returns:
+            Index just past the closing brace within text, or None if not closed yet
+        """
+        for i, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.started:
+                    self.in_string = True
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif char == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return None
+
+
+async def _stream_json_text(model, prompt: str) -> str:
+    """
+    Stream one response and stop reading once the top-level JSON object closes.
+    
+    Args:
+        model: Gemini model instance
+        prompt: Prompt asking for a single JSON object
+        
+    Returns:
+        Stripped response text up to and including the closing brace
+    """
+    response = await model.generate_content_async(prompt, stream=True)
+    scanner = _JsonObjectScanner()
+    parts = []
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts (e.g. only safety metadata)
+            continue
+        end = scanner.feed(text)
+        if end is not None:
+            parts.append(text[:end])
+            logger.debug("JSON object complete - stopped reading the response stream")
+            break
+        parts.append(text)
+    
+    return "".join(parts).strip()
+
+
+async def generate_json_text(model, prompt: str) -> str:
+    """
+    Stream a JSON response and stop reading once the top-level object closes.
+    
+    Each attempt runs under a deadline from LLM_ATTEMPT_TIMEOUTS; a timed-out
+    attempt is retried after a short jittered backoff. With AGENT_CACHE_LLM=1,
+    responses are memoized per (model, exact prompt) in a small LRU, so
+    retries and repeated prompts skip the model call.
+    
+    Args:
+        model: Gemini model instance
+        prompt: Prompt asking for a single JSON object
+        
+    Returns:
+        Response text up to and including the closing brace (or all of it,
+        if the object never closes)
+        
+    Raises:
+        TimeoutError: If every attempt times out
+    """
+    cache_key = None
+    if os.getenv("AGENT_CACHE_LLM") == "1":
+        cache_key = hashlib.blake2b(
+            f"{getattr(model, 'model_name', '')}\0{prompt}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            _response_cache.move_to_end(cache_key)
+            logger.info("[CACHE] LLM response hit - skipping the model call")
+            return cached
+    
+    for attempt, deadline in enumerate(LLM_ATTEMPT_TIMEOUTS):
+        try:
+            async with asyncio.timeout(deadline):
+                response_text = await _stream_json_text(model, prompt)
+            break
+        except TimeoutError:
+            if attempt == len(LLM_ATTEMPT_TIMEOUTS) - 1:
+                raise TimeoutError(f"LLM call timed out after {len(LLM_ATTEMPT_TIMEOUTS)} attempts")
+            # Jittered backoff so concurrent agents don't retry in lockstep
+            backoff = 0.5 * 2 ** attempt + random.random() * 0.2
+            logger.info("LLM call timed out after %ss - retry %s/%s in %.1fs",
+                        deadline, attempt + 1, len(LLM_ATTEMPT_TIMEOUTS) - 1, backoff)
+            await asyncio.sleep(backoff)
+    
+    if cache_key is not None and response_text:
+        _response_cache[cache_key] = response_text
+        while len(_response_cache) > LLM_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return response_text
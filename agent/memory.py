@@ -3,10 +3,17 @@ Memory Layer - Remembering Stuff
 
 This module handles the memory layer of the cognitive architecture.
 It stores and retrieves facts, user preferences, and context information.
+
+Changes are appended to a write-ahead log (one JSON line per change) next to
+the memory file, so saving costs O(new facts) instead of rewriting the whole
+JSON snapshot. Once WAL_COMPACT_EVERY records have piled up, the next
+save_memory() compacts the log into the snapshot; close() always does.
 """
 import logging
 import json
+import math
 import os
+from collections import Counter, defaultdict
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from pathlib import Path
@@ -23,6 +30,9 @@ logger = logging.getLogger(__name__)
 MAX_MEMORY_SIZE_MB = 5  # Maximum size before rotation
 MAX_ROTATED_FILES = 10  # Keep only the last N rotated files
 
+# Write-ahead log settings
+WAL_COMPACT_EVERY = 500  # Compact the log into the JSON snapshot after N records
+
 
 class MemoryLayer:
     """
@@ -43,10 +53,22 @@ class MemoryLayer:
         """
         self.memory_state = MemoryState()
         self.memory_file = memory_file
+        self.wal_file = str(Path(memory_file).with_suffix(".wal")) if memory_file else None
+        self._wal = None
+        self._wal_records = 0
+        # Set once the log is long enough to fold into the snapshot on the next save
+        self._compaction_due = False
         
-        # Load existing memory only if explicitly requested and file exists
-        if load_existing and memory_file and Path(memory_file).exists():
+        # Inverted index: word -> positions of the facts containing it
+        self._word_index: Dict[str, List[int]] = defaultdict(list)
+        self._indexed_facts: Optional[List[MemoryFact]] = None
+        self._indexed_count = 0
+        
+        # Load existing memory only if explicitly requested; otherwise start fresh
+        if load_existing and memory_file:
             self.load_memory()
+        elif self.wal_file and os.path.exists(self.wal_file):
+            os.remove(self.wal_file)
         
         logger.info("[MEMORY] Memory Layer initialized")
     
@@ -66,7 +88,8 @@ class MemoryLayer:
             relevance_score=relevance_score
         )
         self.memory_state.facts.append(fact)
-        logger.info(f"[MEMORY] Stored fact: {content[:50]}...")
+        self._append_wal({"op": "fact", "fact": fact.model_dump()})
+        logger.info("[MEMORY] Stored fact: %s...", content[:50])
     
     def store_facts(self, facts: List[str], source: str = "perception"):
         """
@@ -76,9 +99,18 @@ class MemoryLayer:
             facts: List of facts to store
             source: Source of the facts
         """
-        for fact in facts:
-            self.store_fact(fact, source=source)
-        logger.info(f"[MEMORY] Stored {len(facts)} facts from {source}")
+        if not facts:
+            return
+        
+        # One timestamp and one log record for the whole batch
+        timestamp = datetime.now().isoformat()
+        new_facts = [
+            MemoryFact(content=content, timestamp=timestamp, source=source, relevance_score=1.0)
+            for content in facts
+        ]
+        self.memory_state.facts.extend(new_facts)
+        self._append_wal({"op": "facts", "facts": [fact.model_dump() for fact in new_facts]})
+        logger.info("[MEMORY] Stored %s facts from %s", len(facts), source)
     
     def update_context(self, key: str, value: Any):
         """
@@ -89,7 +121,8 @@ class MemoryLayer:
             value: Context value
         """
         self.memory_state.context[key] = value
-        logger.debug(f"Updated context: {key} = {value}")
+        self._append_wal({"op": "context", "key": key, "value": value})
+        logger.debug("Updated context: %s = %s", key, value)
     
     def update_preference(self, key: str, value: Any):
         """
@@ -100,7 +133,52 @@ class MemoryLayer:
             value: Preference value
         """
         self.memory_state.user_preferences[key] = value
-        logger.info(f"Updated preference: {key} = {value}")
+        self._append_wal({"op": "preference", "key": key, "value": value})
+        logger.info("Updated preference: %s = %s", key, value)
+    
+    def update_preferences(self, preferences: Dict[str, Any]):
+        """
+        Update several user preferences at once.
+        
+        Args:
+            preferences: Preference keys and values
+        """
+        self.memory_state.user_preferences.update(preferences)
+        self._append_wal({"op": "preferences", "values": preferences})
+        logger.info("Updated %s preferences", len(preferences))
+    
+    def _sync_index(self):
+        """
+        Bring the word index up to date with the stored facts.
+        
+        Facts are only ever appended, so new ones are indexed incrementally.
+        A replaced fact list (clear or load) triggers a full rebuild.
+        """
+        facts = self.memory_state.facts
+        if facts is not self._indexed_facts or len(facts) < self._indexed_count:
+            self._word_index.clear()
+            self._indexed_facts = facts
+            self._indexed_count = 0
+        
+        for position in range(self._indexed_count, len(facts)):
+            for word in set(facts[position].content.lower().split()):
+                self._word_index[word].append(position)
+        self._indexed_count = len(facts)
+    
+    @staticmethod
+    def _min_overlap(query_word_count: int, min_relevance: float) -> int:
+        """
+        Smallest word overlap whose score (overlap / query words) meets min_relevance.
+        
+        Lets retrieval compare integers instead of dividing for every candidate;
+        the result is nudged so float rounding matches the division exactly.
+        """
+        k = max(1, math.ceil(min_relevance * query_word_count))
+        while k > 1 and (k - 1) / query_word_count >= min_relevance:
+            k -= 1
+        while k / query_word_count < min_relevance:
+            k += 1
+        return k
     
     def retrieve_relevant_facts(self, query: MemoryQuery) -> MemoryRetrievalResult:
         """
@@ -115,22 +193,23 @@ class MemoryLayer:
         Returns:
             MemoryRetrievalResult with relevant facts and context
         """
-        logger.info(f"[MEMORY] Retrieving memories for: {query.query}")
+        logger.info("[MEMORY] Retrieving memories for: %s", query.query)
         
-        # Simple keyword-based retrieval (will be upgraded to vector search later)
+        # Simple keyword-based retrieval (will be upgraded to vector search later).
+        # The index only touches facts that share at least one word with the query.
+        self._sync_index()
         query_words = set(query.query.lower().split())
-        relevant_facts = []
+        overlaps = Counter()
+        for word in query_words:
+            overlaps.update(self._word_index.get(word, ()))
         
-        for fact in self.memory_state.facts:
-            fact_words = set(fact.content.lower().split())
-            # Calculate simple overlap score
-            overlap = len(query_words.intersection(fact_words))
-            
-            if overlap > 0:
-                # Update relevance score based on overlap
-                score = overlap / len(query_words)
-                if score >= query.min_relevance:
-                    relevant_facts.append(fact)
+        # Keep storage order so ties in relevance sort the same way as before
+        min_overlap = self._min_overlap(len(query_words), query.min_relevance) if query_words else 1
+        relevant_facts = [
+            self.memory_state.facts[position]
+            for position in sorted(overlaps)
+            if overlaps[position] >= min_overlap
+        ]
         
         # Sort by relevance score and limit results
         relevant_facts.sort(key=lambda f: f.relevance_score, reverse=True)
@@ -147,7 +226,7 @@ class MemoryLayer:
             summary=summary
         )
         
-        logger.info(f"[MEMORY] Retrieved {len(relevant_facts)} relevant facts")
+        logger.info("[MEMORY] Retrieved %s relevant facts", len(relevant_facts))
         return result
     
     def get_all_facts(self) -> List[MemoryFact]:
@@ -185,11 +264,13 @@ class MemoryLayer:
             summary: New conversation summary
         """
         self.memory_state.conversation_summary = summary
+        self._append_wal({"op": "summary", "value": summary})
         logger.info("Updated conversation summary")
     
     def clear_memory(self):
         """Clear all memory (useful for testing or reset)."""
         self.memory_state = MemoryState()
+        self._append_wal({"op": "clear"})
         logger.warning("[MEMORY] Memory cleared")
     
     def _rotate_memory_file(self):
@@ -214,13 +295,13 @@ class MemoryLayer:
             
             # Rename current file
             os.rename(self.memory_file, rotated_file)
-            logger.info(f"[MEMORY] Rotated memory file to {rotated_file.name} (size: {file_size_mb:.2f}MB)")
+            logger.info("[MEMORY] Rotated memory file to %s (size: %.2fMB)", rotated_file.name, file_size_mb)
             
             # Clean up old rotated files (keep only last N)
             self._cleanup_rotated_files()
             
         except Exception as e:
-            logger.error(f"Failed to rotate memory file: {e}")
+            logger.error("Failed to rotate memory file: %s", e)
     
     def _cleanup_rotated_files(self):
         """
@@ -240,52 +321,170 @@ class MemoryLayer:
             # Delete files beyond the limit
             for old_file in rotated_files[MAX_ROTATED_FILES:]:
                 os.remove(old_file)
-                logger.info(f"[MEMORY] Deleted old rotated file: {old_file.name}")
+                logger.info("[MEMORY] Deleted old rotated file: %s", old_file.name)
                 
         except Exception as e:
-            logger.error(f"Failed to cleanup rotated files: {e}")
+            logger.error("Failed to cleanup rotated files: %s", e)
+    
+    def _append_wal(self, record: Dict[str, Any]):
+        """
+        Append a single change record to the write-ahead log.
+        
+        Args:
+            record: JSON-serializable change record
+        """
+        if not self.wal_file:
+            return
+        
+        try:
+            if self._wal is None:
+                self._wal = open(self.wal_file, 'a', encoding='utf-8')
+            self._wal.write(json.dumps(record, default=str) + "\n")
+            self._wal_records += 1
+        except Exception as e:
+            logger.error("Failed to append to memory log: %s", e)
+            return
+        
+        # Compacting rewrites the whole snapshot - leave it to save_memory(), which
+        # callers run off the event loop, instead of stalling this store call
+        if self._wal_records >= WAL_COMPACT_EVERY:
+            self._compaction_due = True
+    
+    def _apply_wal_record(self, record: Dict[str, Any]):
+        """
+        Apply a write-ahead log record to the in-memory state.
+        
+        Args:
+            record: Change record read from the log
+        """
+        op = record.get("op")
+        if op == "fact":
+            self.memory_state.facts.append(MemoryFact(**record["fact"]))
+        elif op == "facts":
+            self.memory_state.facts.extend(MemoryFact(**fact) for fact in record["facts"])
+        elif op == "context":
+            self.memory_state.context[record["key"]] = record["value"]
+        elif op == "preference":
+            self.memory_state.user_preferences[record["key"]] = record["value"]
+        elif op == "preferences":
+            self.memory_state.user_preferences.update(record["values"])
+        elif op == "summary":
+            self.memory_state.conversation_summary = record["value"]
+        elif op == "clear":
+            self.memory_state = MemoryState()
+    
+    def _replay_wal(self):
+        """
+        Replay the write-ahead log on top of the loaded snapshot.
+        """
+        if not (self.wal_file and os.path.exists(self.wal_file)):
+            return
+        
+        replayed = 0
+        with open(self.wal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._apply_wal_record(json.loads(line))
+                    replayed += 1
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # A torn last line from a crash - everything before it is intact
+                    logger.warning("[MEMORY] Skipping unreadable memory log record")
+        
+        self._wal_records = replayed
+        self._compaction_due = replayed >= WAL_COMPACT_EVERY
+        logger.info("[MEMORY] Replayed %s records from %s", replayed, self.wal_file)
     
     def save_memory(self):
         """
-        Save memory to JSON file for persistence.
-        Automatically rotates the file if it exceeds size limit.
+        Make all memory changes so far durable.
+        
+        Changes are already in the write-ahead log, so this only flushes and
+        fsyncs it, unless the log has grown past WAL_COMPACT_EVERY records -
+        then it is compacted into the JSON snapshot instead.
         """
         if not self.memory_file:
             logger.warning("No memory file specified, cannot save")
             return
         
+        if self._compaction_due:
+            self.compact()
+            return
+        
+        if self._wal is None:
+            return
+        
+        try:
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            logger.info("[MEMORY] Memory log synced to %s (%s records)", self.wal_file, self._wal_records)
+        except Exception as e:
+            logger.error("Failed to save memory: %s", e)
+    
+    def compact(self):
+        """
+        Write the full memory snapshot to the JSON file and truncate the log.
+        Automatically rotates the file if it exceeds size limit.
+        """
+        if not self.memory_file:
+            return
+        
         try:
             # Check if rotation is needed before saving
             self._rotate_memory_file()
             
-            # Save memory to file
+            # Write the snapshot atomically so a crash never leaves a half-written file
             memory_dict = self.memory_state.model_dump()
-            with open(self.memory_file, 'w') as f:
+            tmp_file = f"{self.memory_file}.tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(memory_dict, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.memory_file)
+            
+            # The snapshot now holds everything in the log
+            if self._wal is not None:
+                self._wal.close()
+            self._wal = open(self.wal_file, 'w', encoding='utf-8')
+            self._wal_records = 0
+            self._compaction_due = False
             
             # Log file size
             file_size_kb = os.path.getsize(self.memory_file) / 1024
-            logger.info(f"[MEMORY] Memory saved to {self.memory_file} (size: {file_size_kb:.1f}KB)")
+            logger.info("[MEMORY] Memory compacted to %s (size: %.1fKB)", self.memory_file, file_size_kb)
             
         except Exception as e:
-            logger.error(f"Failed to save memory: {e}")
+            logger.error("Failed to compact memory: %s", e)
+    
+    def close(self):
+        """
+        Compact the log into the snapshot and release the log file.
+        """
+        self.compact()
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
     
     def load_memory(self):
         """
-        Load memory from JSON file.
+        Load memory from the JSON snapshot and replay the write-ahead log.
         """
         if not self.memory_file:
             logger.warning("No memory file specified, cannot load")
             return
         
         try:
-            with open(self.memory_file, 'r') as f:
-                memory_dict = json.load(f)
-            self.memory_state = MemoryState(**memory_dict)
-            logger.info(f"[MEMORY] Memory loaded from {self.memory_file}")
-            logger.info(f"Loaded {len(self.memory_state.facts)} facts")
+            if os.path.exists(self.memory_file):
+                with open(self.memory_file, 'r') as f:
+                    memory_dict = json.load(f)
+                self.memory_state = MemoryState(**memory_dict)
+                logger.info("[MEMORY] Memory loaded from %s", self.memory_file)
+            self._replay_wal()
+            logger.info("Loaded %s facts", len(self.memory_state.facts))
         except Exception as e:
-            logger.error(f"Failed to load memory: {e}")
+            logger.error("Failed to load memory: %s", e)
     
     def get_summary(self) -> str:
         """
@@ -1,8 +1,8 @@
 """
 Pydantic models for AI agent input and output validation.
 """
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Literal, Tuple, Union
 
 
 # Query and Response Models
@@ -20,6 +20,16 @@ class AgentResponse(BaseModel):
     full_response: str = Field(..., description="Full formatted response")
 
 
+class PartialResponse(BaseModel):
+    """Progress update streamed while a query is being processed"""
+    query: str = Field(..., description="Original query")
+    step_number: int = Field(..., description="Action step that just completed")
+    tool_name: Optional[str] = Field(default=None, description="Tool called by the step, if any")
+    success: bool = Field(..., description="Whether the step succeeded")
+    result: Optional[Any] = Field(default=None, description="Result data from the step")
+    error: Optional[str] = Field(default=None, description="Error message if the step failed")
+
+
 # Conversation History Models
 class FunctionCallHistoryItem(BaseModel):
     """Model for function call history items"""
@@ -173,6 +183,7 @@ class PerceptionOutput(BaseModel):
     confidence: float = Field(default=1.0, ge=0.0, le=1.0, description="Confidence in perception")
     self_check: Optional[SelfCheckPerception] = Field(default=None, description="Self-verification results")
     fallback: Optional[FallbackPerception] = Field(default=None, description="Fallback handling information")
+    direct_answer: Optional[Union[str, int, float]] = Field(default=None, description="Answer for queries that need no tools or planning")
 
 
 # 2. MEMORY LAYER MODELS
@@ -194,6 +205,7 @@ class MemoryState(BaseModel):
 
 class MemoryQuery(BaseModel):
     """Query to retrieve relevant memories"""
+    model_config = ConfigDict(frozen=True)
     query: str = Field(..., description="Query to search memories")
     max_results: int = Field(default=5, ge=1, le=20, description="Maximum number of results")
     min_relevance: float = Field(default=0.5, ge=0.0, le=1.0, description="Minimum relevance score")
@@ -275,5 +287,9 @@ class CognitiveState(BaseModel):
     memory: MemoryState = Field(default_factory=MemoryState)
     decision: Optional[DecisionOutput] = None
     action_results: List[ActionResult] = Field(default_factory=list)
+    parsed_results: List[Tuple[str, Any]] = Field(
+        default_factory=list,
+        description="(\"status\" or \"value\", parsed result) for each classified tool result"
+    )
     iteration: int = Field(default=0, ge=0)
     complete: bool = Field(default=False)
@@ -7,8 +7,9 @@ It translates raw user input into structured information using an LLM.
 import logging
 import json
 import google.generativeai as genai
+from .llm_utils import generate_json_text, parse_llm_json
 from .models import PerceptionOutput
-from .prompts import PERCEPTION_PROMPT
+from .prompts import PERCEPTION_PROMPT_STATIC, PERCEPTION_PROMPT_SUFFIX
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +31,16 @@ class PerceptionLayer:
         """
         self.model = model
         self.user_preferences = user_preferences or {}
+        
+        # Preferences are fixed for the layer's lifetime - format them once
+        if self.user_preferences:
+            self._prefs_text = "\n".join([f"- {k}: {v}" for k, v in self.user_preferences.items()])
+        else:
+            self._prefs_text = "No preferences set"
+        
         logger.info("Perception Layer initialized")
     
-    def perceive(self, query: str) -> PerceptionOutput:
+    async def perceive(self, query: str) -> PerceptionOutput:
         """
         Analyze user query and extract structured information.
         
@@ -45,57 +53,43 @@ class PerceptionLayer:
         Raises:
             ValueError: If perception fails or produces invalid output
         """
-        logger.info(f"[PERCEIVE] Analyzing query: {query}")
+        logger.info("[PERCEIVE] Analyzing query: %s", query)
         
         try:
-            # Format user preferences for prompt
-            if self.user_preferences:
-                prefs_text = "\n".join([f"- {k}: {v}" for k, v in self.user_preferences.items()])
-            else:
-                prefs_text = "No preferences set"
-            
             # Format the perception prompt with the user query and preferences
-            prompt = PERCEPTION_PROMPT.format(
-                user_preferences=prefs_text,
+            prompt = PERCEPTION_PROMPT_STATIC + PERCEPTION_PROMPT_SUFFIX.format(
+                user_preferences=self._prefs_text,
                 query=query
             )
             
             # DEBUG: Print the final prompt being sent to LLM
-            logger.debug("=" * 80)
-            logger.debug("PERCEPTION_PROMPT (Final prompt being sent to LLM):")
-            logger.debug("=" * 80)
-            logger.debug(prompt)
-            logger.debug("=" * 80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("=" * 80)
+                logger.debug("Perception prompt (static prefix + suffix) being sent to LLM:")
+                logger.debug("=" * 80)
+                logger.debug(prompt)
+                logger.debug("=" * 80)
             
             # Call LLM to extract structured information
             logger.debug("Calling LLM for perception...")
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            logger.debug(f"Perception LLM response: {response_text}")
+            response_text = await generate_json_text(self.model, prompt)
             
-            # Parse JSON response
-            # Handle markdown code blocks if present
-            if response_text.startswith("```"):
-                # Remove markdown code blocks
-                lines = response_text.split('\n')
-                # Find lines that are not ``` or ```json
-                json_lines = [line for line in lines if line.strip() and not line.strip().startswith('```')]
-                response_text = '\n'.join(json_lines)
+            logger.debug("Perception LLM response: %s", response_text)
             
-            perception_data = json.loads(response_text)
+            # Parse JSON response (markdown code fences are tolerated)
+            perception_data = parse_llm_json(response_text)
             
             # Validate and create Pydantic model
             perception = PerceptionOutput(**perception_data)
             
-            logger.info(f"[PERCEIVE] Complete - Intent: {perception.intent}, Thought: {perception.thought_type}")
-            logger.debug(f"Extracted facts: {perception.extracted_facts}")
+            logger.info("[PERCEIVE] Complete - Intent: %s, Thought: %s", perception.intent, perception.thought_type)
+            logger.debug("Extracted facts: %s", perception.extracted_facts)
             
             return perception
             
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse perception JSON: {e}")
-            logger.error(f"Raw response: {response_text}")
+            logger.error("Failed to parse perception JSON: %s", e)
+            logger.error("Raw response: %s", response_text)
             
             # Fallback: create a basic perception output
             logger.warning("Using fallback perception")
@@ -109,7 +103,7 @@ class PerceptionLayer:
             )
             
         except Exception as e:
-            logger.error(f"Error in perception layer: {e}")
+            logger.error("Error in perception layer: %s", e)
             raise ValueError(f"Perception failed: {str(e)}")
     
     def extract_facts_from_result(self, result: str, operation: str) -> list[str]:
@@ -0,0 +1,99 @@
+"""
+Perception Fast Path - Understanding Input Without the LLM
+
+This module recognizes trivially structured queries ("What is 2 + 3?",
+"average of 10, 20, 30") with regular expressions and builds their
+perception output directly, skipping the perception LLM call. Anything
+that does not match a pattern exactly is left to the LLM.
+"""
+import logging
+import re
+from typing import List, Optional, Union
+from .models import PerceptionOutput, SelfCheckPerception
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+
+# Polite lead-ins and trailing punctuation around the actual request
+_LEAD_RE = re.compile(
+    r"^\s*(?:(?:please\s+)?(?:what\s+is|what's|whats|calculate|compute|evaluate|find|tell\s+me)\s+(?:the\s+)?)?",
+    re.IGNORECASE
+)
+_TRAIL_RE = re.compile(r"[\s?.!]*$")
+
+_ARITHMETIC_RE = re.compile(rf"({_NUMBER})\s*([-+*/x×÷])\s*({_NUMBER})", re.IGNORECASE)
+_STATISTIC_RE = re.compile(
+    rf"(mean|average|sum|median)\s+of\s+(?:the\s+)?(?:numbers\s+)?"
+    rf"({_NUMBER}(?:\s*,?\s*(?:and\s+)?{_NUMBER})+)",
+    re.IGNORECASE
+)
+_NUMBER_RE = re.compile(_NUMBER)
+
+_OPERATIONS = {
+    "+": "addition",
+    "-": "subtraction",
+    "*": "multiplication",
+    "x": "multiplication",
+    "×": "multiplication",
+    "/": "division",
+    "÷": "division",
+}
+_STATISTICS = {
+    "mean": "mean",
+    "average": "mean",
+    "sum": "sum",
+    "median": "median",
+}
+
+
+def _to_number(text: str) -> Union[int, float]:
+    """Parse a number, keeping integers as int."""
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def _perception(operation: str, operands: List[Union[int, float]], query: str) -> PerceptionOutput:
+    """Build the perception output for a recognized calculation."""
+    return PerceptionOutput(
+        intent="calculation",
+        entities={"operation": operation, "numbers": operands},
+        thought_type="Problem Solving",
+        extracted_facts=[f"User asked for the {operation} of {', '.join(map(str, operands))}"],
+        requires_tools=True,
+        confidence=1.0,
+        self_check=SelfCheckPerception(
+            clarity_verified=True,
+            entities_complete=True,
+            reasoning=f"Matched rule-based pattern for {operation}: {query}"
+        )
+    )
+
+
+def fast_perceive(query: str) -> Optional[PerceptionOutput]:
+    """
+    Build the perception output for a trivially structured query.
+    
+    Args:
+        query: Raw user input string
+    
+    Returns:
+        PerceptionOutput if the whole query matches a known pattern, else None
+    """
+    core = _TRAIL_RE.sub("", _LEAD_RE.sub("", query, count=1), count=1)
+    
+    match = _ARITHMETIC_RE.fullmatch(core)
+    if match:
+        left, operator, right = match.groups()
+        operation = _OPERATIONS[operator.lower()]
+        logger.info("[PERCEIVE] Fast path - %s", operation)
+        return _perception(operation, [_to_number(left), _to_number(right)], query)
+    
+    match = _STATISTIC_RE.fullmatch(core)
+    if match:
+        statistic, numbers = match.groups()
+        operation = _STATISTICS[statistic.lower()]
+        logger.info("[PERCEIVE] Fast path - %s", operation)
+        return _perception(operation, [_to_number(n) for n in _NUMBER_RE.findall(numbers)], query)
+    
+    return None
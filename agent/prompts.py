@@ -1,12 +1,31 @@
 """
 System prompts for the AI agent.
 """
+import functools
+
+__all__ = [
+    'PERCEPTION_PROMPT_STATIC',
+    'PERCEPTION_PROMPT_SUFFIX',
+    'DECISION_PROMPT_STATIC',
+    'MATH_TOOL_CATEGORIES',
+    'OPTIONAL_TOOL_CATEGORIES',
+    'build_decision_prompt',
+    'DECISION_TOOLS_SECTION',
+    'DECISION_PROMPT_SUFFIX',
+    'PERCEPTION_PROMPT',
+    'DECISION_PROMPT',
+]
+
+# Static instructions come first and dynamic fields last, so the long shared
+# prefix is identical on every call and can be served from the provider's
+# prompt cache. The static parts are plain text; only the suffixes are
+# format templates.
 
 # ============================================================================
 # PERCEPTION LAYER PROMPT
 # ============================================================================
 
-PERCEPTION_PROMPT = """
+PERCEPTION_PROMPT_STATIC = """
 You are the Perception Layer of a Math AI Agent. Analyze user queries and extract structured information.
 
 **IMPORTANT: This is a SPECIALIZED MATH AI AGENT**
@@ -22,8 +41,6 @@ You are the Perception Layer of a Math AI Agent. Analyze user queries and extrac
 - Web searches for non-mathematical information
 - Tasks with NO mathematical component
 
-**User Preferences:** {user_preferences}
-
 **Critical Rules:**
 1. If the query has ANY mathematical component (calculation, logic, equation), treat it as IN SCOPE
 2. Email/PowerPoint/Database operations are IN SCOPE when paired with math calculations
@@ -32,85 +49,97 @@ You are the Perception Layer of a Math AI Agent. Analyze user queries and extrac
    - "intent": "out_of_scope"
    - "fallback.is_uncertain": true
    - "fallback.suggested_clarification": "This query is outside my mathematical capabilities. I can help with arithmetic, algebra, geometry, statistics, logical reasoning, and sending results via email/PowerPoint/database."
+5. ONLY if the query is trivial and you are certain of the answer without any tool (e.g., "What is 2 + 2?"), set:
+   - "intent": "direct_answer"
+   - "requires_tools": false
+   - "direct_answer": the final answer as a short string
+   Otherwise "direct_answer" must be null.
 
 Output JSON with this structure:
-{{
-    "intent": "calculation|information_query|task_creation|tool_action|conditional_action|multi_step|out_of_scope",
-    "entities": {{"<type>": "<value>", ...}},
+{
+    "intent": "calculation|information_query|task_creation|tool_action|conditional_action|multi_step|direct_answer|out_of_scope",
+    "entities": {"<type>": "<value>", ...},
     "thought_type": "Planning|Analysis|Decision Making|Problem Solving|Memory Integration",
     "extracted_facts": ["fact1", "fact2", ...],
     "requires_tools": true|false,
     "confidence": 0.0-1.0,
-    "self_check": {{"clarity_verified": bool, "entities_complete": bool, "reasoning": "..."}},
-    "fallback": {{"is_uncertain": bool, "uncertain_aspects": [...], "suggested_clarification": "..." or null}}
-}}
+    "self_check": {"clarity_verified": bool, "entities_complete": bool, "reasoning": "..."},
+    "fallback": {"is_uncertain": bool, "uncertain_aspects": [...], "suggested_clarification": "..." or null},
+    "direct_answer": "..." or null
+}
+"""
 
-Respond with ONLY the JSON object.
+PERCEPTION_PROMPT_SUFFIX = """
+**User Preferences:** {user_preferences}
 
 **User Query:** {query}
+
+Respond with ONLY the JSON object.
 """
 
 # ============================================================================
 # DECISION LAYER PROMPT
 # ============================================================================
 
-DECISION_PROMPT = """
+_DECISION_PROMPT_HEAD = """
 You are the Decision-Making Layer of a Math AI Agent. Create action plans using available tools.
 
-**User Preferences:** {user_preferences}
-**Perception:** {perception}
-**Memory:** {memory}
-**Available Tools:** {available_tools}
-
 **Your Responsibilities:**
 1. Analyze the perception and create a step-by-step action plan
 2. Self-verify your plan for correctness and completeness
 3. Prepare fallback strategies for potential failures
 
 Output JSON with this structure:
-{{
+{
     "action_plan": [
-        {{
+        {
             "step_number": 1,
             "action_type": "tool_call|response|query_memory",
             "description": "what this step does",
             "tool_name": "tool name or null",
-            "parameters": {{"input": {{...}}}},
+            "parameters": {"input": {...}},
             "reasoning": "why this step is needed",
             "reasoning_type": "arithmetic|logical|algebraic|geometric|statistical|data_retrieval|conditional|multi_step"
-        }}
+        }
     ],
     "reasoning": "overall plan reasoning",
     "reasoning_type": "arithmetic|logical|algebraic|geometric|statistical|data_retrieval|conditional|multi_step",
     "expected_outcome": "what should happen",
     "confidence": 0.0-1.0,
     "should_continue": false,
-    "self_check": {{
+    "self_check": {
         "plan_verified": true|false,
         "tools_available": true|false,
         "parameters_complete": true|false,
         "reasoning": "self-verification explanation"
-    }},
-    "fallback_plan": {{
+    },
+    "fallback_plan": {
         "has_fallback": true|false,
         "fallback_steps": [
-            {{
+            {
                 "condition": "when to use this fallback",
                 "alternative_action": "what to do instead",
                 "tool_name": "alternative tool if applicable or null"
-            }}
+            }
         ],
         "error_handling": "what to do if tools fail"
-    }}
-}}
+    }
+}
 
-**Tool Categories:** Arithmetic, Logical Reasoning, Algebra, Geometry, Statistics, PowerPoint, Email, Database
+"""
 
+_DECISION_RULES = """
 **Critical Rules:**
-1. ALL tool parameters MUST be wrapped in "input" object: {{"input": {{"param": value}}}}
+1. ALL tool parameters MUST be wrapped in "input" object: {"input": {"param": value}}
 2. Use "RESULT_FROM_STEP_N" for result chaining in multi-step workflows
 3. Set should_continue=false when ready to give final answer
+"""
+
+# PowerPoint edits are batched in the MCP server and written out by show_powerpoint
+_POWERPOINT_RULE = """4. A plan using PowerPoint tools MUST end with a show_powerpoint step - edits are not saved or shown until it runs
+"""
 
+_DECISION_PROMPT_TAIL = """
 **Reasoning Type Classification:**
 - Tag EACH action step with its reasoning type:
   * "arithmetic" - Basic calculations (add, subtract, multiply, divide)
@@ -131,7 +160,64 @@ Output JSON with this structure:
 - For tool calls: Provide alternative approaches if the primary tool fails
 - For uncertain operations: Specify what to return to the user
 - For missing parameters: Define how to request clarification
+"""
+
+# Math categories are always offered; the others can be switched off per user
+# with the "enabled_categories" preference to keep the prompt short
+MATH_TOOL_CATEGORIES = ("Arithmetic", "Logical Reasoning", "Algebra", "Geometry", "Statistics")
+OPTIONAL_TOOL_CATEGORIES = {
+    "PowerPoint": frozenset({"open_powerpoint", "close_powerpoint", "show_powerpoint", "draw_rectangle", "add_text_in_powerpoint"}),
+    "Email": frozenset({"send_gmail"}),
+    "Database": frozenset({"t_calculate_salary_for_id", "t_calculate_salary_for_name"}),
+}
+
+
+@functools.lru_cache(maxsize=32)
+def build_decision_prompt(enabled_categories: frozenset = frozenset(OPTIONAL_TOOL_CATEGORIES)) -> str:
+    """
+    Build the static decision prompt listing only the enabled tool categories.
+    
+    Args:
+        enabled_categories: Optional categories (keys of OPTIONAL_TOOL_CATEGORIES) to offer
+        
+    Returns:
+        Static decision prompt text
+    """
+    categories = list(MATH_TOOL_CATEGORIES)
+    categories.extend(c for c in OPTIONAL_TOOL_CATEGORIES if c in enabled_categories)
+    rules = _DECISION_RULES + (_POWERPOINT_RULE if "PowerPoint" in enabled_categories else "")
+    return _DECISION_PROMPT_HEAD + f"**Tool Categories:** {', '.join(categories)}\n" + rules + _DECISION_PROMPT_TAIL
+
+
+DECISION_PROMPT_STATIC = build_decision_prompt()
+
+# Appended to DECISION_PROMPT_STATIC once per tool set - tools are fixed for
+# an agent's lifetime, so they belong to the cached prefix
+DECISION_TOOLS_SECTION = """
+**Available Tools:**
+{available_tools}
+"""
+
+DECISION_PROMPT_SUFFIX = """
+**User Preferences:** {user_preferences}
+**Perception:** {perception}
+**Memory:** {memory}
 
 Respond with ONLY the JSON object.
 """
 
+
+# ============================================================================
+# DEPRECATED FULL TEMPLATES
+# ============================================================================
+
+def _as_template(text: str) -> str:
+    """Escape braces so plain static text can be joined onto a format template."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+# Deprecated: the layers use the static/suffix parts above. Kept for callers of
+# the old single templates - same full text and the same format fields
+# ({user_preferences}, {query}; {perception}, {memory}, {available_tools})
+PERCEPTION_PROMPT = _as_template(PERCEPTION_PROMPT_STATIC) + PERCEPTION_PROMPT_SUFFIX
+DECISION_PROMPT = _as_template(DECISION_PROMPT_STATIC) + DECISION_TOOLS_SECTION + DECISION_PROMPT_SUFFIX
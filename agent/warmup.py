@@ -0,0 +1,51 @@
+"""
+Import Warmup - Faster Cold Start
+
+This module imports the agent's independent dependencies concurrently.
+Loading .pyc files and native extensions releases the GIL for much of
+the work, so warming them in parallel threads overlaps that time instead
+of paying for each module in turn.
+"""
+import importlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Modules that do not import each other at load time
+WARMUP_MODULES = (
+    "google.generativeai",
+    "mcp",
+    "mcp.client.stdio",
+    "dotenv",
+    "pydantic",
+    "agent.models",
+    "agent.prompts",
+)
+
+
+def _import_quietly(name: str):
+    """Import a module, leaving any failure to the regular import."""
+    try:
+        importlib.import_module(name)
+    except Exception:
+        pass
+
+
+def warm_imports(modules=WARMUP_MODULES, max_workers: int = 4):
+    """
+    Import modules in parallel threads so later imports hit sys.modules.
+    
+    Args:
+        modules: Names of modules to import
+        max_workers: Number of import threads
+    """
+    # With a single core the threads only contend for the GIL
+    if (os.cpu_count() or 1) < 2:
+        return
+    
+    pending = [name for name in modules if name not in sys.modules]
+    if len(pending) < 2:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending)), thread_name_prefix="warmup") as pool:
+        list(pool.map(_import_quietly, pending))
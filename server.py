@@ -1,8 +1,12 @@
-import traceback
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import asyncio
+import atexit
+import json
 import logging
-from agent.ai_agent import main as ai_main
+import os
+import threading
+from agent.ai_agent import main as ai_main, shutdown as ai_shutdown
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -11,6 +15,32 @@ CORS(app)  # Enable CORS for all routes
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One long-lived event loop runs every agent query, so the MCP session and
+# the agent persist across requests instead of being rebuilt for each one
+_agent_loop = None
+_agent_loop_lock = threading.Lock()
+
+
+def _get_agent_loop():
+    """Return the agent event loop, starting its thread on first use."""
+    global _agent_loop
+    with _agent_loop_lock:
+        if _agent_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+            atexit.register(_stop_agent_loop, loop)
+            _agent_loop = loop
+        return _agent_loop
+
+
+def _stop_agent_loop(loop):
+    """Close the MCP session on the agent loop, then stop the loop."""
+    try:
+        asyncio.run_coroutine_threadsafe(ai_shutdown(), loop).result(timeout=10)
+    except Exception as e:
+        logger.warning("Agent shutdown failed: %s", e)
+    loop.call_soon_threadsafe(loop.stop)
+
 def _parse_json_result(result_data, query):
     """Parse JSON result from AI agent."""
     if 'result' in result_data and result_data.get('success', True):
@@ -30,9 +60,10 @@ def _parse_json_result(result_data, query):
 def _parse_fallback_result(result, query):
     """Fallback parser for string results."""
     if isinstance(result, str) and 'FINAL_ANSWER:' in result:
-        final_answer = result.split('FINAL_ANSWER:')[-1].strip('[] \'"')
+        # rpartition keeps the text after the last marker without building a list
+        final_answer = result.rpartition('FINAL_ANSWER:')[2].strip('[] \'"')
         if 'Query:' in final_answer:
-            final_answer = final_answer.split('Result:')[-1].strip()
+            final_answer = final_answer.rpartition('Result:')[2].strip()
         return jsonify({
             'status': 'success',
             'result': final_answer,
@@ -43,8 +74,6 @@ def _parse_fallback_result(result, query):
 
 def _process_agent_result(result, query):
     """Process and format agent result."""
-    import json
-    
     if result is None:
         logger.error("Agent returned None - possible timeout or error")
         return jsonify({
@@ -55,18 +84,18 @@ def _process_agent_result(result, query):
     try:
         if isinstance(result, str):
             result_data = json.loads(result)
-            logger.debug(f"Parsed result data: {result_data}")
+            logger.debug("Parsed result data: %s", result_data)
             response = _parse_json_result(result_data, query)
             if response:
                 return response
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse AI agent response as JSON: {e}")
-        logger.error(f"Raw result: {result}")
+        logger.error("Failed to parse AI agent response as JSON: %s", e)
+        logger.error("Raw result: %s", result)
         fallback = _parse_fallback_result(result, query)
         if fallback:
             return fallback
     
-    logger.error(f"Unexpected result format: {result}")
+    logger.error("Unexpected result format: %s", result)
     return jsonify({
         'status': 'error',
         'message': 'Unexpected response format from agent',
@@ -75,7 +104,7 @@ def _process_agent_result(result, query):
 
 
 @app.route('/api/query', methods=['POST'])
-async def handle_query():
+def handle_query():
     try:
         data = request.get_json()
         query = data.get('query')
@@ -84,15 +113,16 @@ async def handle_query():
         if not query:
             return jsonify({'error': 'No query provided'}), 400
         
-        logger.info(f"Received query: {query}")
-        logger.info(f"User preferences: {preferences}")
+        logger.info("Received query: %s", query)
+        logger.info("User preferences: %s", preferences)
         
-        result = await ai_main(query, preferences=preferences)
+        result = asyncio.run_coroutine_threadsafe(
+            ai_main(query, preferences=preferences, keep_session=True), _get_agent_loop()
+        ).result()
         return _process_agent_result(result, query)
         
     except Exception as e:
-        logger.error(f"Error processing query: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error processing query: %s", e)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -104,4 +134,4 @@ def health_check():
 
 if __name__ == '__main__':
     # Make sure the server is accessible from other devices on the network
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_DEBUG') == '1')
@@ -12,6 +12,13 @@ from pptx.util import Inches
 from pptx.dml.color import RGBColor
 from pptx.util import Pt
 import asyncio
+
+try:
+    import pythoncom
+    import win32com.client
+except ImportError:  # PowerPoint automation is only available on Windows
+    pythoncom = None
+    win32com = None
 from server_mcp.tools_arithmetic import (
     number_list_to_sum,
     add_numbers,
@@ -21,6 +28,7 @@ from server_mcp.tools_arithmetic import (
     strings_to_chars_to_int as local_strings_to_chars_to_int,
     int_list_to_exponential_values,
     fibonacci_numbers as local_fibonacci_numbers,
+    fibonacci_nth,
     calculate_factorial,
     calculate_permutation,
     calculate_combination,
@@ -70,6 +78,7 @@ from server_mcp.tools_algebra import (
     evaluate_polynomial,
     solve_system_2x2,
     calculate_power,
+    calculate_power_batch,
     calculate_nth_root,
     expand_binomial,
     calculate_arithmetic_sequence_sum,
@@ -138,7 +147,7 @@ from server_mcp.models import (
     PercentageInput, PercentageOutput,
     StringToCharsInput, StringToCharsOutput,
     ExponentialInput, ExponentialOutput,
-    FibonacciInput, FibonacciOutput,
+    FibonacciInput, FibonacciOutput, FibonacciNthInput,
     FactorialInput, FactorialOutput,
     PermutationInput, PermutationOutput,
     CombinationInput, CombinationOutput,
@@ -152,7 +161,7 @@ from server_mcp.models import (
     LinearEquationInput, LinearEquationOutput,
     QuadraticEquationInput, QuadraticEquationOutput,
     PolynomialInput, System2x2Input, System2x2Output,
-    PowerInput, RootInput, BinomialExpansionInput,
+    PowerInput, PowerBatchInput, RootInput, BinomialExpansionInput,
     FloatListOutput, ArithmeticSequenceInput, GeometricSequenceInput,
     RatioInput, RatioOutput,
     # Geometry models
@@ -166,7 +175,12 @@ from server_mcp.models import (
     ZScoreInput, CorrelationInput, RegressionOutput,
     ProbabilityUnionInput, ProbabilityInput,
 )
+import atexit
 import logging
+import logging.handlers
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 import traceback
 import smtplib
@@ -176,6 +190,18 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Gmail settings are fixed for the server's lifetime - read and validate them once.
+# A bad configuration only fails send_gmail, so the math tools still start.
+GMAIL_ADDRESS = os.getenv("GMAIL_ADDRESS")
+GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
+RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL")
+if not all([GMAIL_ADDRESS, GMAIL_APP_PASSWORD, RECIPIENT_EMAIL]):
+    GMAIL_CONFIG_ERROR = "Missing GMAIL_ADDRESS, GMAIL_APP_PASSWORD, or RECIPIENT_EMAIL in .env file"
+elif not (GMAIL_ADDRESS.endswith('@gmail.com') and '@' in RECIPIENT_EMAIL):
+    GMAIL_CONFIG_ERROR = f"Invalid email format: GMAIL_ADDRESS={GMAIL_ADDRESS}, RECIPIENT_EMAIL={RECIPIENT_EMAIL}"
+else:
+    GMAIL_CONFIG_ERROR = None
+
 # Configure logging
 log_dir = "logs"
 os.makedirs(log_dir, exist_ok=True)
@@ -184,13 +210,46 @@ log_file = os.path.join(log_dir, f"mcp_server_{datetime.now().strftime('%Y%m%d_%
 # Define constant for PowerPoint filename
 PPTX_FILENAME = 'presentation.pptx'
 
+# How long to wait for PowerPoint to exit after taskkill or start after launch, and how often to check
+POWERPOINT_WAIT_TIMEOUT = 10
+POWERPOINT_POLL_INTERVAL = 0.25
+
+# PowerPoint measures shapes in points
+POINTS_PER_INCH = 72
+
+# Text box position inside the rectangle from draw_rectangle, in inches
+TEXTBOX_LEFT = 2.2    # Slightly more than rectangle left for margin
+TEXTBOX_TOP = 2.5     # Centered vertically in rectangle
+TEXTBOX_WIDTH = 4.6   # Slightly less than rectangle width for margin
+TEXTBOX_HEIGHT = 2    # Enough height for text
+
+# Fixed python-pptx lengths and colors, built once instead of on every edit
+TEXTBOX_BOUNDS = (Inches(TEXTBOX_LEFT), Inches(TEXTBOX_TOP), Inches(TEXTBOX_WIDTH), Inches(TEXTBOX_HEIGHT))
+HEADER_FONT_SIZE = Pt(32)
+VALUE_FONT_SIZE = Pt(28)
+BLACK = RGBColor(0, 0, 0)
+WHITE = RGBColor(255, 255, 255)
+
+# Tool calls only enqueue log records; a background thread does the blocking file and console writes
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler(log_file)
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# The listener's handlers apply the real format; only merge args here
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+    # Same LOG_LEVEL setting as the agent (default INFO)
+    level=logging.getLevelNamesMapping().get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    handlers=[queue_handler]
 )
 logger = logging.getLogger(__name__)
 
@@ -198,6 +257,153 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("Calculator")
 
 # DEFINE TOOLS
+async def _powerpoint_running() -> bool:
+    """Check whether a PowerPoint process is still running"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            'tasklist', '/FI', 'IMAGENAME eq POWERPNT.EXE', '/NH',
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
+    except Exception:
+        return False
+    return b"POWERPNT.EXE" in stdout.upper()
+
+
+async def _wait_for_powerpoint(running: bool):
+    """Wait until PowerPoint has started (or exited), polling instead of sleeping a fixed time"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + POWERPOINT_WAIT_TIMEOUT
+    while await _powerpoint_running() != running:
+        if loop.time() >= deadline:
+            logger.warning("PowerPoint %s after %ss", "not started" if running else "still running", POWERPOINT_WAIT_TIMEOUT)
+            return
+        await asyncio.sleep(POWERPOINT_POLL_INTERVAL)
+
+
+# Running PowerPoint application, attached on first use (only touched on _com_executor)
+_ppt_app = None
+
+# COM objects are bound to the thread that created them and every call blocks, so all
+# PowerPoint automation runs on this one COM-initialized worker thread
+_com_executor = (
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix="powerpoint-com", initializer=pythoncom.CoInitialize)
+    if win32com is not None else None
+)
+
+
+def _live_presentation():
+    """Return the presentation open in a running PowerPoint via COM, or None to edit the file instead"""
+    global _ppt_app
+    full_name = os.path.abspath(PPTX_FILENAME)
+    for attempt in range(2):
+        try:
+            if _ppt_app is None:
+                _ppt_app = win32com.client.Dispatch("PowerPoint.Application")
+            for prs in _ppt_app.Presentations:
+                if os.path.normcase(prs.FullName) == os.path.normcase(full_name):
+                    return prs
+            return _ppt_app.Presentations.Open(full_name)
+        except Exception as e:
+            # The cached application is gone once PowerPoint has been closed; attach again
+            _ppt_app = None
+            if attempt:
+                logger.warning("PowerPoint automation unavailable, editing the file instead: %s", e)
+    return None
+
+
+def _edit_live_presentation(edit):
+    """Apply edit to the presentation open in PowerPoint and save it; False if PowerPoint is unavailable"""
+    live_prs = _live_presentation()
+    if live_prs is None:
+        return False
+    edit(live_prs)
+    live_prs.Save()
+    return True
+
+
+# Parsed presentation file, with the file's mtime when it was last loaded or saved
+_prs = None
+_prs_mtime = None
+# Whether _prs has edits not yet written to PPTX_FILENAME
+_prs_dirty = False
+
+
+def _cache_presentation(prs):
+    """Remember the presentation just loaded from or saved to PPTX_FILENAME"""
+    global _prs, _prs_mtime, _prs_dirty
+    _prs = prs
+    _prs_mtime = os.path.getmtime(PPTX_FILENAME)
+    _prs_dirty = False
+
+
+async def _load_presentation():
+    """Return the cached presentation, parsing the file again only if it changed on disk"""
+    # Unsaved edits win over whatever is on disk
+    if _prs is None or (not _prs_dirty and os.path.getmtime(PPTX_FILENAME) != _prs_mtime):
+        _cache_presentation(await asyncio.to_thread(Presentation, PPTX_FILENAME))
+    return _prs
+
+
+async def _save_presentation():
+    """Write pending edits to PPTX_FILENAME; PowerPoint is only closed if it locks the file"""
+    if not _prs_dirty:
+        return
+    # Saving blocks on disk I/O - keep it off the event loop
+    try:
+        await asyncio.to_thread(_prs.save, PPTX_FILENAME)
+    except PermissionError:
+        # PowerPoint has the file open; close it and save again (show_powerpoint reopens it)
+        await close_powerpoint()
+        await asyncio.to_thread(_prs.save, PPTX_FILENAME)
+    _cache_presentation(_prs)
+
+
+def _save_presentation_at_exit():
+    """Keep edits made without a final show_powerpoint call"""
+    if _prs_dirty:
+        try:
+            _prs.save(PPTX_FILENAME)
+        except Exception as e:
+            logger.error("Could not save %s at exit: %s", PPTX_FILENAME, e)
+
+
+atexit.register(_save_presentation_at_exit)
+
+
+@asynccontextmanager
+async def _pptx_session():
+    """Yield the presentation for editing; the edits are kept in memory until show_powerpoint saves them"""
+    global _prs, _prs_dirty
+    prs = await _load_presentation()
+    try:
+        yield prs
+    except BaseException:
+        # A failed edit may leave the cached copy half-modified; drop it (with any
+        # unsaved edits) and read the file next time
+        _prs = None
+        _prs_dirty = False
+        raise
+    _prs_dirty = True
+
+
+async def _com_edit(edit):
+    """Edit the presentation open in PowerPoint in place; False means use _pptx_session instead"""
+    global _prs
+    if _com_executor is None:
+        return False
+    # Write out edits batched by an earlier python-pptx fallback first, so PowerPoint opens
+    # them instead of the stale file, and show_powerpoint has nothing left to save over it
+    await _save_presentation()
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_com_executor, _edit_live_presentation, edit):
+        return False
+    # The file now holds the COM edit; read it again before any python-pptx edit
+    _prs = None
+    return True
+
+
 @mcp.tool()
 async def close_powerpoint() -> dict:
     """Close PowerPoint"""
@@ -205,16 +411,16 @@ async def close_powerpoint() -> dict:
         logger.info("Calling close_powerpoint()")
         # Suppress all output from taskkill
         try:
-            # Use subprocess with output suppressed
-            proc = await asyncio.create_subprocess_shell(
-                'taskkill /F /IM POWERPNT.EXE',
+            # Run taskkill directly (no cmd.exe in between) with output suppressed
+            proc = await asyncio.create_subprocess_exec(
+                'taskkill', '/F', '/IM', 'POWERPNT.EXE',
                 stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.DEVNULL
             )
             await proc.communicate()
         except Exception as e:
-            logger.warning(f"taskkill failed or PowerPoint not running: {e}")
-        await asyncio.sleep(2)
+            logger.warning("taskkill failed or PowerPoint not running: %s", e)
+        await _wait_for_powerpoint(running=False)
         logger.info("PowerPoint closed successfully")
         return {
             "content": [
@@ -225,7 +431,7 @@ async def close_powerpoint() -> dict:
             ]
         }
     except Exception as e:
-        logger.error(f"Error in close_powerpoint: {str(e)}")
+        logger.error("Error in close_powerpoint: %s", str(e))
         logger.error(traceback.format_exc())
         return {
             "content": [
@@ -241,21 +447,21 @@ async def open_powerpoint() -> dict:
     """Open a new PowerPoint presentation"""
     try:
         logger.info("Calling open_powerpoint()")
-        await close_powerpoint()
-        await asyncio.sleep(3)
-        prs = Presentation()
+        # Build the blank presentation while PowerPoint shuts down; close_powerpoint
+        # already waits for the process to exit, so no extra settle time is needed
+        _, prs = await asyncio.gather(close_powerpoint(), asyncio.to_thread(Presentation))
         prs.slide_layouts[0]
         filename = PPTX_FILENAME
-        prs.save(filename)
-        await asyncio.sleep(5)
+        await asyncio.to_thread(prs.save, filename)
+        _cache_presentation(prs)
         # Open the presentation, suppressing output
         try:
             # On Windows, os.startfile does not print to stdout, but just in case:
             # Use subprocess with output suppressed for other OSes if needed
-            os.startfile(filename)
+            await asyncio.to_thread(os.startfile, filename)
         except Exception as e:
-            logger.warning(f"os.startfile failed: {e}")
-        await asyncio.sleep(10)
+            logger.warning("os.startfile failed: %s", e)
+        await _wait_for_powerpoint(running=True)
         logger.info("PowerPoint opened successfully with a new presentation")
         return {
             "content": [
@@ -266,7 +472,7 @@ async def open_powerpoint() -> dict:
             ]
         }
     except Exception as e:
-        logger.error(f"Error in open_powerpoint: {str(e)}")
+        logger.error("Error in open_powerpoint: %s", str(e))
         logger.error(traceback.format_exc())
         return {
             "content": [
@@ -277,70 +483,89 @@ async def open_powerpoint() -> dict:
             ]
         }
 
+@mcp.tool()
+async def show_powerpoint() -> dict:
+    """Save all edits and show the presentation in PowerPoint (call once after all edits are done)"""
+    try:
+        logger.info("Calling show_powerpoint()")
+        # Edits are batched in memory - write them all out once before showing the file
+        await _save_presentation()
+        await asyncio.to_thread(os.startfile, PPTX_FILENAME)
+        await _wait_for_powerpoint(running=True)
+        logger.info("Presentation shown in PowerPoint")
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text="Presentation shown in PowerPoint"
+                )
+            ]
+        }
+    except Exception as e:
+        logger.error("Error in show_powerpoint: %s", str(e))
+        logger.error(traceback.format_exc())
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=f"Error showing PowerPoint: {str(e)}"
+                )
+            ]
+        }
+
 @mcp.tool()
 async def draw_rectangle(input: DrawRectangleInput) -> dict:
     """Draw a rectangle in the first slide of PowerPoint"""
     try:
-        logger.info(f"Drawing rectangle with validated parameters: ({input.x1},{input.y1}) to ({input.x2},{input.y2})")
-        
-        # Wait before modifying the presentation
-        await asyncio.sleep(2)
-        
-        # Ensure PowerPoint is closed before modifying the file
-        await close_powerpoint()
-        await asyncio.sleep(2)
-        prs = Presentation(PPTX_FILENAME)
-        slide = prs.slides[0]
-        
-        # Store existing text boxes
-        slide = prs.slides[0]
-        
-        # Store existing text boxes
-        text_boxes = []
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                text = shape.text_frame.text
-                left = shape.left
-                top = shape.top
-                width = shape.width
-                height = shape.height
-                text_boxes.append((text, left, top, width, height))
-        
-        # Clear existing shapes except text boxes
-        for shape in slide.shapes:
-            if not shape.has_text_frame:
-                sp = shape._element
-                sp.getparent().remove(sp)
+        logger.info("Drawing rectangle with validated parameters: (%s,%s) to (%s,%s)", input.x1, input.y1, input.x2, input.y2)
         
-        # Convert coordinates to inches
-        left = Inches(input.x1)
-        top = Inches(input.y1)
-        width = Inches(input.x2 - input.x1)
-        height = Inches(input.y2 - input.y1)
-        
-        logger.debug(f"Rectangle dimensions - left={left}, top={top}, width={width}, height={height}")
-        
-        # Add rectangle
-        shape = slide.shapes.add_shape(
-            1,  # MSO_SHAPE.RECTANGLE
-            left, top, width, height
-        )
-        
-        # Make the rectangle more visible
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)  # White fill
-        shape.line.color.rgb = RGBColor(0, 0, 0)  # Black border
-        prs.save(PPTX_FILENAME)
-        await asyncio.sleep(2)
+        def edit(live_prs):
+            shapes = live_prs.Slides(1).Shapes
+            for index in range(shapes.Count, 0, -1):
+                if not shapes(index).HasTextFrame:
+                    shapes(index).Delete()
+            shape = shapes.AddShape(
+                1,  # msoShapeRectangle
+                input.x1 * POINTS_PER_INCH,
+                input.y1 * POINTS_PER_INCH,
+                (input.x2 - input.x1) * POINTS_PER_INCH,
+                (input.y2 - input.y1) * POINTS_PER_INCH
+            )
+            shape.Fill.Solid()
+            shape.Fill.ForeColor.RGB = 0xFFFFFF  # White fill
+            shape.Line.ForeColor.RGB = 0x000000  # Black border
         
-        # Reopen PowerPoint
-        os.startfile(PPTX_FILENAME)
-        await asyncio.sleep(5)
-        # Reopen PowerPoint
-        os.startfile(PPTX_FILENAME)
-        await asyncio.sleep(5)
+        # Edit the open presentation in place - no close, save-to-disk and relaunch
+        if not await _com_edit(edit):
+            async with _pptx_session() as prs:
+                slide = prs.slides[0]
+                
+                # Clear existing shapes except text boxes (iterate a copy while removing)
+                for shape in list(slide.shapes):
+                    if not shape.has_text_frame:
+                        sp = shape._element
+                        sp.getparent().remove(sp)
+                
+                # Convert coordinates to inches
+                left = Inches(input.x1)
+                top = Inches(input.y1)
+                width = Inches(input.x2 - input.x1)
+                height = Inches(input.y2 - input.y1)
+                
+                logger.debug("Rectangle dimensions - left=%s, top=%s, width=%s, height=%s", left, top, width, height)
+                
+                # Add rectangle
+                shape = slide.shapes.add_shape(
+                    1,  # MSO_SHAPE.RECTANGLE
+                    left, top, width, height
+                )
+                
+                # Make the rectangle more visible
+                shape.fill.solid()
+                shape.fill.fore_color.rgb = WHITE  # White fill
+                shape.line.color.rgb = BLACK  # Black border
         
-        logger.info(f"Rectangle drawn successfully from ({input.x1},{input.y1}) to ({input.x2},{input.y2})")
+        logger.info("Rectangle drawn successfully from (%s,%s) to (%s,%s)", input.x1, input.y1, input.x2, input.y2)
         return {
             "content": [
                 TextContent(
@@ -360,67 +585,69 @@ async def draw_rectangle(input: DrawRectangleInput) -> dict:
 async def add_text_in_powerpoint(input: AddTextInput) -> dict:
     """Add text to the first slide of PowerPoint"""
     try:
-        logger.info(f"Received text to add: {input.text}")
-        logger.debug(f"Text length: {len(input.text)}")
-        logger.debug(f"Text contains newlines: {'\\n' in input.text}")
-        
-        # Wait before adding text
-        await asyncio.sleep(5)
-        
-        # Ensure PowerPoint is closed before modifying the file
-        await close_powerpoint()
-        prs = Presentation(PPTX_FILENAME)
-        slide = prs.slides[0]
-        
-        # Add a text box positioned inside the rectangle
-        slide = prs.slides[0]
-        
-        # Add a text box positioned inside the rectangle
-        # Match the rectangle position from draw_rectangle
-        left = Inches(2.2)  # Slightly more than rectangle left for margin
-        top = Inches(2.5)   # Centered vertically in rectangle
-        width = Inches(4.6) # Slightly less than rectangle width for margin
-        height = Inches(2)  # Enough height for text
+        logger.info("Received text to add: %s", input.text)
+        logger.debug("Text length: %s", len(input.text))
+        logger.debug("Text contains newlines: %s", '\n' in input.text)
         
-        textbox = slide.shapes.add_textbox(left, top, width, height)
-        text_frame = textbox.text_frame
-        text_frame.clear()  # Clear existing text
-        text_frame.word_wrap = True  # Enable word wrap
-        text_frame.vertical_anchor = 1  # Middle vertical alignment
-        
-        # Split text into lines
-        lines = input.text.split('\n')
-        logger.debug(f"Number of lines: {len(lines)}")
-        logger.debug(f"Lines to add: {lines}")
+        def edit(live_prs):
+            textbox = live_prs.Slides(1).Shapes.AddTextbox(
+                1,  # msoTextOrientationHorizontal
+                TEXTBOX_LEFT * POINTS_PER_INCH,
+                TEXTBOX_TOP * POINTS_PER_INCH,
+                TEXTBOX_WIDTH * POINTS_PER_INCH,
+                TEXTBOX_HEIGHT * POINTS_PER_INCH
+            )
+            text_frame = textbox.TextFrame
+            text_frame.WordWrap = -1  # msoTrue
+            text_frame.VerticalAnchor = 1  # Same anchor as the python-pptx path
+            
+            lines = [line.strip() for line in input.text.split('\n') if line.strip()]
+            text_range = text_frame.TextRange
+            text_range.Text = "\r".join(lines)
+            for index, line in enumerate(lines, start=1):
+                paragraph = text_range.Paragraphs(index)
+                paragraph.ParagraphFormat.Alignment = 1  # Same alignment as the python-pptx path
+                paragraph.Font.Size = 32 if "Final Result:" in line else 28
+                paragraph.Font.Bold = -1  # msoTrue
+                paragraph.Font.Color.RGB = 0x000000  # Black text
         
-        # Add each line as a separate paragraph
-        for i, line in enumerate(lines):
-            if line.strip():  # Only add non-empty lines
-                p = text_frame.add_paragraph()
-                p.text = line.strip()
-                p.alignment = 1  # Center align the text
+        # Edit the open presentation in place - no close, save-to-disk and relaunch
+        if not await _com_edit(edit):
+            async with _pptx_session() as prs:
+                slide = prs.slides[0]
                 
-                # Format the text
-                run = p.runs[0]
-                if "Final Result:" in line:
-                    run.font.size = Pt(32)  # Header size
-                    run.font.bold = True
-                else:
-                    run.font.size = Pt(28)  # Value size
-                    run.font.bold = True
+                # Add a text box positioned inside the rectangle
+                # Match the rectangle position from draw_rectangle
+                textbox = slide.shapes.add_textbox(*TEXTBOX_BOUNDS)
+                text_frame = textbox.text_frame
+                text_frame.clear()  # Clear existing text
+                text_frame.word_wrap = True  # Enable word wrap
+                text_frame.vertical_anchor = 1  # Middle vertical alignment
                 
-                run.font.color.rgb = RGBColor(0, 0, 0)  # Black text
-        prs.save(PPTX_FILENAME)
-        await asyncio.sleep(5)
-        
-        # Reopen PowerPoint
-        os.startfile(PPTX_FILENAME)
-        await asyncio.sleep(10)
-        # Reopen PowerPoint
-        os.startfile(PPTX_FILENAME)
-        await asyncio.sleep(10)
+                # Split text into lines
+                lines = input.text.split('\n')
+                logger.debug("Number of lines: %s", len(lines))
+                logger.debug("Lines to add: %s", lines)
+                
+                # Add each line as a separate paragraph
+                for i, line in enumerate(lines):
+                    if line.strip():  # Only add non-empty lines
+                        p = text_frame.add_paragraph()
+                        p.text = line.strip()
+                        p.alignment = 1  # Center align the text
+                        
+                        # Format the text
+                        run = p.runs[0]
+                        if "Final Result:" in line:
+                            run.font.size = HEADER_FONT_SIZE
+                            run.font.bold = True
+                        else:
+                            run.font.size = VALUE_FONT_SIZE
+                            run.font.bold = True
+                        
+                        run.font.color.rgb = BLACK  # Black text
         
-        logger.info(f"Text added successfully: {input.text}")
+        logger.info("Text added successfully: %s", input.text)
         return {
             "content": [
                 TextContent(
@@ -430,7 +657,7 @@ async def add_text_in_powerpoint(input: AddTextInput) -> dict:
             ]
         }
     except Exception as e:
-        logger.error(f"Error in add_text_in_powerpoint: {str(e)}")
+        logger.error("Error in add_text_in_powerpoint: %s", str(e))
         logger.error(traceback.format_exc())
         return {
             "content": [
@@ -441,32 +668,74 @@ async def add_text_in_powerpoint(input: AddTextInput) -> dict:
             ]
         }
 
+class _GmailPool:
+    """One logged-in Gmail SMTP connection, reused across send_gmail calls"""
+    
+    def __init__(self):
+        self.conn = None
+        self.credentials = None  # (address, password) the connection is logged in with
+        self.lock = asyncio.Lock()
+    
+    def _connect(self, address: str, password: str):
+        self.close()
+        logger.debug("Connecting to Gmail SMTP server (smtp.gmail.com:465)")
+        conn = smtplib.SMTP_SSL('smtp.gmail.com', 465)
+        try:
+            conn.login(address, password)
+        except BaseException:
+            conn.close()
+            raise
+        logger.debug("Logged in as %s", address)
+        self.conn = conn
+        self.credentials = (address, password)
+    
+    def _is_alive(self) -> bool:
+        try:
+            return self.conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def _send(self, address: str, password: str, recipient: str, message: str):
+        if self.conn is None or self.credentials != (address, password) or not self._is_alive():
+            self._connect(address, password)
+        try:
+            self.conn.sendmail(address, recipient, message)
+        except smtplib.SMTPServerDisconnected:
+            # Gmail drops idle connections; log in again and retry once
+            self._connect(address, password)
+            self.conn.sendmail(address, recipient, message)
+    
+    async def send(self, address: str, password: str, recipient: str, message: str):
+        """Send a message, reconnecting only when the pooled connection is gone"""
+        async with self.lock:
+            # smtplib blocks on the network - keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._send, address, password, recipient, message
+            )
+    
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.conn = None
+            self.credentials = None
+
+
+_gmail_pool = _GmailPool()
+atexit.register(_gmail_pool.close)
+
+
 @mcp.tool()
 async def send_gmail(input: SendGmailInput) -> dict:
     """Send an email with the specified content via Gmail"""
     try:
-        logger.info(f"Calling send_gmail(content: {input.content[:50]}...)")
-        
-        # Retrieve Gmail credentials and recipient from .env
-        gmail_address = os.getenv("GMAIL_ADDRESS")
-        gmail_app_password = os.getenv("GMAIL_APP_PASSWORD")
-        recipient_email = os.getenv("RECIPIENT_EMAIL")
-        
-        if not all([gmail_address, gmail_app_password, recipient_email]):
-            error_msg = "Missing GMAIL_ADDRESS, GMAIL_APP_PASSWORD, or RECIPIENT_EMAIL in .env file"
-            logger.error(error_msg)
-            return {
-                "content": [
-                    TextContent(
-                        type="text",
-                        text=error_msg
-                    )
-                ]
-            }
+        logger.info("Calling send_gmail(content: %s...)", input.content[:50])
         
-        # Validate Gmail address and recipient email format
-        if not (gmail_address.endswith('@gmail.com') and '@' in recipient_email):
-            error_msg = f"Invalid email format: GMAIL_ADDRESS={gmail_address}, RECIPIENT_EMAIL={recipient_email}"
+        # Gmail credentials and recipient were read and validated at startup
+        if GMAIL_CONFIG_ERROR:
+            error_msg = GMAIL_CONFIG_ERROR
             logger.error(error_msg)
             return {
                 "content": [
@@ -480,17 +749,13 @@ async def send_gmail(input: SendGmailInput) -> dict:
         # Create the email message
         msg = MIMEText(input.content)
         msg['Subject'] = 'Math Agent Result'
-        msg['From'] = gmail_address
-        msg['To'] = recipient_email
+        msg['From'] = GMAIL_ADDRESS
+        msg['To'] = RECIPIENT_EMAIL
         
-        # Connect to Gmail's SMTP server
+        # Send over the shared Gmail SMTP connection
         try:
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                logger.debug("Connecting to Gmail SMTP server (smtp.gmail.com:465)")
-                server.login(gmail_address, gmail_app_password)
-                logger.debug(f"Logged in as {gmail_address}")
-                server.sendmail(gmail_address, recipient_email, msg.as_string())
-                logger.info(f"Email sent successfully to {recipient_email}")
+            await _gmail_pool.send(GMAIL_ADDRESS, GMAIL_APP_PASSWORD, RECIPIENT_EMAIL, msg.as_string())
+            logger.info("Email sent successfully to %s", RECIPIENT_EMAIL)
         except smtplib.SMTPAuthenticationError as e:
             error_msg = f"SMTP Authentication failed: {str(e)}. Ensure GMAIL_APP_PASSWORD is correct and 2-Step Verification is enabled."
             logger.error(error_msg)
@@ -518,7 +783,7 @@ async def send_gmail(input: SendGmailInput) -> dict:
             "content": [
                 TextContent(
                     type="text",
-                    text=f"Email sent successfully to {recipient_email}"
+                    text=f"Email sent successfully to {RECIPIENT_EMAIL}"
                 )
             ]
         }
@@ -536,241 +801,214 @@ async def send_gmail(input: SendGmailInput) -> dict:
         }
 
 # TOOLS WRAPPING FUNCTIONS FROM tools.py (with Pydantic validation)
-@mcp.tool()
-def t_number_list_to_sum(input: NumberListInput) -> NumberListOutput:
-    """Sum numbers in a list"""
-    logger.info(f"Calling t_number_list_to_sum with {len(input.numbers)} numbers")
-    result = number_list_to_sum(input.numbers)
-    return NumberListOutput(result=result)
-
-@mcp.tool()
-def t_add(input: TwoNumberInput) -> TwoNumberOutput:
-    """Add two numbers"""
-    logger.info(f"Calling t_add({input.a} + {input.b})")
-    result = add_numbers(input.a, input.b)
-    return TwoNumberOutput(result=result)
-
-@mcp.tool()
-def t_calculate_difference(input: TwoNumberInput) -> TwoNumberOutput:
-    """Difference between two numbers"""
-    logger.info(f"Calling t_calculate_difference({input.a}, {input.b})")
-    result = calculate_difference(input.a, input.b)
-    return TwoNumberOutput(result=result)
-
-@mcp.tool()
-def t_number_list_to_product(input: NumberListInput) -> NumberListOutput:
-    """Product of numbers in a list"""
-    logger.info(f"Calling t_number_list_to_product with {len(input.numbers)} numbers")
-    result = number_list_to_product(input.numbers)
-    return NumberListOutput(result=result)
-
-@mcp.tool()
-def t_calculate_division(input: TwoNumberInput) -> TwoNumberOutput:
-    """Division of two numbers"""
-    logger.info(f"Calling t_calculate_division({input.a}, {input.b})")
-    result = calculate_division(input.a, input.b)
-    return TwoNumberOutput(result=result)
-
-@mcp.tool()
-def t_strings_to_chars_to_int(input: StringToCharsInput) -> StringToCharsOutput:
-    """ASCII values of characters"""
-    logger.info(f"Calling t_strings_to_chars_to_int('{input.text}')")
-    ascii_values = local_strings_to_chars_to_int(input.text)
-    return StringToCharsOutput(ascii_values=ascii_values)
-
-@mcp.tool()
-def t_int_list_to_exponential_values(input: ExponentialInput) -> ExponentialOutput:
-    """Exponential of list elements"""
-    logger.info(f"Calling t_int_list_to_exponential_values with {len(input.numbers)} numbers")
-    values = int_list_to_exponential_values(input.numbers)
-    return ExponentialOutput(values=values)
-
-@mcp.tool()
-def t_fibonacci_numbers(input: FibonacciInput) -> FibonacciOutput:
-    """First n Fibonacci numbers"""
-    logger.info(f"Calling t_fibonacci_numbers(n={input.n})")
-    sequence = local_fibonacci_numbers(input.n)
-    return FibonacciOutput(sequence=sequence)
-
-@mcp.tool()
-def t_calculate_factorial(input: FactorialInput) -> FactorialOutput:
-    """List of factorials up to n-1"""
-    logger.info(f"Calling t_calculate_factorial(n={input.n})")
-    factorials = calculate_factorial(input.n)
-    return FactorialOutput(factorials=factorials)
-
-@mcp.tool()
-def t_calculate_permutation(input: PermutationInput) -> PermutationOutput:
-    """Permutation nPr"""
-    logger.info(f"Calling t_calculate_permutation(n={input.n}, r={input.r})")
-    result = calculate_permutation(input.n, input.r)
-    return PermutationOutput(result=result)
+def _register_wrapper_tool(name, func, input_model, output_model, fields, output_field, doc):
+    """Register tool `name` calling func with the given input fields and wrapping its result"""
+    threaded = name in _THREADED_TOOLS
+    
+    # Async, so the server can keep answering other tool calls while one is computed
+    async def tool(input):
+        logger.info("Calling %s(%s)", name, input)
+        args = [getattr(input, field) for field in fields]
+        if threaded:
+            result = await asyncio.to_thread(func, *args)
+        else:
+            result = func(*args)
+        return output_model(**{output_field: result})
+    
+    # FastMCP builds the tool schema from these, exactly as for a hand-written wrapper
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = doc
+    tool.__annotations__ = {"input": input_model, "return": output_model}
+    globals()[name] = mcp.tool()(tool)
+
+
+# Tools whose work grows with the input (big integers, long lists); they run in a
+# worker thread so one large request does not stall concurrent tool calls
+_THREADED_TOOLS = frozenset({
+    "t_int_list_to_exponential_values",
+    "t_fibonacci_numbers",
+    "t_calculate_factorial",
+    "t_calculate_permutation",
+    "t_calculate_combination",
+})
+
+# name, function, input model, output model, input fields, output field, description
+_WRAPPER_TOOLS = (
+    ("t_number_list_to_sum", number_list_to_sum, NumberListInput, NumberListOutput, ("numbers",), "result", "Sum numbers in a list"),
+    ("t_add", add_numbers, TwoNumberInput, TwoNumberOutput, ("a", "b"), "result", "Add two numbers"),
+    ("t_calculate_difference", calculate_difference, TwoNumberInput, TwoNumberOutput, ("a", "b"), "result", "Difference between two numbers"),
+    ("t_number_list_to_product", number_list_to_product, NumberListInput, NumberListOutput, ("numbers",), "result", "Product of numbers in a list"),
+    ("t_calculate_division", calculate_division, TwoNumberInput, TwoNumberOutput, ("a", "b"), "result", "Division of two numbers"),
+    ("t_strings_to_chars_to_int", local_strings_to_chars_to_int, StringToCharsInput, StringToCharsOutput, ("text",), "ascii_values", "ASCII values of characters"),
+    ("t_int_list_to_exponential_values", int_list_to_exponential_values, ExponentialInput, ExponentialOutput, ("numbers",), "values", "Exponential of list elements"),
+    ("t_fibonacci_numbers", local_fibonacci_numbers, FibonacciInput, FibonacciOutput, ("n",), "sequence", "First n Fibonacci numbers"),
+    ("t_calculate_factorial", calculate_factorial, FactorialInput, FactorialOutput, ("n",), "factorials", "List of factorials up to n-1"),
+    ("t_calculate_permutation", calculate_permutation, PermutationInput, PermutationOutput, ("n", "r"), "result", "Permutation nPr"),
+    ("t_calculate_combination", calculate_combination, CombinationInput, CombinationOutput, ("n", "r"), "result", "Combination nCr"),
+)
 
-@mcp.tool()
-def t_calculate_combination(input: CombinationInput) -> CombinationOutput:
-    """Combination nCr"""
-    logger.info(f"Calling t_calculate_combination(n={input.n}, r={input.r})")
-    result = calculate_combination(input.n, input.r)
-    return CombinationOutput(result=result)
+for _tool_spec in _WRAPPER_TOOLS:
+    _register_wrapper_tool(*_tool_spec)
 
 @mcp.tool()
 def t_calculate_salary_for_id(input: EmployeeIdInput) -> SalaryOutput:
     """Salary by employee id"""
-    logger.info(f"Calling t_calculate_salary_for_id(emp_id={input.emp_id})")
+    logger.info("Calling t_calculate_salary_for_id(emp_id=%s)", input.emp_id)
     salary = calculate_salary_for_id(input.emp_id)
     return SalaryOutput(salary=salary, found=salary is not None)
 
 @mcp.tool()
 def t_calculate_salary_for_name(input: EmployeeNameInput) -> SalaryOutput:
     """Salary by employee name"""
-    logger.info(f"Calling t_calculate_salary_for_name(emp_name='{input.emp_name}')")
+    logger.info("Calling t_calculate_salary_for_name(emp_name='%s')", input.emp_name)
     salary = calculate_salary_for_name(input.emp_name)
     return SalaryOutput(salary=salary, found=salary is not None)
 
 @mcp.tool()
 def t_calculate_percentage(input: PercentageInput) -> PercentageOutput:
     """Calculate percentage of a number"""
-    logger.info(f"Calling t_calculate_percentage(percent={input.percent}, number={input.number})")
+    logger.info("Calling t_calculate_percentage(percent=%s, number=%s)", input.percent, input.number)
     result = calculate_percentage(input.percent, input.number)
     return PercentageOutput(result=result)
 
 @mcp.tool()
 def t_absolute_value(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate absolute value of a number"""
-    logger.info(f"Calling t_absolute_value({input.value})")
+    logger.info("Calling t_absolute_value(%s)", input.value)
     result = calculate_absolute_value(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_modulo(input: TwoNumberInput) -> TwoNumberOutput:
     """Calculate modulo (remainder)"""
-    logger.info(f"Calling t_modulo({input.a}, {input.b})")
+    logger.info("Calling t_modulo(%s, %s)", input.a, input.b)
     result = calculate_modulo(input.a, input.b)
     return TwoNumberOutput(result=result)
 
 @mcp.tool()
 def t_floor_division(input: TwoNumberInput) -> TwoNumberOutput:
     """Calculate floor division (integer division)"""
-    logger.info(f"Calling t_floor_division({input.a}, {input.b})")
+    logger.info("Calling t_floor_division(%s, %s)", input.a, input.b)
     result = calculate_floor_division(input.a, input.b)
     return TwoNumberOutput(result=float(result))
 
 @mcp.tool()
 def t_ceiling(input: SingleNumberInput) -> SingleNumberOutput:
     """Round number up to nearest integer"""
-    logger.info(f"Calling t_ceiling({input.value})")
+    logger.info("Calling t_ceiling(%s)", input.value)
     result = calculate_ceiling(input.value)
     return SingleNumberOutput(result=float(result))
 
 @mcp.tool()
 def t_floor(input: SingleNumberInput) -> SingleNumberOutput:
     """Round number down to nearest integer"""
-    logger.info(f"Calling t_floor({input.value})")
+    logger.info("Calling t_floor(%s)", input.value)
     result = calculate_floor(input.value)
     return SingleNumberOutput(result=float(result))
 
 @mcp.tool()
 def t_round(input: RoundInput) -> SingleNumberOutput:
     """Round number to specified decimal places"""
-    logger.info(f"Calling t_round({input.number}, {input.decimals} decimals)")
+    logger.info("Calling t_round(%s, %s decimals)", input.number, input.decimals)
     result = calculate_round(input.number, input.decimals)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_gcd(input: TwoIntInput) -> IntOutput:
     """Calculate Greatest Common Divisor (GCD)"""
-    logger.info(f"Calling t_gcd({input.a}, {input.b})")
+    logger.info("Calling t_gcd(%s, %s)", input.a, input.b)
     result = calculate_gcd(input.a, input.b)
     return IntOutput(result=result)
 
 @mcp.tool()
 def t_lcm(input: TwoIntInput) -> IntOutput:
     """Calculate Least Common Multiple (LCM)"""
-    logger.info(f"Calling t_lcm({input.a}, {input.b})")
+    logger.info("Calling t_lcm(%s, %s)", input.a, input.b)
     result = calculate_lcm(input.a, input.b)
     return IntOutput(result=result)
 
 @mcp.tool()
-def t_is_prime(input: SingleIntInput) -> PrimeCheckOutput:
+async def t_is_prime(input: SingleIntInput) -> PrimeCheckOutput:
     """Check if a number is prime"""
-    logger.info(f"Calling t_is_prime({input.n})")
-    result = is_prime(input.n)
+    logger.info("Calling t_is_prime(%s)", input.n)
+    # Trial division can take a while for large n - keep it off the event loop
+    result = await asyncio.to_thread(is_prime, input.n)
     return PrimeCheckOutput(result=result, number=input.n)
 
 @mcp.tool()
-def t_prime_factors(input: SingleIntInput) -> PrimeFactorsOutput:
+async def t_prime_factors(input: SingleIntInput) -> PrimeFactorsOutput:
     """Find all prime factors of a number"""
-    logger.info(f"Calling t_prime_factors({input.n})")
-    factors = find_prime_factors(input.n)
+    logger.info("Calling t_prime_factors(%s)", input.n)
+    factors = await asyncio.to_thread(find_prime_factors, input.n)
     return PrimeFactorsOutput(factors=factors)
 
 @mcp.tool()
 def t_average(input: NumberListInput) -> TwoNumberOutput:
     """Calculate average of numbers"""
-    logger.info(f"Calling t_average with {len(input.numbers)} numbers")
+    logger.info("Calling t_average with %s numbers", len(input.numbers))
     result = calculate_average(input.numbers)
     return TwoNumberOutput(result=result)
 
 @mcp.tool()
 def t_max(input: NumberListInput) -> TwoNumberOutput:
     """Find maximum value in list"""
-    logger.info(f"Calling t_max with {len(input.numbers)} numbers")
+    logger.info("Calling t_max with %s numbers", len(input.numbers))
     result = find_max(input.numbers)
     return TwoNumberOutput(result=result)
 
 @mcp.tool()
 def t_min(input: NumberListInput) -> TwoNumberOutput:
     """Find minimum value in list"""
-    logger.info(f"Calling t_min with {len(input.numbers)} numbers")
+    logger.info("Calling t_min with %s numbers", len(input.numbers))
     result = find_min(input.numbers)
     return TwoNumberOutput(result=result)
 
 @mcp.tool()
 def t_square(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate square of a number"""
-    logger.info(f"Calling t_square({input.value})")
+    logger.info("Calling t_square(%s)", input.value)
     result = calculate_square(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_square_root(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate square root of a number"""
-    logger.info(f"Calling t_square_root({input.value})")
+    logger.info("Calling t_square_root(%s)", input.value)
     result = calculate_square_root(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_cube(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate cube of a number"""
-    logger.info(f"Calling t_cube({input.value})")
+    logger.info("Calling t_cube(%s)", input.value)
     result = calculate_cube(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_cube_root(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate cube root of a number"""
-    logger.info(f"Calling t_cube_root({input.value})")
+    logger.info("Calling t_cube_root(%s)", input.value)
     result = calculate_cube_root(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def t_to_fraction(input: FractionInput) -> FractionOutput:
     """Convert decimal to fraction"""
-    logger.info(f"Calling t_to_fraction({input.decimal})")
+    logger.info("Calling t_to_fraction(%s)", input.decimal)
     numerator, denominator = convert_to_fraction(input.decimal, input.max_denominator)
     return FractionOutput(numerator=numerator, denominator=denominator)
 
 @mcp.tool()
 def t_reciprocal(input: SingleNumberInput) -> SingleNumberOutput:
     """Calculate reciprocal (1/x) of a number"""
-    logger.info(f"Calling t_reciprocal({input.value})")
+    logger.info("Calling t_reciprocal(%s)", input.value)
     result = calculate_reciprocal(input.value)
     return SingleNumberOutput(result=result)
 
 @mcp.tool()
 def fallback_reasoning(input: FallbackInput) -> FallbackOutput:
     """Fallback reasoning step when the agent is uncertain or a tool fails"""
-    logger.info(f"Calling fallback_reasoning: {input.description}")
+    logger.info("Calling fallback_reasoning: %s", input.description)
     message = f"Fallback invoked: {input.description}"
     return FallbackOutput(message=message)
 
@@ -782,7 +1020,7 @@ def fallback_reasoning(input: FallbackInput) -> FallbackOutput:
 @mcp.tool()
 def t_logical_and(input: BooleanListInput) -> BooleanOutput:
     """Evaluate logical AND of boolean values"""
-    logger.info(f"Calling t_logical_and with {len(input.values)} values")
+    logger.info("Calling t_logical_and with %s values", len(input.values))
     result = evaluate_logical_and(input.values)
     return BooleanOutput(result=result)
 
@@ -790,7 +1028,7 @@ def t_logical_and(input: BooleanListInput) -> BooleanOutput:
 @mcp.tool()
 def t_logical_or(input: BooleanListInput) -> BooleanOutput:
     """Evaluate logical OR of boolean values"""
-    logger.info(f"Calling t_logical_or with {len(input.values)} values")
+    logger.info("Calling t_logical_or with %s values", len(input.values))
     result = evaluate_logical_or(input.values)
     return BooleanOutput(result=result)
 
@@ -798,7 +1036,7 @@ def t_logical_or(input: BooleanListInput) -> BooleanOutput:
 @mcp.tool()
 def t_logical_not(input: SingleBooleanInput) -> BooleanOutput:
     """Evaluate logical NOT"""
-    logger.info(f"Calling t_logical_not({input.value})")
+    logger.info("Calling t_logical_not(%s)", input.value)
     result = evaluate_logical_not(input.value)
     return BooleanOutput(result=result)
 
@@ -806,7 +1044,7 @@ def t_logical_not(input: SingleBooleanInput) -> BooleanOutput:
 @mcp.tool()
 def t_implication(input: TwoBooleanInput) -> BooleanOutput:
     """Evaluate logical implication (premise → conclusion)"""
-    logger.info(f"Calling t_implication({input.a} → {input.b})")
+    logger.info("Calling t_implication(%s → %s)", input.a, input.b)
     result = evaluate_implication(input.a, input.b)
     return BooleanOutput(result=result)
 
@@ -814,7 +1052,7 @@ def t_implication(input: TwoBooleanInput) -> BooleanOutput:
 @mcp.tool()
 def t_biconditional(input: TwoBooleanInput) -> BooleanOutput:
     """Evaluate biconditional (a ↔ b)"""
-    logger.info(f"Calling t_biconditional({input.a} ↔ {input.b})")
+    logger.info("Calling t_biconditional(%s ↔ %s)", input.a, input.b)
     result = evaluate_biconditional(input.a, input.b)
     return BooleanOutput(result=result)
 
@@ -822,7 +1060,7 @@ def t_biconditional(input: TwoBooleanInput) -> BooleanOutput:
 @mcp.tool()
 def t_xor(input: TwoBooleanInput) -> BooleanOutput:
     """Evaluate exclusive OR (XOR)"""
-    logger.info(f"Calling t_xor({input.a} ⊕ {input.b})")
+    logger.info("Calling t_xor(%s ⊕ %s)", input.a, input.b)
     result = evaluate_xor(input.a, input.b)
     return BooleanOutput(result=result)
 
@@ -830,7 +1068,7 @@ def t_xor(input: TwoBooleanInput) -> BooleanOutput:
 @mcp.tool()
 def t_syllogism(input: TwoBooleanInput) -> BooleanOutput:
     """Solve syllogism using modus ponens"""
-    logger.info(f"Calling t_syllogism({input.a}, {input.b})")
+    logger.info("Calling t_syllogism(%s, %s)", input.a, input.b)
     result = solve_syllogism(input.a, input.b)
     return BooleanOutput(result=result)
 
@@ -838,7 +1076,7 @@ def t_syllogism(input: TwoBooleanInput) -> BooleanOutput:
 @mcp.tool()
 def t_count_true(input: BooleanListInput) -> IntOutput:
     """Count number of true values"""
-    logger.info(f"Calling t_count_true with {len(input.values)} values")
+    logger.info("Calling t_count_true with %s values", len(input.values))
     result = count_true_values(input.values)
     return IntOutput(result=result)
 
@@ -846,7 +1084,7 @@ def t_count_true(input: BooleanListInput) -> IntOutput:
 @mcp.tool()
 def t_majority_vote(input: BooleanListInput) -> BooleanOutput:
     """Determine majority vote from boolean values"""
-    logger.info(f"Calling t_majority_vote with {len(input.values)} values")
+    logger.info("Calling t_majority_vote with %s values", len(input.values))
     result = majority_vote(input.values)
     return BooleanOutput(result=result)
 
@@ -854,7 +1092,7 @@ def t_majority_vote(input: BooleanListInput) -> BooleanOutput:
 @mcp.tool()
 def t_complex_expression(input: LogicalExpressionInput) -> BooleanOutput:
     """Evaluate complex logical expression"""
-    logger.info(f"Calling t_complex_expression: {input.expression}")
+    logger.info("Calling t_complex_expression: %s", input.expression)
     result = evaluate_complex_expression(input.expression, input.variables)
     return BooleanOutput(result=result)
 
@@ -868,17 +1106,17 @@ def t_solve_linear(input: LinearEquationInput) -> LinearEquationOutput:
     """Solve linear equation ax + b = 0 or from equation string like 'x + 4 = 5'"""
     # Check if equation_string is provided
     if input.equation_string:
-        logger.info(f"Calling t_solve_linear with equation string: {input.equation_string}")
+        logger.info("Calling t_solve_linear with equation string: %s", input.equation_string)
         try:
             a, b = parse_linear_equation(input.equation_string)
-            logger.info(f"Parsed to: {a}x + {b} = 0")
+            logger.info("Parsed to: %sx + %s = 0", a, b)
         except Exception as e:
-            logger.error(f"Failed to parse equation string: {e}")
+            logger.error("Failed to parse equation string: %s", e)
             return LinearEquationOutput(solution=None)
     else:
         a = input.a
         b = input.b
-        logger.info(f"Calling t_solve_linear({a}x + {b} = 0)")
+        logger.info("Calling t_solve_linear(%sx + %s = 0)", a, b)
     
     solution = solve_linear_equation(a, b)
     return LinearEquationOutput(solution=solution)
@@ -889,18 +1127,18 @@ def t_solve_quadratic(input: QuadraticEquationInput) -> QuadraticEquationOutput:
     """Solve quadratic equation ax² + bx + c = 0 or from equation string like 'x^2 - 5x + 6 = 0'"""
     # Check if equation_string is provided
     if input.equation_string:
-        logger.info(f"Calling t_solve_quadratic with equation string: {input.equation_string}")
+        logger.info("Calling t_solve_quadratic with equation string: %s", input.equation_string)
         try:
             a, b, c = parse_quadratic_equation(input.equation_string)
-            logger.info(f"Parsed to: {a}x² + {b}x + {c} = 0")
+            logger.info("Parsed to: %sx² + %sx + %s = 0", a, b, c)
         except Exception as e:
-            logger.error(f"Failed to parse equation string: {e}")
+            logger.error("Failed to parse equation string: %s", e)
             return QuadraticEquationOutput(solutions=[])
     else:
         a = input.a
         b = input.b
         c = input.c
-        logger.info(f"Calling t_solve_quadratic({a}x² + {b}x + {c} = 0)")
+        logger.info("Calling t_solve_quadratic(%sx² + %sx + %s = 0)", a, b, c)
     
     solutions = solve_quadratic_equation(a, b, c)
     return QuadraticEquationOutput(solutions=solutions)
@@ -909,7 +1147,7 @@ def t_solve_quadratic(input: QuadraticEquationInput) -> QuadraticEquationOutput:
 @mcp.tool()
 def t_evaluate_polynomial(input: PolynomialInput) -> TwoNumberOutput:
     """Evaluate polynomial at given x value"""
-    logger.info(f"Calling t_evaluate_polynomial at x={input.x}")
+    logger.info("Calling t_evaluate_polynomial at x=%s", input.x)
     result = evaluate_polynomial(input.coefficients, input.x)
     return TwoNumberOutput(result=result)
 
@@ -927,15 +1165,23 @@ def t_solve_system_2x2(input: System2x2Input) -> System2x2Output:
 @mcp.tool()
 def t_power(input: PowerInput) -> TwoNumberOutput:
     """Calculate base raised to exponent"""
-    logger.info(f"Calling t_power({input.base}^{input.exponent})")
+    logger.info("Calling t_power(%s^%s)", input.base, input.exponent)
     result = calculate_power(input.base, input.exponent)
     return TwoNumberOutput(result=result)
 
 
+@mcp.tool()
+def t_power_batch(input: PowerBatchInput) -> FloatListOutput:
+    """Raise each base to its matching exponent (many powers in one call)"""
+    logger.info("Calling t_power_batch with %s pairs", len(input.bases))
+    values = calculate_power_batch(input.bases, input.exponents)
+    return FloatListOutput(values=values)
+
+
 @mcp.tool()
 def t_nth_root(input: RootInput) -> TwoNumberOutput:
     """Calculate nth root of a number"""
-    logger.info(f"Calling t_nth_root({input.n}th root of {input.number})")
+    logger.info("Calling t_nth_root(%sth root of %s)", input.n, input.number)
     result = calculate_nth_root(input.number, input.n)
     return TwoNumberOutput(result=result)
 
@@ -943,7 +1189,7 @@ def t_nth_root(input: RootInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_binomial_expansion(input: BinomialExpansionInput) -> FloatListOutput:
     """Expand binomial (a + b)^n"""
-    logger.info(f"Calling t_binomial_expansion({input.a} + {input.b})^{input.n}")
+    logger.info("Calling t_binomial_expansion(%s + %s)^%s", input.a, input.b, input.n)
     values = expand_binomial(input.a, input.b, input.n)
     return FloatListOutput(values=values)
 
@@ -980,10 +1226,19 @@ def t_geometric_term(input: GeometricSequenceInput) -> TwoNumberOutput:
     return TwoNumberOutput(result=result)
 
 
+@mcp.tool()
+async def t_fibonacci_nth(input: FibonacciNthInput) -> IntOutput:
+    """Find nth Fibonacci number (F(0) = 0, F(1) = 1)"""
+    logger.info("Calling t_fibonacci_nth(n=%s)", input.n)
+    # Big-integer work - keep it off the event loop
+    result = await asyncio.to_thread(fibonacci_nth, input.n)
+    return IntOutput(result=result)
+
+
 @mcp.tool()
 def t_simplify_ratio(input: RatioInput) -> RatioOutput:
     """Simplify ratio to lowest terms"""
-    logger.info(f"Calling t_simplify_ratio({input.a}:{input.b})")
+    logger.info("Calling t_simplify_ratio(%s:%s)", input.a, input.b)
     a, b = simplify_ratio(input.a, input.b)
     return RatioOutput(simplified_a=a, simplified_b=b)
 
@@ -995,7 +1250,7 @@ def t_simplify_ratio(input: RatioInput) -> RatioOutput:
 @mcp.tool()
 def t_circle_area(input: RadiusInput) -> TwoNumberOutput:
     """Calculate area of a circle"""
-    logger.info(f"Calling t_circle_area(r={input.radius})")
+    logger.info("Calling t_circle_area(r=%s)", input.radius)
     result = calculate_circle_area(input.radius)
     return TwoNumberOutput(result=result)
 
@@ -1003,7 +1258,7 @@ def t_circle_area(input: RadiusInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_circle_circumference(input: RadiusInput) -> TwoNumberOutput:
     """Calculate circumference of a circle"""
-    logger.info(f"Calling t_circle_circumference(r={input.radius})")
+    logger.info("Calling t_circle_circumference(r=%s)", input.radius)
     result = calculate_circle_circumference(input.radius)
     return TwoNumberOutput(result=result)
 
@@ -1011,7 +1266,7 @@ def t_circle_circumference(input: RadiusInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_rectangle_area(input: RectangleInput) -> TwoNumberOutput:
     """Calculate area of a rectangle"""
-    logger.info(f"Calling t_rectangle_area({input.length}x{input.width})")
+    logger.info("Calling t_rectangle_area(%sx%s)", input.length, input.width)
     result = calculate_rectangle_area(input.length, input.width)
     return TwoNumberOutput(result=result)
 
@@ -1019,7 +1274,7 @@ def t_rectangle_area(input: RectangleInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_rectangle_perimeter(input: RectangleInput) -> TwoNumberOutput:
     """Calculate perimeter of a rectangle"""
-    logger.info(f"Calling t_rectangle_perimeter({input.length}x{input.width})")
+    logger.info("Calling t_rectangle_perimeter(%sx%s)", input.length, input.width)
     result = calculate_rectangle_perimeter(input.length, input.width)
     return TwoNumberOutput(result=result)
 
@@ -1027,7 +1282,7 @@ def t_rectangle_perimeter(input: RectangleInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_triangle_area(input: TriangleBaseHeightInput) -> TwoNumberOutput:
     """Calculate area of a triangle using base and height"""
-    logger.info(f"Calling t_triangle_area(base={input.base}, height={input.height})")
+    logger.info("Calling t_triangle_area(base=%s, height=%s)", input.base, input.height)
     result = calculate_triangle_area(input.base, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1035,7 +1290,7 @@ def t_triangle_area(input: TriangleBaseHeightInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_triangle_area_heron(input: TriangleThreeSidesInput) -> TwoNumberOutput:
     """Calculate area of a triangle using Heron's formula"""
-    logger.info(f"Calling t_triangle_area_heron({input.a}, {input.b}, {input.c})")
+    logger.info("Calling t_triangle_area_heron(%s, %s, %s)", input.a, input.b, input.c)
     result = calculate_triangle_area_heron(input.a, input.b, input.c)
     return TwoNumberOutput(result=result)
 
@@ -1043,7 +1298,7 @@ def t_triangle_area_heron(input: TriangleThreeSidesInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_sphere_volume(input: RadiusInput) -> TwoNumberOutput:
     """Calculate volume of a sphere"""
-    logger.info(f"Calling t_sphere_volume(r={input.radius})")
+    logger.info("Calling t_sphere_volume(r=%s)", input.radius)
     result = calculate_sphere_volume(input.radius)
     return TwoNumberOutput(result=result)
 
@@ -1051,7 +1306,7 @@ def t_sphere_volume(input: RadiusInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_sphere_surface_area(input: RadiusInput) -> TwoNumberOutput:
     """Calculate surface area of a sphere"""
-    logger.info(f"Calling t_sphere_surface_area(r={input.radius})")
+    logger.info("Calling t_sphere_surface_area(r=%s)", input.radius)
     result = calculate_sphere_surface_area(input.radius)
     return TwoNumberOutput(result=result)
 
@@ -1059,7 +1314,7 @@ def t_sphere_surface_area(input: RadiusInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_cylinder_volume(input: CylinderInput) -> TwoNumberOutput:
     """Calculate volume of a cylinder"""
-    logger.info(f"Calling t_cylinder_volume(r={input.radius}, h={input.height})")
+    logger.info("Calling t_cylinder_volume(r=%s, h=%s)", input.radius, input.height)
     result = calculate_cylinder_volume(input.radius, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1067,7 +1322,7 @@ def t_cylinder_volume(input: CylinderInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_cylinder_surface_area(input: CylinderInput) -> TwoNumberOutput:
     """Calculate surface area of a cylinder"""
-    logger.info(f"Calling t_cylinder_surface_area(r={input.radius}, h={input.height})")
+    logger.info("Calling t_cylinder_surface_area(r=%s, h=%s)", input.radius, input.height)
     result = calculate_cylinder_surface_area(input.radius, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1075,7 +1330,7 @@ def t_cylinder_surface_area(input: CylinderInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_cone_volume(input: CylinderInput) -> TwoNumberOutput:
     """Calculate volume of a cone"""
-    logger.info(f"Calling t_cone_volume(r={input.radius}, h={input.height})")
+    logger.info("Calling t_cone_volume(r=%s, h=%s)", input.radius, input.height)
     result = calculate_cone_volume(input.radius, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1083,7 +1338,7 @@ def t_cone_volume(input: CylinderInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_cube_volume(input: CubeInput) -> TwoNumberOutput:
     """Calculate volume of a cube"""
-    logger.info(f"Calling t_cube_volume(side={input.side})")
+    logger.info("Calling t_cube_volume(side=%s)", input.side)
     result = calculate_cube_volume(input.side)
     return TwoNumberOutput(result=result)
 
@@ -1091,7 +1346,7 @@ def t_cube_volume(input: CubeInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_cube_surface_area(input: CubeInput) -> TwoNumberOutput:
     """Calculate surface area of a cube"""
-    logger.info(f"Calling t_cube_surface_area(side={input.side})")
+    logger.info("Calling t_cube_surface_area(side=%s)", input.side)
     result = calculate_cube_surface_area(input.side)
     return TwoNumberOutput(result=result)
 
@@ -1099,7 +1354,7 @@ def t_cube_surface_area(input: CubeInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_prism_volume(input: RectangularPrismInput) -> TwoNumberOutput:
     """Calculate volume of a rectangular prism"""
-    logger.info(f"Calling t_prism_volume({input.length}x{input.width}x{input.height})")
+    logger.info("Calling t_prism_volume(%sx%sx%s)", input.length, input.width, input.height)
     result = calculate_rectangular_prism_volume(input.length, input.width, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1123,7 +1378,7 @@ def t_distance_3d(input: Point3DInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_pythagorean(input: PythagoreanInput) -> TwoNumberOutput:
     """Calculate hypotenuse using Pythagorean theorem given two legs"""
-    logger.info(f"Calling t_pythagorean({input.a}, {input.b})")
+    logger.info("Calling t_pythagorean(%s, %s)", input.a, input.b)
     result = calculate_pythagorean_theorem(input.a, input.b)
     return TwoNumberOutput(result=result)
 
@@ -1131,7 +1386,7 @@ def t_pythagorean(input: PythagoreanInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_pythagorean_leg(input: PythagoreanLegInput) -> TwoNumberOutput:
     """Calculate unknown leg using Pythagorean theorem given one leg and hypotenuse"""
-    logger.info(f"Calling t_pythagorean_leg(known_leg={input.known_leg}, hypotenuse={input.hypotenuse})")
+    logger.info("Calling t_pythagorean_leg(known_leg=%s, hypotenuse=%s)", input.known_leg, input.hypotenuse)
     result = calculate_pythagorean_leg(input.known_leg, input.hypotenuse)
     return TwoNumberOutput(result=result)
 
@@ -1139,7 +1394,7 @@ def t_pythagorean_leg(input: PythagoreanLegInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_chord_length(input: ChordInput) -> TwoNumberOutput:
     """Calculate length of a chord in a circle given radius and distance from center"""
-    logger.info(f"Calling t_chord_length(radius={input.radius}, distance={input.distance_from_center})")
+    logger.info("Calling t_chord_length(radius=%s, distance=%s)", input.radius, input.distance_from_center)
     result = calculate_chord_length(input.radius, input.distance_from_center)
     return TwoNumberOutput(result=result)
 
@@ -1155,7 +1410,7 @@ def t_trapezoid_area(input: TrapezoidInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_parallelogram_area(input: TriangleBaseHeightInput) -> TwoNumberOutput:
     """Calculate area of a parallelogram"""
-    logger.info(f"Calling t_parallelogram_area(base={input.base}, height={input.height})")
+    logger.info("Calling t_parallelogram_area(base=%s, height=%s)", input.base, input.height)
     result = calculate_parallelogram_area(input.base, input.height)
     return TwoNumberOutput(result=result)
 
@@ -1167,7 +1422,7 @@ def t_parallelogram_area(input: TriangleBaseHeightInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_mean(input: StatNumberListInput) -> TwoNumberOutput:
     """Calculate arithmetic mean (average)"""
-    logger.info(f"Calling t_mean with {len(input.numbers)} numbers")
+    logger.info("Calling t_mean with %s numbers", len(input.numbers))
     result = calculate_mean(input.numbers)
     return TwoNumberOutput(result=result)
 
@@ -1175,7 +1430,7 @@ def t_mean(input: StatNumberListInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_median(input: StatNumberListInput) -> TwoNumberOutput:
     """Calculate median"""
-    logger.info(f"Calling t_median with {len(input.numbers)} numbers")
+    logger.info("Calling t_median with %s numbers", len(input.numbers))
     result = calculate_median(input.numbers)
     return TwoNumberOutput(result=result)
 
@@ -1183,7 +1438,7 @@ def t_median(input: StatNumberListInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_mode(input: StatNumberListInput) -> StatFloatListOutput:
     """Calculate mode(s)"""
-    logger.info(f"Calling t_mode with {len(input.numbers)} numbers")
+    logger.info("Calling t_mode with %s numbers", len(input.numbers))
     values = calculate_mode(input.numbers)
     return StatFloatListOutput(values=values)
 
@@ -1191,7 +1446,7 @@ def t_mode(input: StatNumberListInput) -> StatFloatListOutput:
 @mcp.tool()
 def t_range(input: StatNumberListInput) -> TwoNumberOutput:
     """Calculate range (max - min)"""
-    logger.info(f"Calling t_range with {len(input.numbers)} numbers")
+    logger.info("Calling t_range with %s numbers", len(input.numbers))
     result = calculate_range(input.numbers)
     return TwoNumberOutput(result=result)
 
@@ -1199,7 +1454,7 @@ def t_range(input: StatNumberListInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_variance(input: VarianceInput) -> TwoNumberOutput:
     """Calculate variance"""
-    logger.info(f"Calling t_variance (sample={input.sample})")
+    logger.info("Calling t_variance (sample=%s)", input.sample)
     result = calculate_variance(input.numbers, input.sample)
     return TwoNumberOutput(result=result)
 
@@ -1207,7 +1462,7 @@ def t_variance(input: VarianceInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_std_deviation(input: VarianceInput) -> TwoNumberOutput:
     """Calculate standard deviation"""
-    logger.info(f"Calling t_std_deviation (sample={input.sample})")
+    logger.info("Calling t_std_deviation (sample=%s)", input.sample)
     result = calculate_standard_deviation(input.numbers, input.sample)
     return TwoNumberOutput(result=result)
 
@@ -1215,7 +1470,7 @@ def t_std_deviation(input: VarianceInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_percentile(input: PercentileInput) -> TwoNumberOutput:
     """Calculate percentile"""
-    logger.info(f"Calling t_percentile({input.percentile}th percentile)")
+    logger.info("Calling t_percentile(%sth percentile)", input.percentile)
     result = calculate_percentile(input.numbers, input.percentile)
     return TwoNumberOutput(result=result)
 
@@ -1239,7 +1494,7 @@ def t_iqr(input: StatNumberListInput) -> TwoNumberOutput:
 @mcp.tool()
 def t_z_score(input: ZScoreInput) -> TwoNumberOutput:
     """Calculate z-score"""
-    logger.info(f"Calling t_z_score({input.value})")
+    logger.info("Calling t_z_score(%s)", input.value)
     result = calculate_z_score(input.value, input.mean, input.std_dev)
     return TwoNumberOutput(result=result)
 
@@ -1263,7 +1518,7 @@ def t_linear_regression(input: CorrelationInput) -> RegressionOutput:
 @mcp.tool()
 def t_factorial_stat(input: FactorialInput) -> IntOutput:
     """Calculate factorial for statistics"""
-    logger.info(f"Calling t_factorial_stat({input.n}!)")
+    logger.info("Calling t_factorial_stat(%s!)", input.n)
     result = calculate_factorial_stat(input.n)
     return IntOutput(result=result)
 
@@ -1271,7 +1526,7 @@ def t_factorial_stat(input: FactorialInput) -> IntOutput:
 @mcp.tool()
 def t_combinations_stat(input: CombinationInput) -> IntOutput:
     """Calculate combinations C(n,r) for statistics"""
-    logger.info(f"Calling t_combinations_stat(C({input.n},{input.r}))")
+    logger.info("Calling t_combinations_stat(C(%s,%s))", input.n, input.r)
     result = calculate_combinations_stat(input.n, input.r)
     return IntOutput(result=result)
 
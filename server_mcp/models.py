@@ -1,7 +1,7 @@
 """
 Pydantic models for input and output validation of MCP tools.
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional, Dict
 
 # Constants for common field descriptions
@@ -9,57 +9,59 @@ LIST_OF_NUMBERS_DESC = "List of numbers"
 FIRST_TERM_DESC = "First term"
 
 
+class ToolModel(BaseModel):
+    """Base for all tool input and output models"""
+    # Tool inputs and results are plain values that are never changed after validation
+    model_config = ConfigDict(frozen=True)
+
+
 # PowerPoint Tool Models
-class DrawRectangleInput(BaseModel):
+class DrawRectangleInput(ToolModel):
     """Input model for drawing rectangles in PowerPoint"""
     x1: int = Field(default=1, ge=1, le=8, description="X-coordinate of top-left corner")
     y1: int = Field(default=1, ge=1, le=8, description="Y-coordinate of top-left corner")
     x2: int = Field(default=8, ge=1, le=8, description="X-coordinate of bottom-right corner")
     y2: int = Field(default=6, ge=1, le=8, description="Y-coordinate of bottom-right corner")
     
-    @validator('x2')
-    def x2_must_be_greater_than_x1(cls, v, values):
-        if 'x1' in values and v <= values['x1']:
+    @model_validator(mode='after')
+    def corners_must_be_ordered(self):
+        if self.x2 <= self.x1:
             raise ValueError('x2 must be greater than x1')
-        return v
-    
-    @validator('y2')
-    def y2_must_be_greater_than_y1(cls, v, values):
-        if 'y1' in values and v <= values['y1']:
+        if self.y2 <= self.y1:
             raise ValueError('y2 must be greater than y1')
-        return v
+        return self
 
 
-class DrawRectangleOutput(BaseModel):
+class DrawRectangleOutput(ToolModel):
     """Output model for draw rectangle operation"""
     success: bool
     message: str
 
 
-class AddTextInput(BaseModel):
+class AddTextInput(ToolModel):
     """Input model for adding text in PowerPoint"""
     text: str = Field(..., min_length=1, description="Text to add to the slide")
 
 
-class AddTextOutput(BaseModel):
+class AddTextOutput(ToolModel):
     """Output model for add text operation"""
     success: bool
     message: str
 
 
-class PowerPointOperationOutput(BaseModel):
+class PowerPointOperationOutput(ToolModel):
     """Generic output model for PowerPoint operations"""
     success: bool
     message: str
 
 
 # Email Tool Models
-class SendGmailInput(BaseModel):
+class SendGmailInput(ToolModel):
     """Input model for sending Gmail"""
     content: str = Field(..., min_length=1, description="Email content to send")
 
 
-class SendGmailOutput(BaseModel):
+class SendGmailOutput(ToolModel):
     """Output model for send Gmail operation"""
     success: bool
     message: str
@@ -67,184 +69,190 @@ class SendGmailOutput(BaseModel):
 
 
 # Math Tool Models
-class NumberListInput(BaseModel):
+class NumberListInput(ToolModel):
     """Input model for list-based math operations"""
-    numbers: List[float] = Field(..., min_items=1, description=LIST_OF_NUMBERS_DESC)
+    numbers: List[float] = Field(..., min_length=1, description=LIST_OF_NUMBERS_DESC)
 
 
-class NumberListOutput(BaseModel):
+class NumberListOutput(ToolModel):
     """Output model for list-based math operations"""
     result: float
 
 
-class TwoNumberInput(BaseModel):
+class TwoNumberInput(ToolModel):
     """Input model for two-number operations"""
     a: float = Field(..., description="First number")
     b: float = Field(..., description="Second number")
 
 
-class TwoNumberOutput(BaseModel):
+class TwoNumberOutput(ToolModel):
     """Output model for two-number operations"""
     result: float
 
 
-class SingleNumberInput(BaseModel):
+class SingleNumberInput(ToolModel):
     """Input model for single-number operations"""
     value: float = Field(..., description="Input number")
 
 
-class SingleNumberOutput(BaseModel):
+class SingleNumberOutput(ToolModel):
     """Output model for single-number operations"""
     result: float
 
 
-class SingleIntInput(BaseModel):
+class SingleIntInput(ToolModel):
     """Input model for single integer operations"""
     n: int = Field(..., description="Input integer")
 
 
-class TwoIntInput(BaseModel):
+class TwoIntInput(ToolModel):
     """Input model for two integer operations"""
     a: int = Field(..., description="First integer")
     b: int = Field(..., description="Second integer")
 
 
-class RoundInput(BaseModel):
+class RoundInput(ToolModel):
     """Input model for rounding operations"""
     number: float = Field(..., description="Number to round")
     decimals: int = Field(default=0, ge=0, description="Number of decimal places")
 
 
-class PrimeCheckOutput(BaseModel):
+class PrimeCheckOutput(ToolModel):
     """Output model for prime check"""
     result: bool
     number: int
 
 
-class PrimeFactorsOutput(BaseModel):
+class PrimeFactorsOutput(ToolModel):
     """Output model for prime factorization"""
     factors: List[int]
 
 
-class FractionOutput(BaseModel):
+class FractionOutput(ToolModel):
     """Output model for fraction conversion"""
     numerator: int
     denominator: int
 
 
-class FractionInput(BaseModel):
+class FractionInput(ToolModel):
     """Input model for fraction conversion"""
     decimal: float = Field(..., description="Decimal number to convert")
     max_denominator: int = Field(default=100, ge=1, description="Maximum denominator")
 
 
-class PercentageInput(BaseModel):
+class PercentageInput(ToolModel):
     """Input model for percentage calculation"""
     percent: float = Field(..., ge=0, description="Percentage value")
     number: float = Field(..., description="Base number")
 
 
-class PercentageOutput(BaseModel):
+class PercentageOutput(ToolModel):
     """Output model for percentage calculation"""
     result: float
 
 
-class StringToCharsInput(BaseModel):
+class StringToCharsInput(ToolModel):
     """Input model for converting string to ASCII values"""
     text: str = Field(..., min_length=1, description="Input string")
 
 
-class StringToCharsOutput(BaseModel):
+class StringToCharsOutput(ToolModel):
     """Output model for string to ASCII conversion"""
     ascii_values: List[int]
 
 
-class ExponentialInput(BaseModel):
+class ExponentialInput(ToolModel):
     """Input model for exponential operations"""
-    numbers: List[float] = Field(..., min_items=1, description="List of numbers for exponential")
+    numbers: List[float] = Field(..., min_length=1, description="List of numbers for exponential")
 
 
-class ExponentialOutput(BaseModel):
+class ExponentialOutput(ToolModel):
     """Output model for exponential operations"""
     values: List[float]
 
 
-class FibonacciInput(BaseModel):
+class FibonacciInput(ToolModel):
     """Input model for Fibonacci sequence"""
     n: int = Field(..., ge=0, description="Number of Fibonacci numbers to generate")
 
 
-class FibonacciOutput(BaseModel):
+class FibonacciOutput(ToolModel):
     """Output model for Fibonacci sequence"""
     sequence: List[int]
 
 
-class FactorialInput(BaseModel):
+class FibonacciNthInput(ToolModel):
+    """Input model for a single Fibonacci number"""
+    # F(20000) has 4180 digits - within Python's 4300-digit limit for printing integers
+    n: int = Field(..., ge=0, le=20000, description="Index of the Fibonacci number (F(0) = 0, F(1) = 1)")
+
+
+class FactorialInput(ToolModel):
     """Input model for factorial calculation"""
     n: int = Field(..., ge=0, description="Number for factorial calculation")
 
 
-class FactorialOutput(BaseModel):
+class FactorialOutput(ToolModel):
     """Output model for factorial calculation"""
     factorials: List[int]
 
 
-class PermutationInput(BaseModel):
+class PermutationInput(ToolModel):
     """Input model for permutation calculation"""
     n: int = Field(..., ge=0, description="Total number of items")
     r: int = Field(..., ge=0, description="Number of items to arrange")
     
-    @validator('r')
-    def r_must_not_exceed_n(cls, v, values):
-        if 'n' in values and v > values['n']:
+    @model_validator(mode='after')
+    def r_must_not_exceed_n(self):
+        if self.r > self.n:
             raise ValueError('r cannot be greater than n')
-        return v
+        return self
 
 
-class PermutationOutput(BaseModel):
+class PermutationOutput(ToolModel):
     """Output model for permutation calculation"""
     result: int
 
 
-class CombinationInput(BaseModel):
+class CombinationInput(ToolModel):
     """Input model for combination calculation"""
     n: int = Field(..., ge=0, description="Total number of items")
     r: int = Field(..., ge=0, description="Number of items to select")
     
-    @validator('r')
-    def r_must_not_exceed_n(cls, v, values):
-        if 'n' in values and v > values['n']:
+    @model_validator(mode='after')
+    def r_must_not_exceed_n(self):
+        if self.r > self.n:
             raise ValueError('r cannot be greater than n')
-        return v
+        return self
 
 
-class CombinationOutput(BaseModel):
+class CombinationOutput(ToolModel):
     """Output model for combination calculation"""
     result: int
 
 
-class EmployeeIdInput(BaseModel):
+class EmployeeIdInput(ToolModel):
     """Input model for employee salary lookup by ID"""
     emp_id: int = Field(..., ge=1, description="Employee ID")
 
 
-class EmployeeNameInput(BaseModel):
+class EmployeeNameInput(ToolModel):
     """Input model for employee salary lookup by name"""
     emp_name: str = Field(..., min_length=1, description="Employee name")
 
 
-class SalaryOutput(BaseModel):
+class SalaryOutput(ToolModel):
     """Output model for salary queries"""
     salary: Optional[float]
     found: bool
 
 
-class FallbackInput(BaseModel):
+class FallbackInput(ToolModel):
     """Input model for fallback reasoning"""
     description: str = Field(..., min_length=1, description="Description of the fallback situation")
 
 
-class FallbackOutput(BaseModel):
+class FallbackOutput(ToolModel):
     """Output model for fallback reasoning"""
     message: str
 
@@ -253,34 +261,34 @@ class FallbackOutput(BaseModel):
 # Logical Reasoning Tool Models
 # ============================================
 
-class BooleanListInput(BaseModel):
+class BooleanListInput(ToolModel):
     """Input model for boolean list operations"""
-    values: List[bool] = Field(..., min_items=1, description="List of boolean values")
+    values: List[bool] = Field(..., min_length=1, description="List of boolean values")
 
 
-class BooleanOutput(BaseModel):
+class BooleanOutput(ToolModel):
     """Output model for boolean operations"""
     result: bool
 
 
-class TwoBooleanInput(BaseModel):
+class TwoBooleanInput(ToolModel):
     """Input model for two-boolean operations"""
     a: bool = Field(..., description="First boolean value")
     b: bool = Field(..., description="Second boolean value")
 
 
-class SingleBooleanInput(BaseModel):
+class SingleBooleanInput(ToolModel):
     """Input model for single boolean operations"""
     value: bool = Field(..., description="Boolean value")
 
 
-class LogicalExpressionInput(BaseModel):
+class LogicalExpressionInput(ToolModel):
     """Input model for complex logical expressions"""
     expression: str = Field(..., min_length=1, description="Logical expression")
     variables: Dict[str, bool] = Field(..., description="Variable assignments")
 
 
-class IntOutput(BaseModel):
+class IntOutput(ToolModel):
     """Output model for integer results"""
     result: int
 
@@ -289,65 +297,62 @@ class IntOutput(BaseModel):
 # Algebra Tool Models
 # ============================================
 
-class LinearEquationInput(BaseModel):
+class LinearEquationInput(ToolModel):
     """Input model for linear equation: ax + b = 0"""
     a: Optional[float] = Field(None, description="Coefficient a")
     b: Optional[float] = Field(None, description="Constant b")
     equation_string: Optional[str] = Field(None, description="Equation string like 'x + 4 = 5' or '2x - 6 = 0'")
     
-    @validator('equation_string', always=True)
-    def validate_input(cls, v, values):
-        a = values.get('a')
-        b = values.get('b')
+    @model_validator(mode='after')
+    def validate_input(self):
+        has_coefficients = self.a is not None and self.b is not None
         
         # Must provide either (a, b) OR equation_string
-        if (a is None or b is None) and v is None:
+        if not has_coefficients and self.equation_string is None:
             raise ValueError('Must provide either (a, b) coefficients or equation_string')
-        if (a is not None and b is not None) and v is not None:
+        if has_coefficients and self.equation_string is not None:
             raise ValueError('Cannot provide both coefficients and equation_string')
         
-        return v
+        return self
 
 
-class LinearEquationOutput(BaseModel):
+class LinearEquationOutput(ToolModel):
     """Output model for linear equation"""
     solution: Optional[float]
 
 
-class QuadraticEquationInput(BaseModel):
+class QuadraticEquationInput(ToolModel):
     """Input model for quadratic equation: ax² + bx + c = 0"""
     a: Optional[float] = Field(None, description="Coefficient a (x² term)")
     b: Optional[float] = Field(None, description="Coefficient b (x term)")
     c: Optional[float] = Field(None, description="Constant c")
     equation_string: Optional[str] = Field(None, description="Equation string like 'x^2 - 5x + 6 = 0' or '2x^2 + 3x - 2 = 0'")
     
-    @validator('equation_string', always=True)
-    def validate_input(cls, v, values):
-        a = values.get('a')
-        b = values.get('b')
-        c = values.get('c')
+    @model_validator(mode='after')
+    def validate_input(self):
+        has_coefficients = self.a is not None and self.b is not None and self.c is not None
         
         # Must provide either (a, b, c) OR equation_string
-        if (a is None or b is None or c is None) and v is None:
+        if not has_coefficients and self.equation_string is None:
             raise ValueError('Must provide either (a, b, c) coefficients or equation_string')
-        if (a is not None and b is not None and c is not None) and v is not None:
+        if has_coefficients and self.equation_string is not None:
             raise ValueError('Cannot provide both coefficients and equation_string')
         
-        return v
+        return self
 
 
-class QuadraticEquationOutput(BaseModel):
+class QuadraticEquationOutput(ToolModel):
     """Output model for quadratic equation"""
     solutions: List[float]
 
 
-class PolynomialInput(BaseModel):
+class PolynomialInput(ToolModel):
     """Input model for polynomial evaluation"""
-    coefficients: List[float] = Field(..., min_items=1, description="Polynomial coefficients [a0, a1, a2, ...]")
+    coefficients: List[float] = Field(..., min_length=1, description="Polynomial coefficients [a0, a1, a2, ...]")
     x: float = Field(..., description="Value of x to evaluate at")
 
 
-class System2x2Input(BaseModel):
+class System2x2Input(ToolModel):
     """Input model for 2x2 system of equations"""
     a1: float = Field(..., description="Coefficient a1 in equation 1")
     b1: float = Field(..., description="Coefficient b1 in equation 1")
@@ -357,58 +362,76 @@ class System2x2Input(BaseModel):
     c2: float = Field(..., description="Constant c2 in equation 2")
 
 
-class System2x2Output(BaseModel):
+class System2x2Output(ToolModel):
     """Output model for 2x2 system"""
     x: Optional[float]
     y: Optional[float]
     has_solution: bool
 
 
-class PowerInput(BaseModel):
+class PowerInput(ToolModel):
     """Input model for power calculation"""
     base: float = Field(..., description="Base value")
     exponent: float = Field(..., description="Exponent value")
 
 
-class RootInput(BaseModel):
+class PowerBatchInput(ToolModel):
+    """Input model for element-wise power calculation"""
+    bases: List[float] = Field(..., min_length=1, description="Base values")
+    exponents: List[float] = Field(..., min_length=1, description="Exponent for each base")
+    
+    @model_validator(mode='after')
+    def exponents_must_match_bases(self):
+        if len(self.exponents) != len(self.bases):
+            raise ValueError('exponents must have one value per base')
+        return self
+
+
+class RootInput(ToolModel):
     """Input model for nth root calculation"""
     number: float = Field(..., description="Number to find root of")
     n: int = Field(..., ge=1, description="Root degree")
 
 
-class BinomialExpansionInput(BaseModel):
+class BinomialExpansionInput(ToolModel):
     """Input model for binomial expansion"""
     a: float = Field(..., description=FIRST_TERM_DESC)
     b: float = Field(..., description="Second term")
     n: int = Field(..., ge=0, description="Power")
 
 
-class FloatListOutput(BaseModel):
+class FloatListOutput(ToolModel):
     """Output model for list of floats"""
     values: List[float]
 
 
-class ArithmeticSequenceInput(BaseModel):
+class ArithmeticSequenceInput(ToolModel):
     """Input model for arithmetic sequence"""
     first: float = Field(..., description=FIRST_TERM_DESC)
     common_diff: float = Field(..., description="Common difference")
     n: int = Field(..., ge=1, description="Term number or count")
 
 
-class GeometricSequenceInput(BaseModel):
+class GeometricSequenceInput(ToolModel):
     """Input model for geometric sequence"""
     first: float = Field(..., description=FIRST_TERM_DESC)
     ratio: float = Field(..., description="Common ratio")
     n: int = Field(..., ge=1, description="Term number or count")
 
 
-class RatioInput(BaseModel):
+class RatioInput(ToolModel):
     """Input model for ratio simplification"""
     a: float = Field(..., description=FIRST_TERM_DESC)
-    b: float = Field(..., ne=0, description="Second term (non-zero)")
+    b: float = Field(..., description="Second term (non-zero)")
+    
+    @model_validator(mode='after')
+    def b_must_not_be_zero(self):
+        if self.b == 0:
+            raise ValueError('b must not be zero')
+        return self
 
 
-class RatioOutput(BaseModel):
+class RatioOutput(ToolModel):
     """Output model for ratio"""
     simplified_a: float
     simplified_b: float
@@ -418,49 +441,49 @@ class RatioOutput(BaseModel):
 # Geometry Tool Models
 # ============================================
 
-class RadiusInput(BaseModel):
+class RadiusInput(ToolModel):
     """Input model for circle operations"""
     radius: float = Field(..., ge=0, description="Radius of the circle")
 
 
-class RectangleInput(BaseModel):
+class RectangleInput(ToolModel):
     """Input model for rectangle operations"""
     length: float = Field(..., ge=0, description="Length of rectangle")
     width: float = Field(..., ge=0, description="Width of rectangle")
 
 
-class TriangleBaseHeightInput(BaseModel):
+class TriangleBaseHeightInput(ToolModel):
     """Input model for triangle with base and height"""
     base: float = Field(..., ge=0, description="Base of triangle")
     height: float = Field(..., ge=0, description="Height of triangle")
 
 
-class TriangleThreeSidesInput(BaseModel):
+class TriangleThreeSidesInput(ToolModel):
     """Input model for triangle with three sides"""
     a: float = Field(..., gt=0, description="Side a")
     b: float = Field(..., gt=0, description="Side b")
     c: float = Field(..., gt=0, description="Side c")
 
 
-class CylinderInput(BaseModel):
+class CylinderInput(ToolModel):
     """Input model for cylinder operations"""
     radius: float = Field(..., ge=0, description="Radius of cylinder")
     height: float = Field(..., ge=0, description="Height of cylinder")
 
 
-class CubeInput(BaseModel):
+class CubeInput(ToolModel):
     """Input model for cube operations"""
     side: float = Field(..., ge=0, description="Side length of cube")
 
 
-class RectangularPrismInput(BaseModel):
+class RectangularPrismInput(ToolModel):
     """Input model for rectangular prism"""
     length: float = Field(..., ge=0, description="Length")
     width: float = Field(..., ge=0, description="Width")
     height: float = Field(..., ge=0, description="Height")
 
 
-class Point2DInput(BaseModel):
+class Point2DInput(ToolModel):
     """Input model for 2D points"""
     x1: float = Field(..., description="X coordinate of point 1")
     y1: float = Field(..., description="Y coordinate of point 1")
@@ -468,7 +491,7 @@ class Point2DInput(BaseModel):
     y2: float = Field(..., description="Y coordinate of point 2")
 
 
-class Point3DInput(BaseModel):
+class Point3DInput(ToolModel):
     """Input model for 3D points"""
     x1: float = Field(..., description="X coordinate of point 1")
     y1: float = Field(..., description="Y coordinate of point 1")
@@ -478,25 +501,25 @@ class Point3DInput(BaseModel):
     z2: float = Field(..., description="Z coordinate of point 2")
 
 
-class PythagoreanInput(BaseModel):
+class PythagoreanInput(ToolModel):
     """Input model for Pythagorean theorem"""
     a: float = Field(..., ge=0, description="First leg")
     b: float = Field(..., ge=0, description="Second leg")
 
 
-class PythagoreanLegInput(BaseModel):
+class PythagoreanLegInput(ToolModel):
     """Input model for finding a leg given hypotenuse"""
     known_leg: float = Field(..., ge=0, description="The known leg")
     hypotenuse: float = Field(..., ge=0, description="The hypotenuse")
 
 
-class ChordInput(BaseModel):
+class ChordInput(ToolModel):
     """Input model for chord length calculation"""
     radius: float = Field(..., ge=0, description="Radius of the circle")
     distance_from_center: float = Field(..., ge=0, description="Distance from center to chord")
 
 
-class TrapezoidInput(BaseModel):
+class TrapezoidInput(ToolModel):
     """Input model for trapezoid"""
     base1: float = Field(..., ge=0, description="First base")
     base2: float = Field(..., ge=0, description="Second base")
@@ -507,68 +530,74 @@ class TrapezoidInput(BaseModel):
 # Statistics Tool Models
 # ============================================
 
-class StatNumberListInput(BaseModel):
+class StatNumberListInput(ToolModel):
     """Input model for statistical operations on number lists"""
-    numbers: List[float] = Field(..., min_items=1, description=LIST_OF_NUMBERS_DESC)
+    numbers: List[float] = Field(..., min_length=1, description=LIST_OF_NUMBERS_DESC)
 
 
-class StatFloatListOutput(BaseModel):
+class StatFloatListOutput(ToolModel):
     """Output model for statistical lists"""
     values: List[float]
 
 
-class VarianceInput(BaseModel):
+class VarianceInput(ToolModel):
     """Input model for variance calculation"""
-    numbers: List[float] = Field(..., min_items=1, description=LIST_OF_NUMBERS_DESC)
+    numbers: List[float] = Field(..., min_length=1, description=LIST_OF_NUMBERS_DESC)
     sample: bool = Field(default=True, description="Calculate sample variance (True) or population variance (False)")
 
 
-class PercentileInput(BaseModel):
+class PercentileInput(ToolModel):
     """Input model for percentile calculation"""
-    numbers: List[float] = Field(..., min_items=1, description=LIST_OF_NUMBERS_DESC)
+    numbers: List[float] = Field(..., min_length=1, description=LIST_OF_NUMBERS_DESC)
     percentile: float = Field(..., ge=0, le=100, description="Percentile to calculate (0-100)")
 
 
-class QuartilesOutput(BaseModel):
+class QuartilesOutput(ToolModel):
     """Output model for quartiles"""
     q1: float
     q2: float
     q3: float
 
 
-class ZScoreInput(BaseModel):
+class ZScoreInput(ToolModel):
     """Input model for z-score calculation"""
     value: float = Field(..., description="Value to calculate z-score for")
     mean: float = Field(..., description="Mean of the distribution")
-    std_dev: float = Field(..., ne=0, description="Standard deviation (non-zero)")
+    std_dev: float = Field(..., description="Standard deviation (non-zero)")
+    
+    @model_validator(mode='after')
+    def std_dev_must_not_be_zero(self):
+        if self.std_dev == 0:
+            raise ValueError('std_dev must not be zero')
+        return self
 
 
-class CorrelationInput(BaseModel):
+class CorrelationInput(ToolModel):
     """Input model for correlation calculation"""
-    x_values: List[float] = Field(..., min_items=2, description="X values")
-    y_values: List[float] = Field(..., min_items=2, description="Y values")
+    x_values: List[float] = Field(..., min_length=2, description="X values")
+    y_values: List[float] = Field(..., min_length=2, description="Y values")
     
-    @validator('y_values')
-    def lists_must_be_same_length(cls, v, values):
-        if 'x_values' in values and len(v) != len(values['x_values']):
+    @model_validator(mode='after')
+    def lists_must_be_same_length(self):
+        if len(self.y_values) != len(self.x_values):
             raise ValueError('x_values and y_values must have the same length')
-        return v
+        return self
 
 
-class RegressionOutput(BaseModel):
+class RegressionOutput(ToolModel):
     """Output model for linear regression"""
     slope: float
     intercept: float
 
 
-class ProbabilityUnionInput(BaseModel):
+class ProbabilityUnionInput(ToolModel):
     """Input model for probability union"""
     p_a: float = Field(..., ge=0, le=1, description="P(A)")
     p_b: float = Field(..., ge=0, le=1, description="P(B)")
     p_both: float = Field(..., ge=0, le=1, description="P(A ∩ B)")
 
 
-class ProbabilityInput(BaseModel):
+class ProbabilityInput(ToolModel):
     """Input model for probability operations"""
     p: float = Field(..., ge=0, le=1, description="Probability value")
 
@@ -4,14 +4,19 @@ Tools for solving equations, simplifying expressions, and algebraic operations
 """
 import logging
 import math
+import operator
 import re
 from typing import List, Tuple, Optional
 
 def log_function(func):
+    name = func.__name__
     def wrapper(*args, **kwargs):
-        logging.info(f"Calling {func.__name__} with args: {args} {kwargs}")
+        # Skip building the log messages entirely when INFO is filtered out
+        if not logging.root.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        logging.info("Calling %s with args: %s %s", name, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"{func.__name__} returned: {result}")
+        logging.info("%s returned: %s", name, result)
         return result
     return wrapper
 
@@ -217,6 +222,14 @@ def calculate_power(base: float, exponent: float) -> float:
     return base ** exponent
 
 
+@log_function
+def calculate_power_batch(bases: List[float], exponents: List[float]) -> List[float]:
+    """
+    Raise each base to the matching exponent in a single call.
+    """
+    return list(map(operator.pow, bases, exponents))
+
+
 @log_function
 def calculate_nth_root(number: float, n: int) -> float:
     """
@@ -227,6 +240,11 @@ def calculate_nth_root(number: float, n: int) -> float:
     if number < 0 and n % 2 == 0:
         raise ValueError("Even root of negative number is not real")
     
+    # Dedicated square and cube root functions are faster than a fractional power
+    if n == 2:
+        return math.sqrt(number)
+    if n == 3:
+        return math.cbrt(number)
     if number < 0:
         return -(abs(number) ** (1/n))
     return number ** (1/n)
@@ -1,12 +1,20 @@
+import contextlib
+import functools
 import logging
 import math
 import sqlite3
+import threading
+from pathlib import Path
 
 def log_function(func):
+    name = func.__name__
     def wrapper(*args, **kwargs):
-        logging.info(f"Calling {func.__name__} with args: {args} {kwargs}")
+        # Skip building the log messages entirely when INFO is filtered out
+        if not logging.root.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        logging.info("Calling %s with args: %s %s", name, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"{func.__name__} returned: {result}")
+        logging.info("%s returned: %s", name, result)
         return result
     return wrapper
 
@@ -16,7 +24,8 @@ DATABASE_PATH = r"D:\Himanshu\EAG-V2\emloyee_salary.db"
 def number_list_to_sum(lst):
     if not lst:
         return 0
-    return sum(lst)
+    # Exactly rounded, unlike a running float sum
+    return math.fsum(lst)
 
 
 @log_function
@@ -40,10 +49,7 @@ def calculate_difference(a, b):
 def number_list_to_product(lst):
     if not lst:
         return 0
-    result = 1
-    for num in lst:
-        result *= num
-    return result
+    return math.prod(lst)
 
 @log_function
 def calculate_division(a, b):
@@ -53,18 +59,56 @@ def calculate_division(a, b):
 
 @log_function
 def strings_to_chars_to_int(s):
+    if s.isascii():
+        # ASCII bytes are the code points, and bytes -> list runs in C
+        return list(s.encode('ascii'))
     return [ord(c) for c in s]
 
 @log_function
 def int_list_to_exponential_values(lst):
-    return [math.e**x for x in lst]
+    return list(map(math.exp, lst))
+
+# Fibonacci numbers computed so far; only ever extended, so earlier calls are reused
+_FIB_CACHE = [0, 1]
+# The tail is zero-filled before it is computed - keep other threads from reading it meanwhile
+_FIB_LOCK = threading.Lock()
 
 @log_function
 def fibonacci_numbers(n):
-    fib = [0, 1]
-    for i in range(2, n):
-        fib.append(fib[i-1] + fib[i-2])
-    return fib[:n]
+    with _FIB_LOCK:
+        known = len(_FIB_CACHE)
+        if n > known:
+            # Preallocate the missing tail and fill it by index
+            _FIB_CACHE.extend([0] * (n - known))
+            for i in range(known, n):
+                _FIB_CACHE[i] = _FIB_CACHE[i-1] + _FIB_CACHE[i-2]
+        return _FIB_CACHE[:n]
+
+def _fib_pair(n):
+    # (F(n), F(n+1)) by fast doubling: F(2k) = F(k)(2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a, b
+
+@log_function
+def fibonacci_nth(n):
+    with _FIB_LOCK:
+        if n < len(_FIB_CACHE):
+            return _FIB_CACHE[n]
+    # O(log n) multiplications instead of building the whole sequence
+    return _fib_pair(n)[0]
+
+# Factorials computed so far (_FACT_CACHE[k] == k!); only ever extended, so earlier calls are reused
+_FACT_CACHE = [1]
+_FACT_LOCK = threading.Lock()
+
+def _ensure_factorials(n):
+    # Extend the cache to hold 0! .. n!; callers hold _FACT_LOCK
+    for k in range(len(_FACT_CACHE), n + 1):
+        _FACT_CACHE.append(_FACT_CACHE[-1] * k)
 
 @log_function
 def calculate_factorial(n):
@@ -72,31 +116,70 @@ def calculate_factorial(n):
         raise ValueError("Factorial is not defined for negative numbers")
     if n == 0:
         return [1]
-    factorials = [1]  # 0!
-    current = 1
-    for i in range(1, n):
-        current *= i
-        factorials.append(current)
-    return factorials
+    with _FACT_LOCK:
+        _ensure_factorials(n - 1)
+        return _FACT_CACHE[:n]
 
 @log_function
 def calculate_permutation(n, r):
     if n < 0 or r < 0 or r > n:
         raise ValueError("Invalid values for n and r in permutation")
-    return math.factorial(n) // math.factorial(n - r)
-
+    # Falling product n * (n-1) * ... * (n-r+1); no full factorials needed
+    return math.perm(n, r)
 
 @log_function
 def calculate_combination(n, r):
     if n < 0 or r < 0 or r > n:
         raise ValueError("Invalid values for n and r in combination")
-    return math.factorial(n) // (math.factorial(r) * math.factorial(n - r)) 
+    return math.comb(n, r) 
+
 
+# One read-only connection per database file, opened on first use and shared by all lookups
+_DB_CONNECTIONS = {}
+_DB_LOCK = threading.Lock()
+
+def _ensure_indexes(uri):
+    # Index the lookup columns once per database so salary queries don't scan the table.
+    # mode=rw never creates a missing file; a read-only database just keeps scanning.
+    try:
+        with contextlib.closing(sqlite3.connect(uri + "?mode=rw", uri=True)) as conn, conn:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_employee_id ON employee(id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_employee_name ON employee(name)")
+    except sqlite3.Error as e:
+        logging.warning("Could not index employee table: %s", e)
+
+def _fetch_one(db_path, sql, params):
+    with _DB_LOCK:
+        conn = _DB_CONNECTIONS.get(db_path)
+        if conn is None:
+            uri = Path(db_path).absolute().as_uri()
+            _ensure_indexes(uri)
+            conn = sqlite3.connect(uri + "?mode=ro", uri=True, check_same_thread=False)
+            _DB_CONNECTIONS[db_path] = conn
+        return conn.execute(sql, params).fetchone()
+
+@functools.lru_cache(maxsize=1024)
+def _salary_by_id(emp_id, db_path):
+    result = _fetch_one(db_path, "SELECT salary FROM employee WHERE id = ?", (emp_id,))
+    return result[0] if result else None
+
+@functools.lru_cache(maxsize=1024)
+def _salary_by_name(emp_name, db_path):
+    result = _fetch_one(db_path, "SELECT salary FROM employee WHERE name = ?", (emp_name,))
+    return result[0] if result else None
+
+def clear_salary_cache():
+    """Forget cached salary lookups, e.g. after the employee table has changed."""
+    _salary_by_id.cache_clear()
+    _salary_by_name.cache_clear()
 
 @log_function
 def calculate_salary_for_id(emp_id: int, db_path: str = DATABASE_PATH):
     """Return the salary for the given employee id from the SQLite database.
 
+    Repeated lookups are answered from a cache; call clear_salary_cache()
+    after changing the table.
+
     Args:
         emp_id (int): The id of the employee whose salary needs to be fetched.
         db_path (str, optional): Path to the SQLite database. Defaults to DATABASE_PATH.
@@ -104,20 +187,15 @@ def calculate_salary_for_id(emp_id: int, db_path: str = DATABASE_PATH):
     Returns:
         float | int | None: Salary of the employee if found else None.
     """
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT salary FROM employee WHERE id = ?", (emp_id,))
-        result = cursor.fetchone()
-        return result[0] if result else None
-    finally:
-        if 'conn' in locals():
-            conn.close()
+    return _salary_by_id(emp_id, db_path)
 
 @log_function
 def calculate_salary_for_name(emp_name: str, db_path: str = DATABASE_PATH):
     """Return the salary for the given employee name from the SQLite database.
 
+    Repeated lookups are answered from a cache; call clear_salary_cache()
+    after changing the table.
+
     Args:
         emp_name (str): The name of the employee whose salary needs to be fetched.
         db_path (str, optional): Path to the SQLite database. Defaults to DATABASE_PATH.
@@ -125,15 +203,7 @@ def calculate_salary_for_name(emp_name: str, db_path: str = DATABASE_PATH):
     Returns:
         float | int | None: Salary of the employee if found else None.
     """
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT salary FROM employee WHERE name = ?", (emp_name,))
-        result = cursor.fetchone()
-        return result[0] if result else None
-    finally:
-        if 'conn' in locals():
-            conn.close()
+    return _salary_by_name(emp_name, db_path)
 
 
 @log_function
@@ -300,6 +370,7 @@ def calculate_lcm(a: int, b: int):
 
 
 @log_function
+@functools.lru_cache(maxsize=256)
 def is_prime(n: int):
     """Check if a number is prime.
 
@@ -319,7 +390,7 @@ def is_prime(n: int):
         return True
     if n % 2 == 0:
         return False
-    for i in range(3, int(math.sqrt(n)) + 1, 2):
+    for i in range(3, math.isqrt(n) + 1, 2):
         if n % i == 0:
             return False
     return True
@@ -339,8 +410,13 @@ def find_prime_factors(n: int):
         >>> find_prime_factors(60)
         [2, 2, 3, 5]
     """
+    return list(_prime_factors(n))
+
+
+@functools.lru_cache(maxsize=256)
+def _prime_factors(n):
     if n < 2:
-        return []
+        return ()
     
     factors = []
     # Check for 2s
@@ -360,7 +436,7 @@ def find_prime_factors(n: int):
     if n > 2:
         factors.append(n)
     
-    return factors
+    return tuple(factors)
 
 
 @log_function
@@ -487,9 +563,8 @@ def calculate_cube_root(number: float | int):
         >>> calculate_cube_root(27)
         3.0
     """
-    if number < 0:
-        return -(abs(number) ** (1/3))
-    return number ** (1/3)
+    # math.cbrt handles negative numbers itself - no sign juggling needed
+    return math.cbrt(number)
 
 
 @log_function
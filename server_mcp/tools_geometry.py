@@ -10,10 +10,14 @@ ERR_RADIUS_NEGATIVE = "Radius cannot be negative"
 ERR_DIMENSIONS_NEGATIVE = "Dimensions cannot be negative"
 
 def log_function(func):
+    name = func.__name__
     def wrapper(*args, **kwargs):
-        logging.info(f"Calling {func.__name__} with args: {args} {kwargs}")
+        # Skip building the log messages entirely when INFO is filtered out
+        if not logging.root.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        logging.info("Calling %s with args: %s %s", name, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"{func.__name__} returned: {result}")
+        logging.info("%s returned: %s", name, result)
         return result
     return wrapper
 
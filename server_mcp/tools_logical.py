@@ -11,10 +11,14 @@ OP_OR = " or "
 OP_NOT = " not "
 
 def log_function(func):
+    name = func.__name__
     def wrapper(*args, **kwargs):
-        logging.info(f"Calling {func.__name__} with args: {args} {kwargs}")
+        # Skip building the log messages entirely when INFO is filtered out
+        if not logging.root.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        logging.info("Calling %s with args: %s %s", name, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"{func.__name__} returned: {result}")
+        logging.info("%s returned: %s", name, result)
         return result
     return wrapper
 
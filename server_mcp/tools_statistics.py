@@ -8,14 +8,46 @@ from typing import List, Tuple
 from collections import Counter
 
 def log_function(func):
+    name = func.__name__
     def wrapper(*args, **kwargs):
-        logging.info(f"Calling {func.__name__} with args: {args} {kwargs}")
+        # Skip building the log messages entirely when INFO is filtered out
+        if not logging.root.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        logging.info("Calling %s with args: %s %s", name, args, kwargs)
         result = func(*args, **kwargs)
-        logging.info(f"{func.__name__} returned: {result}")
+        logging.info("%s returned: %s", name, result)
         return result
     return wrapper
 
 
+# Undecorated kernels shared by the tools below, so composite statistics
+# don't log (and re-format) their whole input once per nested call
+def _mean(numbers: List[float]) -> float:
+    return sum(numbers) / len(numbers)
+
+
+def _sum_squared_deviations(numbers: List[float], mean: float) -> float:
+    return sum((x - mean) * (x - mean) for x in numbers)
+
+
+def _sum_cross_deviations(x_values: List[float], y_values: List[float], mean_x: float, mean_y: float) -> float:
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(x_values, y_values))
+
+
+def _percentile_of_sorted(sorted_numbers: List[float], percentile: float) -> float:
+    """Linearly interpolated percentile of an already sorted list."""
+    rank = (percentile / 100) * (len(sorted_numbers) - 1)
+    lower_index = int(math.floor(rank))
+    upper_index = int(math.ceil(rank))
+    
+    if lower_index == upper_index:
+        return sorted_numbers[lower_index]
+    
+    # Interpolate
+    fraction = rank - lower_index
+    return sorted_numbers[lower_index] + fraction * (sorted_numbers[upper_index] - sorted_numbers[lower_index])
+
+
 @log_function
 def calculate_mean(numbers: List[float]) -> float:
     """
@@ -23,7 +55,7 @@ def calculate_mean(numbers: List[float]) -> float:
     """
     if not numbers:
         raise ValueError("Cannot calculate mean of empty list")
-    return sum(numbers) / len(numbers)
+    return _mean(numbers)
 
 
 @log_function
@@ -87,11 +119,8 @@ def calculate_variance(numbers: List[float], sample: bool = True) -> float:
     if sample and len(numbers) < 2:
         raise ValueError("Need at least 2 values for sample variance")
     
-    mean = calculate_mean(numbers)
-    squared_diffs = [(x - mean) ** 2 for x in numbers]
-    
     divisor = len(numbers) - 1 if sample else len(numbers)
-    return sum(squared_diffs) / divisor
+    return _sum_squared_deviations(numbers, _mean(numbers)) / divisor
 
 
 @log_function
@@ -122,20 +151,8 @@ def calculate_percentile(numbers: List[float], percentile: float) -> float:
     if not 0 <= percentile <= 100:
         raise ValueError("Percentile must be between 0 and 100")
     
-    sorted_numbers = sorted(numbers)
-    n = len(sorted_numbers)
-    
     # Use linear interpolation
-    rank = (percentile / 100) * (n - 1)
-    lower_index = int(math.floor(rank))
-    upper_index = int(math.ceil(rank))
-    
-    if lower_index == upper_index:
-        return sorted_numbers[lower_index]
-    
-    # Interpolate
-    fraction = rank - lower_index
-    return sorted_numbers[lower_index] + fraction * (sorted_numbers[upper_index] - sorted_numbers[lower_index])
+    return _percentile_of_sorted(sorted(numbers), percentile)
 
 
 @log_function
@@ -149,9 +166,11 @@ def calculate_quartiles(numbers: List[float]) -> Tuple[float, float, float]:
     if not numbers:
         raise ValueError("Cannot calculate quartiles of empty list")
     
-    q1 = calculate_percentile(numbers, 25)
-    q2 = calculate_percentile(numbers, 50)
-    q3 = calculate_percentile(numbers, 75)
+    # Sort once for all three quartiles
+    sorted_numbers = sorted(numbers)
+    q1 = _percentile_of_sorted(sorted_numbers, 25)
+    q2 = _percentile_of_sorted(sorted_numbers, 50)
+    q3 = _percentile_of_sorted(sorted_numbers, 75)
     
     return (q1, q2, q3)
 
@@ -193,20 +212,20 @@ def calculate_correlation_coefficient(x_values: List[float], y_values: List[floa
     if n < 2:
         raise ValueError("Need at least 2 data points")
     
-    mean_x = calculate_mean(x_values)
-    mean_y = calculate_mean(y_values)
+    mean_x = _mean(x_values)
+    mean_y = _mean(y_values)
     
     # Calculate covariance
-    covariance = sum((x_values[i] - mean_x) * (y_values[i] - mean_y) for i in range(n))
+    covariance = _sum_cross_deviations(x_values, y_values, mean_x, mean_y)
     
-    # Calculate standard deviations
-    std_x = calculate_standard_deviation(x_values, sample=False)
-    std_y = calculate_standard_deviation(y_values, sample=False)
+    # n * std_x * std_y (population) == sqrt(sum_sq_x * sum_sq_y)
+    sum_sq_x = _sum_squared_deviations(x_values, mean_x)
+    sum_sq_y = _sum_squared_deviations(y_values, mean_y)
     
-    if std_x == 0 or std_y == 0:
+    if sum_sq_x == 0 or sum_sq_y == 0:
         raise ValueError("Standard deviation cannot be zero")
     
-    return covariance / (n * std_x * std_y)
+    return covariance / math.sqrt(sum_sq_x * sum_sq_y)
 
 
 @log_function
@@ -227,12 +246,12 @@ def calculate_linear_regression(x_values: List[float], y_values: List[float]) ->
     if n < 2:
         raise ValueError("Need at least 2 data points")
     
-    mean_x = calculate_mean(x_values)
-    mean_y = calculate_mean(y_values)
+    mean_x = _mean(x_values)
+    mean_y = _mean(y_values)
     
     # Calculate slope
-    numerator = sum((x_values[i] - mean_x) * (y_values[i] - mean_y) for i in range(n))
-    denominator = sum((x_values[i] - mean_x) ** 2 for i in range(n))
+    numerator = _sum_cross_deviations(x_values, y_values, mean_x, mean_y)
+    denominator = _sum_squared_deviations(x_values, mean_x)
     
     if denominator == 0:
         raise ValueError("Cannot calculate slope: all x values are the same")